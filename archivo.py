@@ -4,27 +4,41 @@ import queue
 import sounddevice as sd
 import vosk
 import json
-import difflib
+import numpy as np
 import logging
 import threading
 import pyautogui
-import re
 import time
 import tkinter as tk
 from datetime import datetime
 from collections import deque
+from pathlib import Path
+
+from core.actions_watcher import ActionsWatcher
+from core.command_executor import CommandExecutor, current_token
+from core.command_queue import CommandQueue, Priority, PriorityClassifier
+from core.command_registry import CommandRegistry, load_actions
+from core.model_registry import get_model
+from core.speech_gate import SpeechGate
+from core.text_normalizer import TextNormalizer
+from core.wake_word import WakeWordMatcher
 
 # ========== Configuración General ==========
 MODEL_PATH = "models/vosk-model-small-es-0.42"
 WAKE_WORDS = ["autogestión", "agp", "asistente", "illo", "compae"]
 HISTORIAL = "historial_comandos.txt"
+ARCHIVO_COMANDOS = Path(__file__).parent / "comandos.json"
+CORRECCIONES = Path(__file__).parent / "correcciones.json"
 TIMEOUT = 0.5
 SENSIBILIDAD_WAKE = 0.7
+COMPUERTA_VOZ = True  # Decodificar solo los segmentos con voz
+detector_wake = WakeWordMatcher(WAKE_WORDS, threshold=SENSIBILIDAD_WAKE)
+normalizador = TextNormalizer.from_file(CORRECCIONES)
 
 # ========== Inicialización ==========
 print(f"🧠 Cargando modelo Vosk desde: {MODEL_PATH}")
 try:
-    model = vosk.Model(MODEL_PATH)
+    model = get_model(MODEL_PATH, warm_up=True)
     rec = vosk.KaldiRecognizer(model, 16000)
     rec.SetWords(True)
     print("✅ Modelo cargado correctamente")
@@ -32,8 +46,18 @@ except Exception as e:
     print(f"❌ Error cargando modelo: {e}")
     sys.exit(1)
 
+FRASES_CANCELAR = ["para", "para ya", "cancela", "cancela eso", "cancelar", "detente", "stop", "basta"]
+clasificador_prioridad = PriorityClassifier(control=FRASES_CANCELAR + ["salir", "apagar"])
+
+def prioridad_comando(texto):
+    # En dictado todo es texto a escribir y debe salir en el orden en que se dijo
+    if modo_dictado and texto is not None:
+        return Priority.INTERACTIVE
+    return clasificador_prioridad(texto)
+
 audio_queue = queue.Queue()
-comando_queue = queue.Queue()
+# "para", "cancela" o "salir" se atienden antes que lo encolado y cortan la voz
+comando_queue = CommandQueue(prioridad_comando)
 tts_queue = queue.Queue()
 
 logging.basicConfig(filename="asistente.log",
@@ -125,6 +149,23 @@ def worker_tts():
         estado_actual = "esperando"
         led.cambiar_color("blue", "Escuchando...")
 
+def interrumpir_voz(_texto=None):
+    """Descarta las frases pendientes y corta la que se está diciendo."""
+    try:
+        while True:
+            if tts_queue.get_nowait() is None:
+                tts_queue.put(None)
+                break
+    except queue.Empty:
+        pass
+    if TTS_DISPONIBLE:
+        try:
+            tts_engine.stop()
+        except Exception as e:
+            logging.error(f"Error al interrumpir TTS: {e}")
+
+comando_queue.add_preempt_listener(interrumpir_voz)
+
 def hablar(texto):
     print(f"💬 {texto}")
     tts_queue.put(texto)
@@ -152,28 +193,13 @@ def agregar_contexto(texto):
 
 # ========== Utilidades de texto ==========
 def normalizar_texto(texto):
-    correcciones = {
-        "auto gestión": "autogestión","compa": "compae",
-        "abre guguel": "abre google","abre yu tiub": "abre youtube",
-        "qué horas": "qué hora es","qué días": "qué día es"
-    }
-    texto_lower = texto.lower()
-    for original, correccion in correcciones.items():
-        texto_lower = texto_lower.replace(original, correccion)
-    return texto_lower
+    return normalizador(texto)
 
 def detectar_wake_word(texto):
-    texto_norm = normalizar_texto(texto)
-    for wake in WAKE_WORDS:
-        if wake in texto_norm: return True
-    palabras = texto_norm.split()
-    for palabra in palabras:
-        for wake in WAKE_WORDS:
-            similitud = difflib.SequenceMatcher(None, palabra, wake).ratio()
-            if similitud >= SENSIBILIDAD_WAKE:
-                logging.info(f"Wake word: '{palabra}' ≈ '{wake}' ({similitud:.2f})")
-                return True
-    return False
+    coincidencia = detector_wake.find(normalizar_texto(texto))
+    if coincidencia is not None and coincidencia.score < 1.0:
+        logging.info(f"Wake word: '{coincidencia.phrase}' ({coincidencia.score:.2f})")
+    return coincidencia is not None
 
 # ========== Conversacional por defecto ==========
 def responder_conversacion(texto):
@@ -196,11 +222,11 @@ def responder_conversacion(texto):
 
 # ========== Dictado ==========
 def escribir_por_voz(texto):
-    texto_limpio = re.sub(r"^(escribe esto|anota|pon|redacta|dicta|transcribe)\s*", "", texto, flags=re.IGNORECASE)
-    hablar(f"Vale, escribo: {texto_limpio}")
+    # El registro ya quita la orden ("escribe", "anota"...) y pasa solo el resto;
+    # ejecutar_coincidencia guarda la frase completa en el historial
+    hablar(f"Vale, escribo: {texto}")
     time.sleep(0.5)
-    pyautogui.write(texto_limpio + " ", interval=0.05)
-    registrar_historial(texto, f"escribió: {texto_limpio}")
+    pyautogui.write(texto + " ", interval=0.05)
 
 def iniciar_dictado():
     global modo_dictado
@@ -219,79 +245,144 @@ def procesar_dictado(texto):
     registrar_historial(texto, "dictado")
 
 # ========== Comandos ==========
+# Las acciones se resuelven al llamarlas, así que el diccionario se crea una sola vez
+COMANDOS = {
+    "salir": lambda: salir_programa(),
+    "apagar": lambda: salir_programa(),
+    "hola": lambda: hablar("¡Hola illo! Aquí estoy."),
+    "buenos días": lambda: hablar("Buenos días, compae. ¿Qué necesitas?"),
+    "buenas tardes": lambda: hablar("Buenas tardes, ¿en qué te ayudo?"),
+    "cómo estás": lambda: hablar("Mejor que nunca, compae. Listo pa' currá."),
+    "qué tal": lambda: hablar("Aquí andamos, ¿y tú qué?"),
+    "qué hora es": lambda: hablar(datetime.now().strftime("Son las %H:%M")),
+    "qué día es": lambda: hablar(datetime.now().strftime("Hoy es %A %d de %B")),
+    "fecha": lambda: hablar(datetime.now().strftime("Estamos a %d de %B de %Y")),
+    "abre google": lambda: (os.system("start chrome https://www.google.com"), hablar("Abriendo Google")),
+    "abre youtube": lambda: (os.system("start chrome https://www.youtube.com"), hablar("Abriendo YouTube")),
+    "abre correo": lambda: (os.system("start chrome https://mail.google.com"), hablar("Abriendo correo")),
+    "abre gmail": lambda: (os.system("start chrome https://mail.google.com"), hablar("Abriendo Gmail")),
+    "abre agp": lambda: (os.system("start chrome https://autogestionpro.com"), hablar("Abriendo AutogestiónPro")),
+    "abre panel agp": lambda: (os.system("start chrome https://panel.autogestionpro.com"), hablar("Abriendo panel")),
+    "abre métricas": lambda: (os.system("start chrome https://metrics.autogestionpro.com"), hablar("Abriendo métricas")),
+    "abre crm": lambda: (os.system("start chrome https://crm.autogestionpro.com"), hablar("Abriendo CRM")),
+    "abre bloc de notas": lambda: (os.system("notepad"), hablar("Abriendo bloc de notas")),
+    "abre notepad": lambda: (os.system("notepad"), hablar("Abriendo notepad")),
+    "abre terminal": lambda: (os.system("start cmd"), hablar("Abriendo terminal")),
+    "abre calculadora": lambda: (os.system("calc"), hablar("Abriendo calculadora")),
+    "ayuda": lambda: hablar("Puedo abrir apps, buscar en Google, escribir por ti, y más: saluda, pregunta hora, di 'escribe' lo que quieras dictar."),
+    "qué puedes hacer": lambda: hablar("Puedo abrir programas, navegar por internet, escribir texto y responder preguntas básicas."),
+}
+
+def ejecutar_accion(frase, accion):
+    """Acción de un comando de comandos.json: abrir la URL o decir el texto."""
+    if accion.startswith("http"):
+        os.system(f'start chrome "{accion}"')
+        hablar(f"Abriendo {accion.split('//')[1].split('/')[0]}")
+    else:
+        hablar(accion)
+
+def cancelar():
+    cancelados = ejecutor.cancel_all("cancelado por el usuario")
+    hablar("Vale, lo dejo." if cancelados else "No estoy haciendo nada, illo.")
+
+# Registro único compilado una vez: comandos integrados, dictado y comandos.json
+registro = CommandRegistry()
+for frase, accion in COMANDOS.items():
+    registro.register(frase, accion)
+registro.register("iniciar dictado", lambda texto: iniciar_dictado(),
+                  keywords=["empieza dictado", "inicia dictado"])
+registro.register("detener dictado", lambda texto: detener_dictado(),
+                  keywords=["fin del dictado", "termina dictado"])
+registro.register("escribir", escribir_por_voz,
+                  prefixes=["escribe esto", "escribe", "anota", "pon", "redacta", "dicta", "transcribe"])
+registro.register("cancelar", cancelar, phrases=FRASES_CANCELAR)
+try:
+    registro.register_actions(load_actions(ARCHIVO_COMANDOS), ejecutar_accion, source="json")
+except (OSError, ValueError) as e:
+    logging.warning(f"No se pudieron cargar los comandos de comandos.json: {e}")
+# Los cambios en comandos.json se publican sin reiniciar
+vigilante_comandos = ActionsWatcher(ARCHIVO_COMANDOS, registro, ejecutar_accion)
+registro.compile()
+
+# Los comandos se ejecutan en un grupo de hilos con tiempo máximo; salir, el
+# dictado y cancelar se atienden en el hilo de la cola para no perder el orden
+ejecutor = CommandExecutor(max_workers=4, max_pending=16, default_timeout=20.0,
+                           on_timeout=lambda tarea: hablar(f"{tarea.name} tardó demasiado, lo he cancelado."))
+COMANDOS_EN_LINEA = {"salir", "apagar", "iniciar dictado", "detener dictado", "cancelar"}
+# Escribir con el teclado y abrir ventanas (acciones de comandos.json) no pueden
+# solaparse: van al carril en serie, uno tras otro y sin tiempo máximo, porque
+# pyautogui no se puede interrumpir a medias y un dictado largo pasa de 20 s
+COMANDOS_EN_SERIE = {"escribir"}
+
+def _en_serie(comando):
+    return comando.name in COMANDOS_EN_SERIE or comando.source == "json"
+
 def ejecutar_comando(texto):
+    """Ejecuta el texto; devuelve la tarea del ejecutor, o None si ya ha terminado."""
     global modo_dictado
     texto_norm = normalizar_texto(texto)
     led.cambiar_color("green", "Procesando...")
     if modo_dictado and "fin del dictado" not in texto_norm:
-        procesar_dictado(texto)
-        return
-    if "empieza dictado" in texto_norm or "inicia dictado" in texto_norm:
-        iniciar_dictado()
-        return
-    if "fin del dictado" in texto_norm or "termina dictado" in texto_norm:
-        detener_dictado()
-        return
-    if any(texto_norm.startswith(p) for p in ["escribe", "anota", "pon ", "redacta", "dicta", "transcribe"]):
-        escribir_por_voz(texto)
-        return
-    comandos = {
-        "salir": lambda: salir_programa(),
-        "apagar": lambda: salir_programa(),
-        "hola": lambda: hablar("¡Hola illo! Aquí estoy."),
-        "buenos días": lambda: hablar("Buenos días, compae. ¿Qué necesitas?"),
-        "buenas tardes": lambda: hablar("Buenas tardes, ¿en qué te ayudo?"),
-        "cómo estás": lambda: hablar("Mejor que nunca, compae. Listo pa' currá."),
-        "qué tal": lambda: hablar("Aquí andamos, ¿y tú qué?"),
-        "qué hora es": lambda: hablar(datetime.now().strftime("Son las %H:%M")),
-        "qué día es": lambda: hablar(datetime.now().strftime("Hoy es %A %d de %B")),
-        "fecha": lambda: hablar(datetime.now().strftime("Estamos a %d de %B de %Y")),
-        "abre google": lambda: (os.system("start chrome https://www.google.com"), hablar("Abriendo Google")),
-        "abre youtube": lambda: (os.system("start chrome https://www.youtube.com"), hablar("Abriendo YouTube")),
-        "abre correo": lambda: (os.system("start chrome https://mail.google.com"), hablar("Abriendo correo")),
-        "abre gmail": lambda: (os.system("start chrome https://mail.google.com"), hablar("Abriendo Gmail")),
-        "abre agp": lambda: (os.system("start chrome https://autogestionpro.com"), hablar("Abriendo AutogestiónPro")),
-        "abre panel agp": lambda: (os.system("start chrome https://panel.autogestionpro.com"), hablar("Abriendo panel")),
-        "abre métricas": lambda: (os.system("start chrome https://metrics.autogestionpro.com"), hablar("Abriendo métricas")),
-        "abre crm": lambda: (os.system("start chrome https://crm.autogestionpro.com"), hablar("Abriendo CRM")),
-        "abre bloc de notas": lambda: (os.system("notepad"), hablar("Abriendo bloc de notas")),
-        "abre notepad": lambda: (os.system("notepad"), hablar("Abriendo notepad")),
-        "abre terminal": lambda: (os.system("start cmd"), hablar("Abriendo terminal")),
-        "abre calculadora": lambda: (os.system("calc"), hablar("Abriendo calculadora")),
-        "ayuda": lambda: hablar("Puedo abrir apps, buscar en Google, escribir por ti, y más: saluda, pregunta hora, di 'escribe' lo que quieras dictar."),
-        "qué puedes hacer": lambda: hablar("Puedo abrir programas, navegar por internet, escribir texto y responder preguntas básicas."),
-    }
-    mejor = difflib.get_close_matches(texto_norm, comandos.keys(), n=1, cutoff=0.6)
-    if mejor:
-        comando = mejor[0]
-        try:
-            comandos[comando]()
-            registrar_historial(texto, comando)
-            agregar_contexto(f"ejecutó: {comando}")
-        except Exception as e:
-            logging.error(f"Error ejecutando comando '{comando}': {e}")
-            hablar("Hubo un error ejecutando eso, illo.")
-    else:
+        # Por el mismo carril que "escribe ...", para no mezclar pulsaciones
+        tarea = ejecutor.submit(procesar_dictado, texto, name="dictado", serial=True, timeout=None)
+        if tarea is None:
+            hablar("Voy con mucho lío, illo. Espera un momento.")
+        return tarea
+    # Literal, prefijo, palabra clave, por pronunciación y por último aproximado
+    coincidencia = registro.resolve(texto_norm)
+    tarea = None
+    if coincidencia is None:
         responder_conversacion(texto)
+    elif coincidencia.command.name in COMANDOS_EN_LINEA:
+        ejecutar_coincidencia(texto, coincidencia)
+    else:
+        en_serie = _en_serie(coincidencia.command)
+        tarea = ejecutor.submit(ejecutar_coincidencia, texto, coincidencia,
+                                name=coincidencia.command.name, serial=en_serie,
+                                timeout=None if en_serie else ejecutor.default_timeout)
+        if tarea is None:
+            hablar("Voy con mucho lío, illo. Espera un momento.")
     led.cambiar_color("blue", "Escuchando...")
+    return tarea
+
+def ejecutar_coincidencia(texto, coincidencia):
+    comando = coincidencia.command.name
+    try:
+        coincidencia.execute()
+        if not current_token().cancelled:
+            registrar_historial(texto, comando)
+            agregar_contexto(f"ejecutó: {comando}")
+    except Exception as e:
+        logging.error(f"Error ejecutando comando '{comando}': {e}")
+        hablar("Hubo un error ejecutando eso, illo.")
 
 def worker_comandos():
     while True:
         try:
-            texto = comando_queue.get(timeout=2)
+            entrada = comando_queue.get_entry(timeout=2)
         except queue.Empty:
             continue
-        if texto is None:
+        if entrada.item is None:
             break
-        ejecutar_comando(texto)
+        tarea = ejecutar_comando(entrada.item)
+        # Latencia por clase desde que se encoló hasta que termina el comando
+        if tarea is None:
+            comando_queue.observe(entrada)
+        else:
+            tarea.future.add_done_callback(lambda _, entrada=entrada: comando_queue.observe(entrada))
+    logging.info(f"Cola de comandos: {comando_queue.stats()}")
+    logging.info(f"Ejecutor de comandos: {ejecutor.stats()}")
+    ejecutor.shutdown(wait=False)
 
 comando_thread = threading.Thread(target=worker_comandos, daemon=True)
 comando_thread.start()
+vigilante_comandos.start()
 
 def worker_audio():
     global estado_actual
     print("🎙️ Escuchando... (di 'autogestión', 'illo' o 'compae')")
     led.cambiar_color("blue", "Escuchando...")
+    compuerta = SpeechGate(rec) if COMPUERTA_VOZ else None
     with sd.RawInputStream(samplerate=16000, blocksize=8000, dtype="int16", channels=1, callback=callback):
         try:
             while True:
@@ -299,8 +390,13 @@ def worker_audio():
                     data = audio_queue.get(timeout=TIMEOUT)
                 except queue.Empty:
                     continue
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
+                if compuerta is not None:
+                    resultados = compuerta.feed(np.frombuffer(data, dtype=np.int16))
+                elif rec.AcceptWaveform(data):
+                    resultados = [json.loads(rec.Result())]
+                else:
+                    resultados = []
+                for result in resultados:
                     texto = result.get("text", "").strip()
                     if texto:
                         print(f"🗣️ '{texto}'")
@@ -310,9 +406,7 @@ def worker_audio():
                             print(f"✅ Wake word detectada en: '{texto}'")
                             led.cambiar_color("green", "Comando!")
                             estado_actual = "procesando"
-                            texto_comando = texto
-                            for wake in WAKE_WORDS:
-                                texto_comando = texto_comando.replace(wake, "").strip()
+                            texto_comando = detector_wake.strip(texto)
                             if texto_comando:
                                 comando_queue.put(texto_comando)
                             else:
@@ -322,6 +416,9 @@ def worker_audio():
             logging.error(f"Error en worker de audio: {e}")
             print(f"❌ Error crítico: {e}")
             led.cambiar_color("red", "Error")
+        finally:
+            if compuerta is not None:
+                logging.info(f"Compuerta de voz: {compuerta.stats()}")
 
 def salir_programa():
     global estado_actual
@@ -22,13 +22,19 @@ import uuid
 import tkinter as tk
 import sounddevice as sd
 import vosk
-import difflib
 import pyautogui
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Callable, Any, Union
 from dataclasses import dataclass, asdict, field
 from enum import Enum, auto
 
+from core.actions_watcher import ActionsWatcher
+from core.command_registry import CommandRegistry, load_actions
+from core.model_registry import get_model, preload_model
+from core.result_cache import ResultCache
+from core.text_normalizer import TextNormalizer
+from core.wake_word import WakeWordMatcher
+
 # Configuración de logging
 logging.basicConfig(
     filename="asistente.log",
@@ -40,8 +46,16 @@ logging.basicConfig(
 MODEL_PATH = "models/vosk-model-small-es-0.42"
 WAKE_WORDS = ["autogestión", "agp", "asistente", "illo", "compae"]
 HISTORIAL = "historial_comandos.txt"
+ARCHIVO_COMANDOS = Path(__file__).parent / "comandos.json"
+CORRECCIONES = Path(__file__).parent / "correcciones.json"
 TIMEOUT = 0.5
 SENSIBILIDAD_WAKE = 0.7
+# Segundos durante los que se reutiliza el resultado de los comandos de solo lectura
+TTL_IP = 300.0
+TTL_PROCESOS = 5.0
+TTL_INFO_SISTEMA = 15.0
+detector_wake = WakeWordMatcher(WAKE_WORDS, threshold=SENSIBILIDAD_WAKE)
+normalizador = TextNormalizer.from_file(CORRECCIONES)
 
 # Inicialización de colas
 audio_queue = queue.Queue()
@@ -160,31 +174,15 @@ def agregar_contexto(texto):
     return texto
 
 def normalizar_texto(texto):
-    """Normaliza el texto para mejorar el reconocimiento."""
-    correcciones = {
-        "auto gestión": "autogestión", "compa": "compae",
-        "abre guguel": "abre google", "abre yu tiub": "abre youtube",
-        "qué horas": "qué hora es", "qué días": "qué día es"
-    }
-    texto_lower = texto.lower()
-    for original, correccion in correcciones.items():
-        texto_lower = texto_lower.replace(original, correccion)
-    return texto_lower
+    """Normaliza el texto para mejorar el reconocimiento (correcciones de correcciones.json)."""
+    return normalizador(texto)
 
 def detectar_wake_word(texto):
     """Detecta si el texto contiene una palabra de activación."""
-    texto_norm = normalizar_texto(texto)
-    for wake in WAKE_WORDS:
-        if wake in texto_norm: 
-            return True
-    palabras = texto_norm.split()
-    for palabra in palabras:
-        for wake in WAKE_WORDS:
-            similitud = difflib.SequenceMatcher(None, palabra, wake).ratio()
-            if similitud >= SENSIBILIDAD_WAKE:
-                logging.info(f"Wake word: '{palabra}' ≈ '{wake}' ({similitud:.2f})")
-                return True
-    return False
+    coincidencia = detector_wake.find(normalizar_texto(texto))
+    if coincidencia is not None and coincidencia.score < 1.0:
+        logging.info(f"Wake word: '{coincidencia.phrase}' ({coincidencia.score:.2f})")
+    return coincidencia is not None
 
 # ========== Procesamiento de Comandos ==========
 
@@ -206,6 +204,32 @@ comandos = {
     "qué puedes hacer": lambda: hablar("Puedo abrir programas, navegar por internet, responder preguntas básicas y más."),
 }
 
+def ejecutar_accion(frase, accion):
+    """Acción de un comando de comandos.json: abrir la URL o decir el texto."""
+    if accion.startswith("http"):
+        os.system(f'start chrome "{accion}"')
+        hablar(f"Abriendo {accion.split('//')[1].split('/')[0]}")
+    else:
+        hablar(accion)
+
+# Registro único: comandos integrados, dictado y comandos.json; las funciones
+# de dictado se resuelven al llamarlas
+registro = CommandRegistry()
+for frase, accion in comandos.items():
+    registro.register(frase, accion)
+registro.register("iniciar dictado", lambda texto: iniciar_dictado(),
+                  keywords=["empieza dictado", "inicia dictado"])
+registro.register("detener dictado", lambda texto: detener_dictado(),
+                  keywords=["fin del dictado", "termina dictado"])
+registro.register("escribir", lambda resto: escribir_por_voz(resto),
+                  prefixes=["escribe esto", "escribe", "anota", "pon", "redacta", "dicta", "transcribe"])
+try:
+    registro.register_actions(load_actions(ARCHIVO_COMANDOS), ejecutar_accion, source="json")
+except (OSError, ValueError) as e:
+    logging.warning(f"No se pudieron cargar los comandos de comandos.json: {e}")
+# Los cambios en comandos.json se publican sin reiniciar
+vigilante_comandos = ActionsWatcher(ARCHIVO_COMANDOS, registro, ejecutar_accion)
+
 def responder_conversacion(texto):
     """Responde a entradas de conversación no reconocidas como comandos."""
     global ultimo_tema
@@ -236,24 +260,15 @@ def procesar_comando(texto):
         escribir_por_voz(texto)
         return "Texto dictado"
         
-    # Comandos especiales de dictado
-    if "empieza dictado" in texto_norm or "inicia dictado" in texto_norm:
-        return iniciar_dictado()
-    if "fin del dictado" in texto_norm or "termina dictado" in texto_norm:
-        return detener_dictado()
-        
-    # Comandos de escritura
-    if any(texto_norm.startswith(p) for p in ["escribe", "anota", "pon ", "redacta", "dicta", "transcribe"]):
-        return escribir_por_voz(texto)
-    
-    # Buscar comando coincidente
-    mejor = difflib.get_close_matches(texto_norm, comandos.keys(), n=1, cutoff=0.6)
-    if mejor:
-        comando = mejor[0]
+    # Literal, prefijo, palabra clave, por pronunciación y por último aproximado
+    coincidencia = registro.resolve(texto_norm)
+    if coincidencia:
+        comando = coincidencia.command.name
         try:
-            comandos[comando]()
+            resultado = coincidencia.execute()
             agregar_contexto(f"Ejecutado: {comando}")
-            return f"Comando ejecutado: {comando}"
+            # El dictado devuelve su propio mensaje
+            return resultado if isinstance(resultado, str) else f"Comando ejecutado: {comando}"
         except Exception as e:
             error_msg = f"Error ejecutando comando: {str(e)}"
             logging.error(error_msg)
@@ -267,13 +282,16 @@ def procesar_comando(texto):
 # ========== Funciones de Dictado ==========
 
 def escribir_por_voz(texto):
-    """Escribe el texto dictado en la posición actual del cursor."""
-    texto_limpio = re.sub(r"^(escribe esto|anota|pon|redacta|dicta|transcribe)\s*", "", texto, flags=re.IGNORECASE)
-    hablar(f"Voy a escribir: {texto_limpio}")
+    """Escribe el texto en la posición actual del cursor.
+
+    Recibe solo lo que hay que escribir: el registro ya quita la orden
+    ("escribe", "anota"...) y en modo dictado se escribe todo lo dicho.
+    """
+    hablar(f"Voy a escribir: {texto}")
     time.sleep(0.5)
-    pyautogui.write(texto_limpio + " ", interval=0.05)
-    agregar_contexto(f"Escribió: {texto_limpio}")
-    return f"Texto escrito: {texto_limpio}"
+    pyautogui.write(texto + " ", interval=0.05)
+    agregar_contexto(f"Escribió: {texto}")
+    return f"Texto escrito: {texto}"
 
 def iniciar_dictado():
     """Activa el modo de dictado."""
@@ -310,7 +328,7 @@ def worker_audio():
     # Inicializar el modelo Vosk
     print(f"🧠 Cargando modelo Vosk desde: {MODEL_PATH}")
     try:
-        model = vosk.Model(MODEL_PATH)
+        model = get_model(MODEL_PATH)
         rec = vosk.KaldiRecognizer(model, 16000)
         rec.SetWords(True)
         print("✅ Modelo cargado correctamente")
@@ -342,9 +360,7 @@ def worker_audio():
                             estado_actual = "procesando"
                             
                             # Extraer el comando eliminando la palabra de activación
-                            texto_comando = texto
-                            for wake in WAKE_WORDS:
-                                texto_comando = texto_comando.replace(wake, "").strip()
+                            texto_comando = detector_wake.strip(texto)
                             
                             if texto_comando:
                                 comando_queue.put(texto_comando)
@@ -413,12 +429,16 @@ def inicializar_asistente():
     print("🔊 Palabras de activación:", ", ".join(f"'{w}'" for w in WAKE_WORDS))
     print("💡 Ejemplo: 'illo abre google', 'asistente qué hora es', o di 'ayuda'\n")
     
+    # Precargar el modelo mientras arrancan la interfaz y los hilos
+    preload_model(MODEL_PATH)
+    
     # Iniciar hilos
     audio_thread = threading.Thread(target=worker_audio, daemon=True)
     comando_thread = threading.Thread(target=worker_comandos, daemon=True)
     
     audio_thread.start()
     comando_thread.start()
+    vigilante_comandos.start()
     
     # Mensaje de bienvenida
     led.cambiar_color("yellow", "Iniciando...")
@@ -932,6 +952,10 @@ class InterfazAsistente(ctk.CTk):
         
         self.cargar_historial()
         
+        # Comandos compilados una vez para todas las peticiones
+        self.cache_resultados = ResultCache()
+        self.registro = self._crear_registro()
+        
         # Configuración de la ventana
         self.title("Asistente Virtual Avanzado")
         self.geometry("1000x700")
@@ -1016,17 +1040,7 @@ class InterfazAsistente(ctk.CTk):
         )
         
         try:
-            # Comandos de sistema
-            if any(palabra in texto for palabra in ["cierra", "termina", "salir"]):
-                self.auditoria.registrar_evento(
-                    tipo=TipoEvento.SISTEMA,
-                    accion="Solicitud de cierre de aplicación",
-                    detalles={"comando": texto}
-                )
-                self.after(1000, self.destroy)
-                return "Cerrando la aplicación. ¡Hasta pronto!"
-                
-            # Procesar otros comandos...
+            # Comandos de sistema y demás comandos, con el registro
             respuesta = self._procesar_comandos_especificos(texto)
             
             # Registrar respuesta en auditoría
@@ -1058,166 +1072,197 @@ class InterfazAsistente(ctk.CTk):
             logging.exception(f"Error al procesar comando: {texto}")
             return f"Lo siento, hubo un error al procesar tu solicitud: {str(e)}"
 
+    def _crear_registro(self) -> CommandRegistry:
+        """
+        Registra los comandos de la interfaz una sola vez.
+
+        Las palabras clave conservan el orden de prioridad de la antigua
+        cadena de condiciones: el cierre primero y los cálculos al final.
+        """
+        registro = CommandRegistry()
+        registro.register("salir", self._cmd_salir, keywords=["cierra", "termina", "salir"])
+        registro.register("hora", self._cmd_hora, keywords=["hora"])
+        registro.register("fecha", self._cmd_fecha, keywords=["fecha"])
+        registro.register("archivos", self._cmd_archivos, keywords=["archivos", "documentos"])
+        registro.register("ip", self._cmd_ip, keywords=["mi ip", "mi dirección ip"])
+        registro.register("ping", self._cmd_ping, keywords=["ping"])
+        registro.register("listar archivos", self._cmd_listar_archivos,
+                          keywords=["listar archivos", "muestra archivos"])
+        registro.register("procesos", self._cmd_procesos,
+                          keywords=["cuántos procesos", "muestra procesos", "muestra los procesos"])
+        registro.register("información del sistema", self._cmd_info_sistema,
+                          keywords=["información del sistema"])
+        registro.register("clima", self._cmd_clima, keywords=["clima", "tiempo"])
+        registro.register("traducir", self._cmd_traducir, keywords=["traduce"])
+        registro.register("recordatorio", self._cmd_recordatorio, keywords=["recuérdame", "recuerda que"])
+        registro.register("calcular", self._cmd_calcular,
+                          keywords=["más", "menos", "por", "dividido", "elevado a"])
+        # Las acciones de comandos.json no se registran aquí: sus frases exactas
+        # ("qué hora es") ganarían a las palabras clave de la interfaz
+        registro.compile()
+        return registro
+
     def _procesar_comandos_especificos(self, texto: str) -> str:
-        """Procesa comandos específicos y devuelve respuestas."""
-        # Comandos de sistema
-        if any(palabra in texto for palabra in ["hora"]):
-            return f"La hora actual es: {datetime.datetime.now().strftime('%H:%M')}"
-            
-        if any(palabra in texto for palabra in ["fecha"]):
-            return f"Hoy es: {datetime.datetime.now().strftime('%d/%m/%Y')}"
-            
-        if any(palabra in texto for palabra in ["archivos", "documentos"]):
-            return "Puedo ayudarte a buscar archivos. ¿Qué tipo de archivo necesitas?"
-            
-        # Comandos de red
-        if "ip" in texto and ("cuál es mi" in texto or "muestra mi" in texto):
-            try:
-                # Obtener la dirección IP local
-                import socket
-                hostname = socket.gethostname()
-                ip_address = socket.gethostbyname(hostname)
-                return f"Tu dirección IP local es: {ip_address}"
-            except Exception as e:
-                return f"No se pudo obtener la dirección IP: {str(e)}"
-                
-        elif "ping" in texto and "a " in texto:
-            dominio = texto.split("a ")[-1].strip()
-            return self._ejecutar_comando_windows(f"ping {dominio}")
-            
-        # Comandos del sistema de archivos
-        elif "listar archivos" in texto or "muestra archivos" in texto:
-            ruta = "."
-            if "en " in texto:
-                ruta = texto.split("en ")[-1].strip()
-            
-            try:
-                archivos = os.listdir(ruta)
-                if not archivos:
-                    return f"No hay archivos en {ruta}"
-                return f"Archivos en {ruta}:\n" + "\n".join(archivos)
-            except Exception as e:
-                return f"Error al listar archivos: {str(e)}"
-                
-        # Comandos de procesos
-        elif "procesos" in texto and ("cuántos" in texto or "muestra" in texto):
-            try:
-                procesos = list(psutil.process_iter())
-                return f"Hay {len(procesos)} procesos en ejecución."
-            except Exception as e:
-                return f"Error al contar procesos: {str(e)}"
-                
-        # Comando para obtener información del sistema
-        elif "información del sistema" in texto:
-            try:
-                info = []
-                info.append(f"Sistema: {platform.system()} {platform.release()}")
-                info.append(f"Procesador: {platform.processor()}")
-                info.append(f"Arquitectura: {platform.machine()}")
-                info.append(f"Python: {platform.python_version()}")
-                
-                # Obtener información de la memoria
-                mem = psutil.virtual_memory()
-                info.append(f"\nMemoria total: {mem.total / (1024**3):.2f} GB")
-                info.append(f"Memoria disponible: {mem.available / (1024**3):.2f} GB")
-                info.append(f"Porcentaje de memoria usada: {mem.percent}%")
-                
-                # Obtener información del disco
-                particiones = psutil.disk_partitions()
-                for particion in particiones:
-                    try:
-                        uso = psutil.disk_usage(particion.mountpoint)
-                        info.append(f"\nDisco {particion.device} ({particion.mountpoint}):")
-                        info.append(f"  Total: {uso.total / (1024**3):.2f} GB")
-                        info.append(f"  Usado: {uso.used / (1024**3):.2f} GB")
-                        info.append(f"  Libre: {uso.free / (1024**3):.2f} GB")
-                        info.append(f"  Porcentaje usado: {uso.percent}%")
-                    except Exception as e:
-                        info.append(f"  Error al obtener información de {particion.device}: {str(e)}")
-                
-                return "\n".join(info)
-                
-            except Exception as e:
-                return f"Error al obtener información del sistema: {str(e)}"
-                
-        # Comando para obtener el clima
-        elif "clima" in texto or "tiempo" in texto:
-            try:
-                # Usar una API de clima (requiere clave de API)
-                # Esta es una implementación de ejemplo con OpenWeatherMap
-                return "Para obtener el clima, necesitarías configurar una API de clima como OpenWeatherMap."
-                
-            except Exception as e:
-                return f"Error al obtener el clima: {str(e)}"
-                
-        # Comando para traducir texto
-        elif "traduce" in texto and "a" in texto:
-            try:
-                # Extraer el texto a traducir y el idioma destino
-                partes = texto.split("traduce", 1)[1].split("a", 1)
-                texto_a_traducir = partes[0].strip()
-                idioma_destino = partes[1].strip()
-                
-                # Mapear nombres de idiomas a códigos (ejemplo básico)
-                idiomas = {
-                    "inglés": "en",
-                    "español": "es",
-                    "francés": "fr",
-                    "alemán": "de",
-                    "italiano": "it",
-                    "portugués": "pt"
-                }
-                
-                codigo_idioma = idiomas.get(idioma_destino.lower(), "en")
-                
-                # En una implementación real, aquí se usaría una API de traducción
-                # como Google Translate o DeepL
-                return f"Para traducir '{texto_a_traducir}' a {idioma_destino} (código: {codigo_idioma}), necesitarías configurar una API de traducción."
-                
-            except Exception as e:
-                return f"Error al procesar la solicitud de traducción: {str(e)}"
-                
-        # Comando para configurar recordatorios
-        elif "recuérdame" in texto or "recuerda que" in texto:
+        """Resuelve el texto con el registro de comandos y devuelve la respuesta."""
+        coincidencia, respuesta = self.registro.dispatch(texto)
+        # Si no se reconoce ningún comando avanzado
+        return respuesta or ""
+
+    def _cmd_salir(self, texto: str) -> str:
+        self.auditoria.registrar_evento(
+            tipo=TipoEvento.SISTEMA,
+            accion="Solicitud de cierre de aplicación",
+            detalles={"comando": texto}
+        )
+        self.after(1000, self.destroy)
+        return "Cerrando la aplicación. ¡Hasta pronto!"
+
+    def _cmd_hora(self, texto: str) -> str:
+        return f"La hora actual es: {datetime.datetime.now().strftime('%H:%M')}"
+
+    def _cmd_fecha(self, texto: str) -> str:
+        return f"Hoy es: {datetime.datetime.now().strftime('%d/%m/%Y')}"
+
+    def _cmd_archivos(self, texto: str) -> str:
+        return "Puedo ayudarte a buscar archivos. ¿Qué tipo de archivo necesitas?"
+
+    def _cmd_ip(self, texto: str) -> str:
+        try:
+            # Obtener la dirección IP local
+            import socket
+            ip_address = self.cache_resultados.get(
+                "ip", lambda: socket.gethostbyname(socket.gethostname()), ttl=TTL_IP)
+            return f"Tu dirección IP local es: {ip_address}"
+        except Exception as e:
+            return f"No se pudo obtener la dirección IP: {str(e)}"
+
+    def _cmd_ping(self, texto: str) -> str:
+        dominio = texto.split("a ")[-1].strip()
+        return self._ejecutar_comando_windows(f"ping {dominio}")
+
+    def _cmd_listar_archivos(self, texto: str) -> str:
+        ruta = "."
+        if "en " in texto:
+            ruta = texto.split("en ")[-1].strip()
+
+        try:
+            archivos = os.listdir(ruta)
+            if not archivos:
+                return f"No hay archivos en {ruta}"
+            return f"Archivos en {ruta}:\n" + "\n".join(archivos)
+        except Exception as e:
+            return f"Error al listar archivos: {str(e)}"
+
+    def _cmd_procesos(self, texto: str) -> str:
+        try:
+            procesos = self.cache_resultados.get(
+                "procesos", lambda: sum(1 for _ in psutil.process_iter()), ttl=TTL_PROCESOS)
+            return f"Hay {procesos} procesos en ejecución."
+        except Exception as e:
+            return f"Error al contar procesos: {str(e)}"
+
+    def _cmd_info_sistema(self, texto: str) -> str:
+        try:
+            return self.cache_resultados.get("información del sistema", self._leer_info_sistema,
+                                             ttl=TTL_INFO_SISTEMA)
+        except Exception as e:
+            return f"Error al obtener información del sistema: {str(e)}"
+
+    def _leer_info_sistema(self) -> str:
+        info = []
+        info.append(f"Sistema: {platform.system()} {platform.release()}")
+        info.append(f"Procesador: {platform.processor()}")
+        info.append(f"Arquitectura: {platform.machine()}")
+        info.append(f"Python: {platform.python_version()}")
+
+        # Obtener información de la memoria
+        mem = psutil.virtual_memory()
+        info.append(f"\nMemoria total: {mem.total / (1024**3):.2f} GB")
+        info.append(f"Memoria disponible: {mem.available / (1024**3):.2f} GB")
+        info.append(f"Porcentaje de memoria usada: {mem.percent}%")
+
+        # Obtener información del disco
+        particiones = psutil.disk_partitions()
+        for particion in particiones:
             try:
-                # Extraer el recordatorio del texto
-                recordatorio = texto.split("que")[-1].strip()
-                
-                # Aquí podrías implementar la lógica para guardar el recordatorio
-                # en una base de datos o archivo, y programar una notificación
-                
-                return f"Recordatorio guardado: {recordatorio}"
-                
+                uso = psutil.disk_usage(particion.mountpoint)
+                info.append(f"\nDisco {particion.device} ({particion.mountpoint}):")
+                info.append(f"  Total: {uso.total / (1024**3):.2f} GB")
+                info.append(f"  Usado: {uso.used / (1024**3):.2f} GB")
+                info.append(f"  Libre: {uso.free / (1024**3):.2f} GB")
+                info.append(f"  Porcentaje usado: {uso.percent}%")
             except Exception as e:
-                return f"Error al guardar el recordatorio: {str(e)}"
-                
-        # Comando para realizar cálculos matemáticos
-        elif any(op in texto for op in ["más", "menos", "por", "dividido", "elevado a"]):
+                info.append(f"  Error al obtener información de {particion.device}: {str(e)}")
+
+        return "\n".join(info)
+
+    def _cmd_clima(self, texto: str) -> str:
+        # Usar una API de clima (requiere clave de API)
+        # Esta es una implementación de ejemplo con OpenWeatherMap
+        return "Para obtener el clima, necesitarías configurar una API de clima como OpenWeatherMap."
+
+    def _cmd_traducir(self, texto: str) -> str:
+        try:
+            # Extraer el texto a traducir y el idioma destino
+            partes = texto.split("traduce", 1)[1].split("a", 1)
+            texto_a_traducir = partes[0].strip()
+            idioma_destino = partes[1].strip()
+
+            # Mapear nombres de idiomas a códigos (ejemplo básico)
+            idiomas = {
+                "inglés": "en",
+                "español": "es",
+                "francés": "fr",
+                "alemán": "de",
+                "italiano": "it",
+                "portugués": "pt"
+            }
+
+            codigo_idioma = idiomas.get(idioma_destino.lower(), "en")
+
+            # En una implementación real, aquí se usaría una API de traducción
+            # como Google Translate o DeepL
+            return f"Para traducir '{texto_a_traducir}' a {idioma_destino} (código: {codigo_idioma}), necesitarías configurar una API de traducción."
+
+        except Exception as e:
+            return f"Error al procesar la solicitud de traducción: {str(e)}"
+
+    def _cmd_recordatorio(self, texto: str) -> str:
+        try:
+            # Extraer el recordatorio del texto
+            recordatorio = texto.split("que")[-1].strip()
+
+            # Aquí podrías implementar la lógica para guardar el recordatorio
+            # en una base de datos o archivo, y programar una notificación
+
+            return f"Recordatorio guardado: {recordatorio}"
+
+        except Exception as e:
+            return f"Error al guardar el recordatorio: {str(e)}"
+
+    def _cmd_calcular(self, texto: str) -> str:
+        try:
+            # Reemplazar términos en español por operadores matemáticos
+            expresion = texto\
+                .replace("más", "+")\
+                .replace("menos", "-")\
+                .replace("por", "*")\
+                .replace("dividido entre", "/")\
+                .replace("dividido", "/")\
+                .replace("elevado a", "**")\
+                .replace("al cuadrado", "**2")\
+                .replace("al cubo", "**3")
+
+            # Eliminar caracteres no deseados
+            import re
+            expresion = re.sub(r'[^0-9+\-*/.() ]', '', expresion)
+
+            # Evaluar la expresión de forma segura
             try:
-                # Reemplazar términos en español por operadores matemáticos
-                expresion = texto\
-                    .replace("más", "+")\
-                    .replace("menos", "-")\
-                    .replace("por", "*")\
-                    .replace("dividido entre", "/")\
-                    .replace("dividido", "/")\
-                    .replace("elevado a", "**")\
-                    .replace("al cuadrado", "**2")\
-                    .replace("al cubo", "**3")
-                
-                # Eliminar caracteres no deseados
-                import re
-                expresion = re.sub(r'[^0-9+\-*/.() ]', '', expresion)
-                
-                # Evaluar la expresión de forma segura
-                try:
-                    resultado = eval(expresion)
-                    return f"El resultado es: {resultado}"
-                except:
-                    return "No pude realizar el cálculo. Asegúrate de usar una expresión válida."
-                    
-            except Exception as e:
-                return f"Error al procesar el cálculo: {str(e)}"
-                
-        # Si no se reconoce ningún comando avanzado
-        return ""
+                resultado = eval(expresion)
+                return f"El resultado es: {resultado}"
+            except:
+                return "No pude realizar el cálculo. Asegúrate de usar una expresión válida."
+
+        except Exception as e:
+            return f"Error al procesar el cálculo: {str(e)}"
@@ -22,7 +22,6 @@ import uuid
 import tkinter as tk
 import sounddevice as sd
 import vosk
-import difflib
 import pyautogui
 import psutil
 import platform
@@ -33,6 +32,9 @@ from enum import Enum, auto
 import customtkinter as ctk
 from PIL import Image, ImageTk
 
+from core.command_registry import CommandRegistry
+from core.wake_word import WakeWordMatcher
+
 # Configuración de logging
 logging.basicConfig(
     filename="asistente.log",
@@ -46,6 +48,16 @@ WAKE_WORDS = ["autogestión", "agp", "asistente", "illo", "compae"]
 HISTORIAL = "historial_comandos.txt"
 TIMEOUT = 0.5
 SENSIBILIDAD_WAKE = 0.7
+# Variantes que Vosk suele producir para las palabras de activación
+VARIANTES_WAKE = [
+    'autogestión', 'auto gestión', 'auto-gestión', 'autogestion',
+    'agp', 'a jipi', 'a g p',
+    'asistente', 'asistencia', 'asistir',
+    'illo', 'hijo', 'hija', 'hijito',
+    'compae', 'compa', 'compañero', 'compañera',
+    'oye', 'oiga', 'escucha', 'hola asistente'
+]
+detector_wake = WakeWordMatcher(VARIANTES_WAKE, threshold=SENSIBILIDAD_WAKE)
 
 # Inicialización de colas
 audio_queue = queue.Queue()
@@ -168,6 +180,9 @@ class InterfazAsistente(ctk.CTk):
         self.historial_mensajes = []
         self.historial_archivo = None
         
+        # Comandos compilados una vez para todas las peticiones
+        self.registro = self._crear_registro()
+        
         # Cargar recursos
         self._cargar_recursos()
         
@@ -1047,32 +1062,11 @@ class InterfazAsistente(ctk.CTk):
     
     def _es_wake_word(self, texto):
         """Verifica si el texto contiene una palabra de activación."""
-        WAKE_WORDS = [
-            'autogestión', 'auto gestión', 'auto-gestión', 'autogestion',
-            'agp', 'a jipi', 'a jipi', 'a g p',
-            'asistente', 'asistencia', 'asistir',
-            'illo', 'hijo', 'hija', 'hijito',
-            'compae', 'compa', 'compañero', 'compañera',
-            'oye', 'oiga', 'escucha', 'hola asistente'
-        ]
-        
-        # Normalizar el texto
-        texto = texto.lower().strip()
-        
-        # Verificar coincidencias exactas primero
-        for palabra in WAKE_WORDS:
-            if palabra in texto:
-                return True
-        
-        # Usar fuzzy matching para variaciones
-        for palabra in WAKE_WORDS:
-            # Calcular similitud con la biblioteca difflib
-            similitud = difflib.SequenceMatcher(None, texto, palabra).ratio()
-            if similitud > 0.7:  # Umbral de similitud ajustable
-                logging.info(f"Wake word detectada por similitud: '{texto}' ≈ '{palabra}' ({similitud:.2f})")
-                return True
-        
-        return False
+        coincidencia = detector_wake.find(texto)
+        if coincidencia is not None and coincidencia.score < 1.0:
+            logging.info(f"Wake word detectada por similitud: '{texto}' ≈ "
+                         f"'{coincidencia.phrase}' ({coincidencia.score:.2f})")
+        return coincidencia is not None
 
     def _procesar_comando(self, texto):
         """Procesa un comando de voz o texto."""
@@ -1094,8 +1088,7 @@ class InterfazAsistente(ctk.CTk):
             return
             
         # Limpiar el texto quitando las palabras de activación
-        for palabra in WAKE_WORDS:
-            texto = texto.replace(palabra, '').strip()
+        texto = detector_wake.strip(texto)
         if not texto:
             texto = "¿Sí? ¿En qué puedo ayudarte?"
         
@@ -1116,71 +1109,92 @@ class InterfazAsistente(ctk.CTk):
             if hasattr(self, 'hablar') and callable(self.hablar):
                 self.hablar(respuesta)
     
+    def _crear_registro(self):
+        """
+        Registra los comandos de la interfaz una sola vez.
+
+        Las palabras clave conservan el orden de prioridad de la antigua
+        cadena de condiciones (los saludos primero).
+        """
+        registro = CommandRegistry()
+        registro.register("saludo", self._cmd_saludo, keywords=[
+            "hola", "buenos días", "buenas tardes", "buenas noches", "qué tal", "cómo estás"])
+        registro.register("hora", self._cmd_hora, keywords=["qué hora es", "dime la hora", "hora actual"])
+        registro.register("fecha", self._cmd_fecha,
+                          keywords=["qué día es hoy", "qué fecha es hoy", "fecha actual"])
+        registro.register("navegador", self._cmd_navegador, keywords=[
+            "abre el navegador", "abrir navegador", "abre chrome", "abre firefox"])
+        registro.register("buscar", self._cmd_buscar, keywords=["busca", "buscar", "busca en internet"])
+        registro.register("salir", self._cmd_salir, keywords=[
+            "cierra la aplicación", "salir", "ciérrate", "hasta luego"])
+        registro.register("ayuda", self._cmd_ayuda, keywords=["qué puedes hacer", "ayuda", "qué comandos hay"])
+        registro.register("escucha", self._cmd_escucha, keywords=["escucha", "atención", "estás ahí"])
+        registro.register("silencio", self._cmd_silencio,
+                          keywords=["cállate", "silencio", "deja de escuchar"])
+        # Las acciones de comandos.json no se registran aquí: sus frases exactas
+        # ("qué hora es") ganarían a las palabras clave de la interfaz
+        registro.compile()
+        return registro
+
     def _procesar_comandos_especificos(self, texto):
-        """Procesa comandos específicos y devuelve respuestas."""
-        texto = texto.lower().strip()
-        
-        # Comandos de saludo
-        if any(palabra in texto for palabra in ["hola", "buenos días", "buenas tardes", "buenas noches", "qué tal", "cómo estás"]):
-            saludos = [
-                "¡Hola! ¿En qué puedo ayudarte hoy?",
-                "¡Hola! ¿Cómo estás?",
-                "¡Hola! ¿En qué puedo asistirte?",
-                "¡Hola! Estoy listo para ayudarte.",
-                "¡Buenas! ¿Qué necesitas?"
-            ]
-            return random.choice(saludos)
-        
-        # Comandos de tiempo
-        if any(palabra in texto for palabra in ["qué hora es", "dime la hora", "hora actual"]):
-            hora_actual = datetime.datetime.now().strftime("%H:%M")
-            return f"Son las {hora_actual}."
-        
-        if any(palabra in texto for palabra in ["qué día es hoy", "qué fecha es hoy", "fecha actual"]):
-            fecha_actual = datetime.datetime.now().strftime("%A, %d de %B de %Y")
-            return f"Hoy es {fecha_actual}."
-        
-        # Comandos de navegación
-        if any(palabra in texto for palabra in ["abre el navegador", "abrir navegador", "abre chrome", "abre firefox"]):
+        """Resuelve el texto con el registro de comandos y devuelve la respuesta."""
+        coincidencia, respuesta = self.registro.dispatch(texto)
+        return respuesta or ""
+
+    def _cmd_saludo(self, texto):
+        saludos = [
+            "¡Hola! ¿En qué puedo ayudarte hoy?",
+            "¡Hola! ¿Cómo estás?",
+            "¡Hola! ¿En qué puedo asistirte?",
+            "¡Hola! Estoy listo para ayudarte.",
+            "¡Buenas! ¿Qué necesitas?"
+        ]
+        return random.choice(saludos)
+
+    def _cmd_hora(self, texto):
+        hora_actual = datetime.datetime.now().strftime("%H:%M")
+        return f"Son las {hora_actual}."
+
+    def _cmd_fecha(self, texto):
+        fecha_actual = datetime.datetime.now().strftime("%A, %d de %B de %Y")
+        return f"Hoy es {fecha_actual}."
+
+    def _cmd_navegador(self, texto):
+        try:
+            webbrowser.open("https://www.google.com")
+            return "Abriendo el navegador web en Google."
+        except Exception as e:
+            return f"No pude abrir el navegador: {str(e)}"
+
+    def _cmd_buscar(self, texto):
+        busqueda = re.sub(r'(busca|buscar|en internet|por favor|quiero)', '', texto, flags=re.IGNORECASE).strip()
+        if busqueda:
             try:
-                webbrowser.open("https://www.google.com")
-                return "Abriendo el navegador web en Google."
+                webbrowser.open(f"https://www.google.com/search?q={busqueda}")
+                return f"Buscando en internet: {busqueda}"
             except Exception as e:
-                return f"No pude abrir el navegador: {str(e)}"
-        
-        if "busca " in texto or "buscar " in texto or "busca en internet" in texto:
-            busqueda = re.sub(r'(busca|buscar|en internet|por favor|quiero)', '', texto, flags=re.IGNORECASE).strip()
-            if busqueda:
-                try:
-                    webbrowser.open(f"https://www.google.com/search?q={busqueda}")
-                    return f"Buscando en internet: {busqueda}"
-                except Exception as e:
-                    return f"No pude realizar la búsqueda: {str(e)}"
-        
-        # Comandos de sistema
-        if any(palabra in texto for palabra in ["cierra la aplicación", "salir", "ciérrate", "hasta luego"]):
-            self.after(1000, self.quit)
-            return "Cerrando la aplicación. ¡Hasta luego!"
-        
-        # Comandos de ayuda
-        if any(palabra in texto for palabra in ["qué puedes hacer", "ayuda", "qué comandos hay"]):
-            return (
-                "Puedo ayudarte con las siguientes tareas:\n"
-                "• Decir la hora o fecha actual\n"
-                "• Buscar en internet\n"
-                "• Abrir el navegador\n"
-                "• Mantener una conversación básica\n\n"
-                "Solo dime qué necesitas y haré lo posible por ayudarte."
-            )
-        
-        # Comandos de control
-        if any(palabra in texto for palabra in ["escucha", "atención", "estás ahí"]):
-            return "Sí, te escucho. ¿En qué puedo ayudarte?"
-            
-        if any(palabra in texto for palabra in ["cállate", "silencio", "deja de escuchar"]):
-            return "Entendido, me pondré en modo silencio. Di mi nombre cuando necesites ayuda."
-        
+                return f"No pude realizar la búsqueda: {str(e)}"
         return ""
+
+    def _cmd_salir(self, texto):
+        self.after(1000, self.quit)
+        return "Cerrando la aplicación. ¡Hasta luego!"
+
+    def _cmd_ayuda(self, texto):
+        return (
+            "Puedo ayudarte con las siguientes tareas:\n"
+            "• Decir la hora o fecha actual\n"
+            "• Buscar en internet\n"
+            "• Abrir el navegador\n"
+            "• Mantener una conversación básica\n\n"
+            "Solo dime qué necesitas y haré lo posible por ayudarte."
+        )
+
+    def _cmd_escucha(self, texto):
+        return "Sí, te escucho. ¿En qué puedo ayudarte?"
+
+    def _cmd_silencio(self, texto):
+        return "Entendido, me pondré en modo silencio. Di mi nombre cuando necesites ayuda."
     
     def _procesar_conversacion(self, texto):
         """Procesa el texto como una conversación normal."""
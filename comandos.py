@@ -1,69 +1,198 @@
+import os
 import threading
 import logging
-import json
-from tts import hablar
+import _thread
+from pathlib import Path
+from core.actions_watcher import ActionsWatcher
+from core.command_executor import CommandExecutor, current_token
+from core.command_queue import CommandQueue, Priority, PriorityClassifier
+from core.command_registry import CommandRegistry, load_actions
+from core.plugin_manager import PluginManager
+from tts import hablar, interrumpir
 from utils import registrar_historial
 
 comando_queue = None
 
-# Carga comandos de archivo JSON externo para fácil edición/ampliación
-with open("comandos.json", "r", encoding="utf8") as f:
-    COMANDOS_EXTERNOS = json.load(f)
+# Carga comandos de archivo JSON externo para fácil edición/ampliación;
+# se recarga en caliente al modificarlo
+ARCHIVO_COMANDOS = Path(__file__).parent / "comandos.json"
+INTERVALO_RECARGA = 1.0
+COMANDOS_EXTERNOS = load_actions(ARCHIVO_COMANDOS)
 
-def ejecutar_comando(texto):
-    texto = texto.lower().strip()
-    # Comprobación rápida en JSON externo
-    if texto in COMANDOS_EXTERNOS:
-        accion = COMANDOS_EXTERNOS[texto]
-        if accion.startswith("http"):
-            import os
-            os.system(f'start chrome "{accion}"')
-            hablar(f"Abriendo {accion.split('//')[1].split('/')[0]}")
-        else:
-            hablar(accion)
-        registrar_historial(texto, accion)
-        return
+# Similitud mínima para aceptar un comando aproximado y la asignada a los fonéticos
+UMBRAL_COMANDO = 0.75
+SIMILITUD_FONETICA = 0.9
+
+# Comandos ejecutándose a la vez, admitidos en cola y segundos antes de cancelar uno
+HILOS_COMANDOS = 4
+MAX_PENDIENTES = 16
+TIEMPO_MAXIMO_COMANDO = 20.0
+TIEMPO_OPENAI = 15.0
+
+# Órdenes que se atienden antes que todo lo encolado y cortan la voz en curso
+FRASES_CANCELAR = ["para", "para ya", "cancela", "cancela eso", "cancelar", "detente", "stop", "basta"]
+FRASES_CONTROL = FRASES_CANCELAR + ["salir", "apagar", "apágate"]
+# Comandos lentos que pueden esperar a los interactivos
+PALABRAS_FONDO = ["openai"]
+CLASIFICADOR_PRIORIDAD = PriorityClassifier(control=FRASES_CONTROL, background=PALABRAS_FONDO)
+
+def ejecutar_accion(frase, accion):
+    """Acción de un comando de comandos.json: abrir la URL o decir el texto."""
+    if accion.startswith("http"):
+        os.system(f'start chrome "{accion}"')
+        hablar(f"Abriendo {accion.split('//')[1].split('/')[0]}")
+    else:
+        hablar(accion)
+    registrar_historial(frase, accion)
 
-    # Fallback: ayuda dinámica (comandos disponibles)
-    if texto in ("ayuda", "help"):
-        posibles = [k for k in COMANDOS_EXTERNOS.keys()]
-        hablar("Puedes decir: " + ", ".join(posibles[:5]) + "...")
-        return
+def ayuda():
+    # Ayuda dinámica (comandos disponibles)
+    posibles = [comando.name for comando in REGISTRO.commands()]
+    hablar("Puedes decir: " + ", ".join(posibles[:5]) + "...")
 
+def consultar_openai(texto):
     # OpenAI integration example (requiere KEY y requests)
-    if "openai" in texto:
-        try:
-            import requests
-            OPENAI_KEY = "tu-clave-openai"
-            prompt = "¿Qué hora es en Nueva York?"
-            res = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={"Authorization": f"Bearer {OPENAI_KEY}"},
-                json={"model": "gpt-3.5-turbo", "messages": [{"role":"user","content":prompt}]}
-            )
-            text_res = res.json()["choices"][0]["message"]["content"]
-            hablar(text_res)
-            registrar_historial(texto, "openai_consulta")
+    try:
+        import requests
+        OPENAI_KEY = "tu-clave-openai"
+        prompt = "¿Qué hora es en Nueva York?"
+        res = requests.post(
+            "https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": f"Bearer {OPENAI_KEY}"},
+            json={"model": "gpt-3.5-turbo", "messages": [{"role":"user","content":prompt}]},
+            timeout=TIEMPO_OPENAI
+        )
+        if current_token().cancelled:
+            # El usuario dijo "para" mientras esperábamos: no se lee la respuesta
             return
-        except Exception as e:
-            hablar("No puedo conectar con OpenAI ahora.")
-            logging.error(f"OpenAI error: {e}")
+        text_res = res.json()["choices"][0]["message"]["content"]
+        hablar(text_res)
+        registrar_historial(texto, "openai_consulta")
+    except Exception as e:
+        hablar("No puedo conectar con OpenAI ahora.")
+        logging.error(f"OpenAI error: {e}")
+
+def cancelar():
+    """Aborta los comandos en curso y los que esperan en cola."""
+    cancelados = EJECUTOR.cancel_all("cancelado por el usuario")
+    hablar("Cancelado." if cancelados else "No hay nada que cancelar.")
+    registrar_historial("cancelar", f"cancelados: {cancelados}")
+
+def avisar_tiempo_agotado(tarea):
+    hablar(f"El comando {tarea.name} tardó demasiado y lo he cancelado.")
+
+EJECUTOR = CommandExecutor(max_workers=HILOS_COMANDOS, max_pending=MAX_PENDIENTES,
+                           default_timeout=TIEMPO_MAXIMO_COMANDO,
+                           on_timeout=avisar_tiempo_agotado)
+# Comandos que se ejecutan en el hilo de la cola, sin esperar turno en el ejecutor
+COMANDOS_EN_LINEA = {"cancelar", "apagar"}
+
+# Registro único: comandos.json, comandos integrados y plugins, por este orden de prioridad
+REGISTRO = CommandRegistry(fuzzy_threshold=UMBRAL_COMANDO, phonetic_score=SIMILITUD_FONETICA)
+REGISTRO.register_actions(COMANDOS_EXTERNOS, ejecutar_accion, source="json")
+REGISTRO.register("ayuda", ayuda, phrases=["ayuda", "help"])
+REGISTRO.register("openai", consultar_openai, keywords=["openai"])
+# Frases completas: "para" como palabra clave saltaría con "para mañana"
+REGISTRO.register("cancelar", cancelar, phrases=FRASES_CANCELAR)
+# Los comandos de los plugins (y sus ejemplos, para las peticiones en lenguaje
+# natural) se añaden y quitan al cargar y descargar cada plugin
+PLUGINS = PluginManager(Path("plugins"))
+REGISTRO.track_plugins(PLUGINS)
+for nombre in PLUGINS.discover_plugins():
+    PLUGINS.load_plugin(nombre)
+REGISTRO.compile()
+VIGILANTE_COMANDOS = ActionsWatcher(ARCHIVO_COMANDOS, REGISTRO, ejecutar_accion,
+                                   interval=INTERVALO_RECARGA)
 
-    # Por defecto
-    hablar("No entiendo ese comando todavía. Di 'ayuda' para saber más.")
-    registrar_historial(texto, "no_reconocido")
+def buscar_comando(texto):
+    """Devuelve (nombre del comando, similitud) para el texto, o (None, 0.0)."""
+    coincidencia = REGISTRO.resolve(texto)
+    if coincidencia is None:
+        return None, 0.0
+    return coincidencia.command.name, coincidencia.score
+
+def resolver_comando(texto):
+    """Devuelve el nombre del comando que corresponde al texto, o None."""
+    return buscar_comando(texto)[0]
+
+def confianza_temprana(texto):
+    """
+    Confianza para ejecutar el comando de un resultado parcial, antes del final.
+
+    Solo cuenta una frase exacta y completa. Las órdenes de control, los
+    comandos en línea o destructivos y las frases que otro disparador alarga
+    esperan siempre al final: "para" puede acabar en "para mañana..." y
+    "cierra el programa" en "cierra el programa de música".
+    """
+    texto = texto.lower().strip()
+    coincidencia = REGISTRO.resolve(texto)
+    if coincidencia is None or coincidencia.method != "exact":
+        return 0.0
+    comando = coincidencia.command
+    if (comando.destructive or comando.name in COMANDOS_EN_LINEA
+            or CLASIFICADOR_PRIORIDAD(texto) is Priority.CONTROL or REGISTRO.extensible(texto)):
+        return 0.0
+    return coincidencia.score
+
+def ejecutar_comando(texto):
+    """
+    Resuelve el texto y ejecuta su comando en el ejecutor (cancelar, en el acto).
+
+    Devuelve la tarea del ejecutor, o None si el comando ya ha terminado.
+    """
+    texto = texto.lower().strip()
+    coincidencia = REGISTRO.resolve(texto)
+    if coincidencia is None:
+        hablar("No entiendo ese comando todavía. Di 'ayuda' para saber más.")
+        registrar_historial(texto, "no_reconocido")
+        return None
+    if coincidencia.command.name in COMANDOS_EN_LINEA:
+        _ejecutar_coincidencia(texto, coincidencia)
+        return None
+    tarea = EJECUTOR.submit(_ejecutar_coincidencia, texto, coincidencia,
+                            name=coincidencia.command.name)
+    if tarea is None:
+        hablar("Tengo demasiadas tareas pendientes, espera un momento.")
+    return tarea
+
+def _ejecutar_coincidencia(texto, coincidencia):
+    resultado = coincidencia.execute()
+    if coincidencia.command.source.startswith("plugin:") and not current_token().cancelled:
+        # Los plugins devuelven la respuesta; "shutdown" pide apagar el asistente
+        registrar_historial(texto, coincidencia.command.name)
+        if resultado == "shutdown":
+            hablar("Apagando el asistente.")
+            _thread.interrupt_main()
+        elif resultado:
+            hablar(str(resultado))
+
+def crear_cola_comandos():
+    """Cola de comandos con prioridades: los de control se adelantan y cortan la voz."""
+    cola = CommandQueue(CLASIFICADOR_PRIORIDAD)
+    cola.add_preempt_listener(interrumpir)
+    return cola
 
 def worker_comandos():
     while True:
         try:
-            texto = comando_queue.get(timeout=2)
+            entrada = comando_queue.get_entry(timeout=2)
         except Exception:
             continue
-        if texto is None:
+        if entrada.item is None:
             break
-        ejecutar_comando(texto)
+        tarea = ejecutar_comando(entrada.item)
+        # Latencia por clase desde que se encoló hasta que termina el comando
+        if tarea is None:
+            comando_queue.observe(entrada)
+        else:
+            tarea.future.add_done_callback(lambda _, entrada=entrada: comando_queue.observe(entrada))
+    logging.info(f"Cola de comandos: {comando_queue.stats()}")
+    logging.info(f"Ejecutor de comandos: {EJECUTOR.stats()}")
+    EJECUTOR.shutdown(wait=False)
 
 def start_comando_worker(input_queue):
+    """Arranca el hilo de comandos sobre una cola creada con ``crear_cola_comandos``."""
     global comando_queue
     comando_queue = input_queue
     threading.Thread(target=worker_comandos, daemon=True).start()
+    VIGILANTE_COMANDOS.start()
@@ -7,3 +7,16 @@ TIMEOUT = 1.0
 SENSIBILIDAD_WAKE = 0.6
 # Umbral de volumen mínimo para activar el reconocimiento (0-100)
 UMBRAL_VOLUMEN = 30
+# Audio previo al inicio de voz que se reenvía al reconocedor (milisegundos)
+PREROLL_MS = 400
+# Enviar a Vosk solo los segmentos con voz detectados por el VAD
+COMPUERTA_VOZ = True
+# Actuar sobre los resultados parciales de Vosk sin esperar al final de la frase
+RESULTADOS_PARCIALES = True
+# Parciales consecutivos que deben coincidir para considerar estable un prefijo
+PARCIALES_ESTABLES = 2
+# Confianza mínima (0.0 a 1.0) para confirmar una frase a partir de un parcial
+UMBRAL_CONFIRMACION_TEMPRANA = 0.9
+# Buscar la palabra de activación con una gramática restringida y usar el
+# reconocedor completo solo tras detectarla
+DOS_ETAPAS_WAKE = True
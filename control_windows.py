@@ -14,6 +14,7 @@ import time
 from ctypes import cast, POINTER
 from comtypes import CLSCTX_ALL
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+from core.command_executor import current_token
 
 class ControlWindows:
     def __init__(self):
@@ -158,7 +159,11 @@ class ControlWindows:
         try:
             # Limitamos la búsqueda a 3 niveles de profundidad por rendimiento
             resultados = []
+            testigo = current_token()
             for raiz, dirs, archivos in os.walk(directorio, topdown=True):
+                # Se abandona el recorrido si el comando se cancela o agota su tiempo
+                if testigo.cancelled:
+                    return "Búsqueda cancelada"
                 nivel = raiz.count(os.sep)
                 if nivel > 3:  # Límite de profundidad
                     dirs[:] = []  # No recorrer subdirectorios
@@ -0,0 +1,121 @@
+"""
+Recarga en caliente de archivos de acciones (``comandos.json``).
+Un hilo en segundo plano comprueba la fecha de modificación del archivo;
+cuando cambia, lo valida y compila el nuevo despacho del registro fuera del
+hilo de comandos y lo publica de una vez. Un archivo no válido se rechaza y
+se sigue usando la última versión buena.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from core.command_registry import CommandRegistry, load_actions
+
+logger = logging.getLogger(__name__)
+
+
+class ActionsWatcher:
+    """Vigila un archivo de acciones y sustituye sus comandos en el registro al cambiar."""
+
+    def __init__(self, path: Union[str, Path], registry: CommandRegistry,
+                 handler: Callable[[str, Any], Any], source: str = "json",
+                 interval: float = 1.0):
+        """
+        Inicializa el vigilante.
+
+        La versión actual del archivo se da por cargada: solo se recargan
+        los cambios posteriores.
+
+        Args:
+            path: Archivo JSON frase -> acción
+            registry: Registro cuyos comandos de ``source`` se sustituyen
+            handler: Función ``handler(frase, acción)`` de los comandos
+            source: Origen de los comandos del archivo en el registro
+            interval: Segundos entre comprobaciones
+        """
+        self.path = Path(path)
+        self.registry = registry
+        self.handler = handler
+        self.source = source
+        self.interval = interval
+
+        self.reloads = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self.last_reload: Optional[float] = None
+
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Fecha de modificación y tamaño del archivo, o None si no existe."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> bool:
+        """
+        Comprueba el archivo una vez y lo recarga si ha cambiado.
+
+        Returns:
+            True si se han publicado comandos nuevos
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        # Se recuerda antes de leer: un archivo roto no se reintenta hasta que vuelva a cambiar
+        self._signature = signature
+
+        try:
+            actions = load_actions(self.path)
+        except (OSError, ValueError) as e:
+            self.rejected += 1
+            self.last_error = str(e)
+            logger.error(f"{self.path} no es válido; se mantiene la versión anterior: {e}")
+            return False
+
+        inicio = time.perf_counter()
+        count = self.registry.replace_actions(actions, self.handler, self.source)
+        self.reloads += 1
+        self.last_error = None
+        self.last_reload = time.time()
+        logger.info(f"{self.path} recargado: {count} comandos "
+                    f"({(time.perf_counter() - inicio) * 1000:.1f} ms)")
+        return True
+
+    def start(self) -> "ActionsWatcher":
+        """Empieza a vigilar el archivo en un hilo en segundo plano."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="actions-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Deja de vigilar el archivo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error al recargar {self.path}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Recargas publicadas, archivos rechazados y último error."""
+        return {
+            'reloads': self.reloads,
+            'rejected': self.rejected,
+            'last_error': self.last_error,
+            'last_reload': self.last_reload,
+        }
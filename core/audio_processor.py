@@ -6,10 +6,15 @@ import numpy as np
 from scipy import signal
 import webrtcvad
 import logging
+import time
 from dataclasses import dataclass
+from math import gcd
 from typing import Optional, Tuple, List
 import sounddevice as sd
 
+from core.noise_suppressor import SpectralNoiseSuppressor
+from core.vad import FrameVAD, VADEvent
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -21,6 +26,196 @@ class AudioConfig:
     noise_reduction: bool = True
     auto_gain: bool = True
     silence_threshold: int = 100  # Umbral de silencio (0-32767)
+    streaming_filter: bool = False  # Filtro causal con estado entre chunks (float32)
+    spectral_noise_reduction: bool = False  # Supresión espectral STFT en lugar de la temporal
+    noise_frame_size: int = 512  # Tamaño de FFT del supresor espectral (latencia = 1 frame)
+    max_noise_latency_ms: float = 40.0  # Latencia máxima admitida para el supresor
+    vad_frame_ms: int = 30  # Duración de los frames enviados a webrtcvad (10, 20 o 30)
+    vad_onset_frames: int = 3  # Frames de voz seguidos para considerar que empieza el habla
+    vad_hangover_frames: int = 10  # Frames sin voz seguidos para considerar que termina
+    input_sample_rate: Optional[int] = None  # Frecuencia nativa del dispositivo si no es sample_rate
+
+class PolyphaseResampler:
+    """Remuestreador polifásico en streaming con estado entre bloques."""
+    
+    def __init__(self, input_rate: int, output_rate: int = 16000,
+                 taps_per_phase: int = 16, max_block_ms: float = 5.0):
+        """
+        Inicializa el remuestreador.
+        
+        Args:
+            input_rate: Frecuencia de entrada (p. ej. 44100 o 48000 Hz)
+            output_rate: Frecuencia de salida
+            taps_per_phase: Coeficientes por fase; fija el coste por muestra de salida
+            max_block_ms: Presupuesto de tiempo por bloque; se avisa si se supera
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.taps_per_phase = taps_per_phase
+        self.max_block_ms = max_block_ms
+        
+        # Filtro antialiasing a la frecuencia sobremuestreada, repartido en fases.
+        # Cada fila queda invertida para multiplicar directamente por la ventana
+        # de entrada (de la muestra más antigua a la más reciente).
+        numtaps = self.up * taps_per_phase
+        h = signal.firwin(numtaps, 1.0 / max(self.up, self.down), window=('kaiser', 5.0)) * self.up
+        self.phases = h.reshape(taps_per_phase, self.up).T[:, ::-1].astype(np.float32).copy()
+        
+        self.stats = {'blocks': 0, 'total_time': 0.0, 'max_time': 0.0, 'over_budget': 0}
+        self.reset()
+    
+    def reset(self):
+        """Olvida el historial de entrada."""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._consumed = 0  # Muestras de entrada ya recibidas
+        self._next_output = 0  # Índice de la siguiente muestra de salida
+    
+    @property
+    def latency(self) -> float:
+        """Retardo de grupo del filtro, en segundos."""
+        return (self.up * self.taps_per_phase - 1) / 2 / (self.up * self.input_rate)
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Remuestrea un bloque; la salida conserva el tipo de la entrada.
+        
+        Args:
+            audio: Bloque mono (int16 o float)
+            
+        Returns:
+            Muestras a ``output_rate`` que ya se pueden calcular con lo recibido
+        """
+        inicio = time.perf_counter()
+        
+        block = audio.astype(np.float32, copy=False)
+        buffer = np.concatenate([self._history, block])
+        buffer_start = self._consumed - self._history.size
+        self._consumed += block.size
+        
+        # Salidas cuya última muestra de entrada necesaria ya ha llegado
+        last_output = (self._consumed * self.up - 1) // self.down
+        n = np.arange(self._next_output, last_output + 1, dtype=np.int64)
+        self._next_output = max(self._next_output, last_output + 1)
+        
+        positions = n * self.down
+        bases = positions // self.up
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.taps_per_phase)
+        windows = windows[bases - (self.taps_per_phase - 1) - buffer_start]
+        output = np.einsum('ij,ij->i', windows, self.phases[positions % self.up])
+        
+        self._history = buffer[-(self.taps_per_phase - 1):].copy()
+        self._update_stats(time.perf_counter() - inicio)
+        
+        if audio.dtype == np.int16:
+            return np.clip(output, -32768, 32767).astype(np.int16)
+        return output.astype(audio.dtype, copy=False)
+    
+    def _update_stats(self, elapsed: float):
+        """Registra el coste del bloque y avisa si supera el presupuesto."""
+        self.stats['blocks'] += 1
+        self.stats['total_time'] += elapsed
+        self.stats['max_time'] = max(self.stats['max_time'], elapsed)
+        if elapsed * 1000 > self.max_block_ms:
+            self.stats['over_budget'] += 1
+            logger.warning(f"Remuestreo de bloque: {elapsed * 1000:.2f} ms "
+                           f"(presupuesto {self.max_block_ms:.1f} ms)")
+
+class AutomaticGainControl:
+    """Control automático de ganancia con seguidor de envolvente y limitador."""
+    
+    def __init__(self, sample_rate: int = 16000, target_level: float = 0.1,
+                 attack_ms: float = 10.0, release_ms: float = 300.0,
+                 max_gain: float = 10.0, min_gain: float = 0.1,
+                 noise_floor: float = 0.002, limit: float = 0.99, frame_size: int = 128):
+        """
+        Inicializa el AGC.
+        
+        Args:
+            sample_rate: Frecuencia de muestreo
+            target_level: Nivel de pico objetivo (0.0 a 1.0 de la escala completa)
+            attack_ms: Constante de tiempo cuando el nivel sube
+            release_ms: Constante de tiempo cuando el nivel baja
+            max_gain: Ganancia máxima aplicada
+            min_gain: Ganancia mínima aplicada
+            noise_floor: Por debajo de este nivel la ganancia se congela (no se amplifica el ruido)
+            limit: Techo del limitador (0.0 a 1.0 de la escala completa)
+            frame_size: Muestras por medida de nivel; los chunks múltiplos de este
+                tamaño dan el mismo resultado se procesen juntos o por separado
+        """
+        self.sample_rate = sample_rate
+        self.target_level = target_level
+        self.max_gain = max_gain
+        self.min_gain = min_gain
+        self.noise_floor = noise_floor
+        self.limit = limit
+        self.frame_size = frame_size
+        self.attack_ms = attack_ms
+        self.release_ms = release_ms
+        self.reset()
+    
+    def reset(self):
+        """Vuelve a la ganancia unidad."""
+        self.envelope = 0.0
+        self.gain = 1.0
+    
+    @property
+    def gain_db(self) -> float:
+        """Ganancia actual en decibelios."""
+        return 20.0 * np.log10(self.gain)
+    
+    def _coefficient(self, time_ms: float, samples: int) -> float:
+        """Coeficiente del filtro de un polo para un frame de ``samples`` muestras."""
+        return float(np.exp(-samples / (time_ms * 1e-3 * self.sample_rate)))
+    
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Aplica la ganancia a un chunk conservando el estado entre llamadas.
+        
+        Args:
+            audio: Chunk mono float en [-1.0, 1.0] o int16
+            
+        Returns:
+            Audio con la ganancia aplicada, del mismo tipo que la entrada
+        """
+        if audio.size == 0:
+            return audio
+        
+        is_int16 = audio.dtype == np.int16
+        samples = audio.astype(np.float32) / 32768.0 if is_int16 else audio.astype(np.float32, copy=False)
+        
+        # Nivel de pico por frame, calculado de una vez para todo el chunk
+        n = samples.size
+        starts = np.arange(0, n, self.frame_size)
+        peaks = np.maximum.reduceat(np.abs(samples), starts)
+        lengths = np.diff(np.append(starts, n))
+        
+        # Seguidor de envolvente con ataque/liberación: un paso por frame
+        gains = np.empty(peaks.size, dtype=np.float32)
+        gain = self.gain
+        for i, (peak, length) in enumerate(zip(peaks, lengths)):
+            tau = self.attack_ms if peak > self.envelope else self.release_ms
+            a = self._coefficient(tau, length)
+            self.envelope = a * self.envelope + (1.0 - a) * float(peak)
+            if self.envelope > self.noise_floor:
+                gain = min(max(self.target_level / self.envelope, self.min_gain), self.max_gain)
+            # Limitador: ningún pico del frame puede superar el techo
+            if peak * gain > self.limit:
+                gain = self.limit / float(peak)
+            gains[i] = gain
+        
+        # Rampa lineal de ganancia entre finales de frame para evitar saltos
+        ends = starts + lengths - 1
+        ramp = np.interp(np.arange(n), np.concatenate([[-1], ends]),
+                         np.concatenate([[self.gain], gains])).astype(np.float32)
+        self.gain = float(gains[-1])
+        
+        output = np.clip(samples * ramp, -self.limit, self.limit)
+        if is_int16:
+            return (output * 32768.0).astype(np.int16)
+        return output.astype(audio.dtype, copy=False)
 
 class AudioProcessor:
     """Procesador de audio con filtrado, normalización y VAD."""
@@ -29,14 +224,36 @@ class AudioProcessor:
         """Inicializa el procesador de audio con la configuración dada."""
         self.config = config
         self.vad = webrtcvad.Vad(config.vad_aggressiveness)
+        self.frame_vad = FrameVAD(
+            sample_rate=config.sample_rate,
+            frame_ms=config.vad_frame_ms,
+            onset_frames=config.vad_onset_frames,
+            hangover_frames=config.vad_hangover_frames,
+            vad=self.vad
+        )
+        # Eventos de inicio/fin de voz producidos por el último chunk o lote
+        self.vad_events: List[VADEvent] = []
+        
+        # Remuestreo desde la frecuencia nativa del dispositivo
+        self.resampler = None
+        if config.input_sample_rate and config.input_sample_rate != config.sample_rate:
+            self.resampler = PolyphaseResampler(config.input_sample_rate, config.sample_rate)
         self._init_filters()
         
         # Historial para el filtro de ruido
         self.noise_profile = None
         self.noise_reduction_factor = 0.1
+        self.noise_suppressor = None
+        if config.noise_reduction and config.spectral_noise_reduction:
+            self.noise_suppressor = SpectralNoiseSuppressor(
+                sample_rate=config.sample_rate,
+                frame_size=config.noise_frame_size,
+                max_latency_ms=config.max_noise_latency_ms
+            )
         
         # Estado para la normalización automática
         self.target_level = 0.1  # Nivel objetivo de amplitud (0.0 a 1.0)
+        self.agc = AutomaticGainControl(config.sample_rate, target_level=self.target_level)
         
         logger.info("Procesador de audio inicializado")
     
@@ -48,8 +265,14 @@ class AudioProcessor:
         high = 3400 / nyquist
         self.b, self.a = signal.butter(5, [low, high], 'bandpass')
         
-        # Filtro de reducción de ruido (filtro de mediana)
-        self.median_window = 5
+        # Misma respuesta en secciones de segundo orden para el modo streaming.
+        # El estado (zi) se conserva entre chunks para evitar artefactos en
+        # los bordes y hacer una sola pasada causal por chunk.
+        self.sos = signal.butter(5, [low, high], 'bandpass', output='sos').astype(np.float32)
+        self._sos_zi = None
+        
+        # Estadísticas de coste del filtrado (para comparar ambos modos)
+        self.filter_stats = {'chunks': 0, 'total_time': 0.0, 'last_time': 0.0}
         
         logger.debug("Filtros de audio inicializados")
     
@@ -57,17 +280,29 @@ class AudioProcessor:
         """
         Procesa un chunk de audio con todas las mejoras.
         
+        En modo streaming (``config.streaming_filter``) el audio se trata como
+        float32 en [-1.0, 1.0] de principio a fin y se devuelve en ese formato;
+        en el modo clásico se devuelve int16.
+        
         Args:
-            audio_data: Array de numpy con los datos de audio (mono, 16-bit)
+            audio_data: Array de numpy con los datos de audio (mono, 16-bit o float32)
             
         Returns:
             Array de numpy con el audio procesado o None si se considera silencio
         """
+        if self.resampler is not None:
+            audio_data = self.resampler.process(audio_data)
+        
         if audio_data.size == 0:
             return None
         
+        if self.config.streaming_filter:
+            return self._process_chunk_streaming(audio_data)
+        
         # Aplicar filtro paso banda
+        inicio = time.perf_counter()
         filtered = signal.filtfilt(self.b, self.a, audio_data.astype(np.float32))
+        self._update_filter_stats(time.perf_counter() - inicio)
         
         # Reducción de ruido (si está habilitada)
         if self.config.noise_reduction:
@@ -86,8 +321,167 @@ class AudioProcessor:
         
         return None
     
+    def _process_chunk_streaming(self, audio_data: np.ndarray) -> Optional[np.ndarray]:
+        """Procesa un chunk con el filtro causal con estado, todo en float32."""
+        audio = self._to_float32(audio_data)
+        
+        inicio = time.perf_counter()
+        filtered = self._filter_stream(audio)
+        self._update_filter_stats(time.perf_counter() - inicio)
+        
+        if self.config.noise_reduction:
+            filtered = self._reduce_noise(filtered)
+        
+        if self.config.auto_gain:
+            filtered = self._auto_gain(filtered)
+        
+        # La única conversión a int16 es la que exige webrtcvad
+        audio_int16 = (filtered * 32767).astype(np.int16)
+        if self._is_speech(audio_int16):
+            return filtered
+        
+        return None
+    
+    @staticmethod
+    def _to_float32(audio_data: np.ndarray) -> np.ndarray:
+        """Convierte el audio a float32 en [-1.0, 1.0] sin copiar si ya lo está."""
+        if audio_data.dtype == np.float32:
+            return audio_data
+        if audio_data.dtype == np.int16:
+            return audio_data.astype(np.float32) * np.float32(1.0 / 32768.0)
+        return audio_data.astype(np.float32)
+    
+    def _filter_stream(self, audio: np.ndarray) -> np.ndarray:
+        """Aplica el filtro paso banda conservando el estado entre chunks."""
+        if self._sos_zi is None:
+            # Arrancar en régimen estacionario respecto a la primera muestra
+            self._sos_zi = (signal.sosfilt_zi(self.sos) * audio[0]).astype(np.float32)
+        filtered, self._sos_zi = signal.sosfilt(self.sos, audio, zi=self._sos_zi)
+        return filtered.astype(np.float32, copy=False)
+    
+    def reset_stream(self):
+        """Reinicia el estado en streaming: filtro, VAD, AGC, remuestreo y supresor (p. ej. al cambiar de dispositivo)."""
+        self._sos_zi = None
+        self.frame_vad.reset()
+        self.agc.reset()
+        if self.resampler is not None:
+            self.resampler.reset()
+        if self.noise_suppressor is not None:
+            self.noise_suppressor.reset()
+    
+    def _update_filter_stats(self, elapsed: float):
+        """Acumula el tiempo empleado en filtrar un chunk."""
+        self.filter_stats['chunks'] += 1
+        self.filter_stats['total_time'] += elapsed
+        self.filter_stats['last_time'] = elapsed
+    
+    @property
+    def average_filter_time(self) -> float:
+        """Tiempo medio de filtrado por chunk en segundos."""
+        chunks = self.filter_stats['chunks']
+        return self.filter_stats['total_time'] / chunks if chunks else 0.0
+    
+    def process_batch(self, audio_data: np.ndarray,
+                      frame_size: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Procesa muchos frames de una vez con operaciones vectorizadas.
+        
+        Pensado para ponerse al día tras un atasco o para procesar grabaciones:
+        el filtrado, la reducción de ruido y la ganancia se aplican sobre la
+        matriz completa y solo el VAD se consulta frame a frame.
+        
+        Args:
+            audio_data: Matriz 2-D (frames x muestras) o buffer 1-D largo
+            frame_size: Muestras por frame si se pasa un buffer 1-D
+                (por defecto ``config.chunk_size``; el último frame se rellena con ceros)
+            
+        Returns:
+            Tupla (audio procesado con forma frames x muestras, indicadores de voz por frame)
+        """
+        if self.resampler is not None:
+            # Los frames se rehacen a la frecuencia de salida tras remuestrear
+            audio_data = self.resampler.process(audio_data.reshape(-1))
+        
+        frames = self._to_frames(audio_data, frame_size or self.config.chunk_size)
+        if frames.size == 0:
+            dtype = np.float32 if self.config.streaming_filter else np.int16
+            return np.empty(frames.shape, dtype=dtype), np.zeros(frames.shape[0], dtype=bool)
+        
+        inicio = time.perf_counter()
+        if self.config.streaming_filter:
+            # Una sola pasada causal sobre la señal continua, conservando el estado
+            audio = self._to_float32(frames)
+            filtered = self._filter_stream(audio.reshape(-1)).reshape(audio.shape)
+        else:
+            filtered = signal.filtfilt(self.b, self.a, frames.astype(np.float32), axis=1)
+        self._update_filter_stats(time.perf_counter() - inicio)
+        
+        if self.config.noise_reduction:
+            filtered = self._reduce_noise_batch(filtered)
+        
+        if self.config.auto_gain:
+            filtered = self._auto_gain_batch(filtered)
+        
+        audio_int16 = (filtered * 32767).astype(np.int16)
+        
+        # El umbral de silencio se evalúa para todos los frames a la vez y
+        # solo los frames con energía suficiente llegan a webrtcvad
+        loud = np.max(np.abs(audio_int16), axis=1) >= self.config.silence_threshold
+        speech = np.zeros(frames.shape[0], dtype=bool)
+        self.vad_events = []
+        for i in range(frames.shape[0]):
+            events = self.frame_vad.process(audio_int16[i], silent=not loud[i])
+            self.vad_events.extend(events)
+            speech[i] = self.frame_vad.in_speech or bool(events)
+        
+        if self.config.streaming_filter:
+            return filtered.astype(np.float32, copy=False), speech
+        return audio_int16, speech
+    
+    @staticmethod
+    def _to_frames(audio_data: np.ndarray, frame_size: int) -> np.ndarray:
+        """Devuelve el audio como matriz (frames x muestras)."""
+        if audio_data.ndim == 2:
+            return audio_data
+        if audio_data.ndim != 1:
+            raise ValueError(f"Se esperaba un array 1-D o 2-D, recibido {audio_data.ndim}-D")
+        
+        resto = audio_data.size % frame_size
+        if resto:
+            audio_data = np.concatenate(
+                [audio_data, np.zeros(frame_size - resto, dtype=audio_data.dtype)])
+        return audio_data.reshape(-1, frame_size)
+    
+    def _reduce_noise_batch(self, frames: np.ndarray) -> np.ndarray:
+        """Versión vectorizada de ``_reduce_noise`` sobre una matriz de frames."""
+        if self.noise_suppressor is not None:
+            # El supresor espectral ya trabaja sobre la señal continua
+            cleaned = self.noise_suppressor.process(frames.reshape(-1), is_speech=self._speech_hint())
+            return np.clip(cleaned.reshape(frames.shape), -1.0, 1.0)
+        
+        factor = self.noise_reduction_factor
+        magnitude = np.abs(frames)
+        previous = self.noise_profile
+        if previous is None or previous.shape != magnitude[0].shape:
+            previous = magnitude[0]
+        
+        # La media móvil exponencial frame a frame es un filtro IIR de orden 1
+        profiles, _ = signal.lfilter(
+            [factor], [1.0, -(1.0 - factor)], magnitude, axis=0,
+            zi=((1.0 - factor) * previous)[np.newaxis, :])
+        self.noise_profile = profiles[-1]
+        
+        return np.clip(frames - factor * profiles, -1.0, 1.0)
+    
+    def _auto_gain_batch(self, frames: np.ndarray) -> np.ndarray:
+        """Versión por lotes de ``_auto_gain``: el AGC recorre la señal continua."""
+        return self.agc.process(frames.reshape(-1)).reshape(frames.shape)
+    
     def _reduce_noise(self, audio: np.ndarray) -> np.ndarray:
         """Aplica reducción de ruido al audio."""
+        if self.noise_suppressor is not None:
+            return np.clip(self.noise_suppressor.process(audio, is_speech=self._speech_hint()), -1.0, 1.0)
+        
         # Actualizar perfil de ruido (primeros segundos se consideran ruido)
         if self.noise_profile is None:
             self.noise_profile = np.abs(audio)
@@ -99,29 +493,33 @@ class AudioProcessor:
         noise_reduced = audio - self.noise_reduction_factor * self.noise_profile
         return np.clip(noise_reduced, -1.0, 1.0)
     
+    def _speech_hint(self) -> Optional[bool]:
+        """
+        Decisión del VAD para el supresor de ruido.
+
+        El supresor va antes del VAD, así que se usa el estado tras el chunk
+        anterior: mientras hay voz (o un arranque en curso) el perfil de
+        ruido no se actualiza; fuera de ella el supresor sigue descartando
+        por energía los frames fuertes, que cubren el arranque que el VAD
+        aún no ha votado.
+        """
+        return True if self.frame_vad.active else None
+
     def _auto_gain(self, audio: np.ndarray) -> np.ndarray:
-        """Ajusta automáticamente la ganancia del audio."""
-        max_amplitude = np.max(np.abs(audio))
-        if max_amplitude > 0:
-            gain = self.target_level / max_amplitude
-            return np.clip(audio * gain, -1.0, 1.0)
-        return audio
+        """Ajusta la ganancia con el AGC (envolvente con ataque/liberación y limitador)."""
+        return self.agc.process(audio)
     
     def _is_speech(self, audio_chunk: np.ndarray) -> bool:
-        """Determina si el chunk de audio contiene voz."""
-        try:
-            # Verificar nivel de volumen
-            if np.max(np.abs(audio_chunk)) < self.config.silence_threshold:
-                return False
-                
-            # Usar VAD para detección de voz
-            return self.vad.is_speech(
-                audio_chunk.tobytes(),
-                sample_rate=self.config.sample_rate
-            )
-        except Exception as e:
-            logger.warning(f"Error en detección de voz: {e}")
-            return False
+        """
+        Determina si el chunk de audio contiene voz.
+        
+        El chunk se reencuadra en frames válidos para webrtcvad y la decisión
+        se suaviza con onset/hangover; los eventos quedan en ``vad_events``.
+        """
+        # Los chunks por debajo del umbral cuentan como silencio sin llamar a webrtcvad
+        silent = np.max(np.abs(audio_chunk)) < self.config.silence_threshold
+        self.vad_events = self.frame_vad.process(audio_chunk, silent=silent)
+        return self.frame_vad.in_speech or bool(self.vad_events)
     
     @staticmethod
     def list_audio_devices() -> List[dict]:
@@ -0,0 +1,192 @@
+"""
+Fuentes de audio intercambiables para el bucle de reconocimiento.
+Todas entregan bloques int16 mono mediante un callback con la misma firma
+que PortAudio: ``callback(indata, frames, time_info, status)``. Las fuentes
+que no marcan el ritmo (``realtime`` falso) permiten que el callback se
+bloquee hasta que el consumidor deje sitio, en lugar de descartar audio.
+"""
+import abc
+import logging
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AudioCallback = Callable[[object, int, object, object], None]
+
+
+class AudioSource(abc.ABC):
+    """Clase base para las fuentes de audio."""
+
+    # Un dispositivo real entrega el audio a su ritmo y su callback no debe
+    # bloquearse; las fuentes sin ritmo propio admiten contrapresión
+    realtime = True
+
+    def __init__(self, samplerate: int = 16000, blocksize: int = 8000, channels: int = 1):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.name = self.__class__.__name__
+        self._callback: Optional[AudioCallback] = None
+
+    def open(self, callback: AudioCallback) -> "AudioSource":
+        """Asocia el callback; se usa como ``with fuente.open(callback) as stream``."""
+        self._callback = callback
+        return self
+
+    @abc.abstractmethod
+    def start(self):
+        """Empieza a entregar bloques al callback."""
+
+    @abc.abstractmethod
+    def stop(self):
+        """Deja de entregar bloques."""
+
+    @property
+    def active(self) -> bool:
+        """Indica si la fuente está entregando audio."""
+        return False
+
+    def __enter__(self):
+        if self._callback is None:
+            raise RuntimeError("Llama a open(callback) antes de iniciar la fuente")
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class SoundDeviceSource(AudioSource):
+    """Captura desde un dispositivo real con ``sounddevice.RawInputStream``."""
+
+    def __init__(self, device: Optional[int] = None, samplerate: int = 16000,
+                 blocksize: int = 8000, channels: int = 1):
+        super().__init__(samplerate, blocksize, channels)
+        self.device = device
+        self._stream = None
+
+    def start(self):
+        # Import diferido: las fuentes de reproducción no necesitan PortAudio
+        import sounddevice as sd
+
+        self._stream = sd.RawInputStream(
+            samplerate=self.samplerate,
+            blocksize=self.blocksize,
+            device=self.device,
+            dtype='int16',
+            channels=self.channels,
+            callback=self._callback
+        )
+        self._stream.start()
+        self.name = sd.query_devices(self._stream.device)['name']
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    @property
+    def active(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+
+class ReplaySource(AudioSource):
+    """Reproduce audio grabado de forma determinista, a tiempo real o sin esperas."""
+
+    def __init__(self, audio: np.ndarray, samplerate: int = 16000, blocksize: int = 8000,
+                 realtime: bool = True, loop: bool = False):
+        """
+        Inicializa la fuente.
+
+        Args:
+            audio: Audio int16 mono
+            samplerate: Frecuencia de muestreo del audio
+            blocksize: Muestras por bloque entregado
+            realtime: Si es True respeta el ritmo real; si no, entrega tan rápido
+                como el callback lo acepte (el callback puede bloquearse para frenarla)
+            loop: Repetir el audio indefinidamente
+        """
+        super().__init__(samplerate, blocksize, channels=1)
+        self.audio = np.ascontiguousarray(audio, dtype=np.int16)
+        self.realtime = realtime
+        self.loop = loop
+        self.blocks_sent = 0
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_wav(cls, path: Union[str, Path], **kwargs) -> "ReplaySource":
+        """Crea la fuente a partir de un WAV PCM de 16 bits (se mezcla a mono)."""
+        with wave.open(str(path), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"{path}: solo se admite PCM de 16 bits")
+            channels = wav.getnchannels()
+            samplerate = wav.getframerate()
+            audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+        if channels > 1:
+            audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        source = cls(audio, samplerate=samplerate, **kwargs)
+        source.name = Path(path).name
+        return source
+
+    def start(self):
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and not self.finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que se haya entregado todo el audio."""
+        return self.finished.wait(timeout)
+
+    def _run(self):
+        """Entrega los bloques al callback respetando el ritmo si ``realtime``."""
+        data = memoryview(self.audio).cast('B')
+        block_bytes = self.blocksize * self.audio.itemsize
+        start = time.perf_counter()
+        sent = 0
+
+        try:
+            while not self._stop.is_set():
+                for offset in range(0, len(data), block_bytes):
+                    if self._stop.is_set():
+                        return
+                    block = data[offset:offset + block_bytes]
+                    frames = len(block) // self.audio.itemsize
+
+                    if self.realtime:
+                        # Programar cada bloque según su posición para no acumular deriva
+                        delay = start + (sent + frames) / self.samplerate - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+
+                    self._callback(block, frames, None, None)
+                    sent += frames
+                    self.blocks_sent += 1
+
+                if not self.loop:
+                    return
+        except Exception as e:
+            logger.error(f"Error en la fuente de reproducción: {e}")
+        finally:
+            self.finished.set()
@@ -0,0 +1,288 @@
+"""
+Ejecución concurrente de comandos.
+Los comandos se ejecutan en un grupo acotado de hilos para que uno lento
+(una petición HTTP, una búsqueda de archivos) no bloquee a los demás. Cada
+comando recibe un testigo de cancelación que se activa al agotar su tiempo
+máximo o cuando el usuario dice "para"/"cancela"; los manejadores lo
+consultan con ``current_token()`` para abandonar el trabajo. Los comandos
+que no pueden solaparse (los que escriben con el teclado) van a un carril
+de un solo hilo y se ejecutan uno tras otro en orden de llegada. Se mide la
+profundidad de la cola y el tiempo de espera hasta empezar.
+"""
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class CommandCancelled(Exception):
+    """El comando se canceló (por tiempo agotado o a petición del usuario)."""
+
+
+class CancelToken:
+    """Testigo de cancelación cooperativa de un comando."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelado"):
+        """Pide al comando que se detenga."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self):
+        """Lanza ``CommandCancelled`` si se pidió la cancelación."""
+        if self._event.is_set():
+            raise CommandCancelled(self.reason)
+
+    def wait(self, timeout: float) -> bool:
+        """Espera como ``time.sleep`` pero despierta al cancelar; devuelve True si se canceló."""
+        return self._event.wait(timeout)
+
+
+# Testigo de los hilos que no ejecutan un comando: nunca se cancela
+_NEVER = CancelToken()
+
+# Valor por omisión de ``submit(timeout=...)``: usar ``default_timeout``
+_DEFAULT = object()
+
+
+def current_token() -> CancelToken:
+    """Testigo del comando que se ejecuta en el hilo actual."""
+    return getattr(_local, "token", _NEVER)
+
+
+@dataclass
+class CommandTask:
+    """Comando enviado al ejecutor."""
+    id: int
+    name: str
+    timeout: Optional[float]
+    token: CancelToken = field(default_factory=CancelToken)
+    future: Future = field(default_factory=Future)
+    submitted: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Segundos en cola antes de empezar."""
+        return None if self.started is None else self.started - self.submitted
+
+
+class CommandExecutor:
+    """Grupo acotado de hilos con tiempo máximo y cancelación por comando."""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16,
+                 default_timeout: Optional[float] = 15.0,
+                 on_timeout: Optional[Callable[[CommandTask], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa el ejecutor.
+
+        Args:
+            max_workers: Comandos ejecutándose a la vez
+            max_pending: Comandos admitidos a la vez (en ejecución o en cola);
+                los que superan el límite se rechazan. Un comando cancelado o sin
+                tiempo sigue ocupando su plaza hasta que su manejador termine,
+                porque un hilo no se puede detener desde fuera (``stats()['zombies']``)
+            default_timeout: Segundos antes de cancelar un comando (None = sin límite)
+            on_timeout: Función llamada cuando un comando agota su tiempo
+            clock: Reloj monotónico (inyectable en pruebas)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.on_timeout = on_timeout
+        self.clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="comando")
+        self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix="comando-serie")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._active: Dict[int, CommandTask] = {}
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Comandos admitidos que aún no han empezado."""
+        with self._lock:
+            return sum(1 for task in self._active.values() if task.started is None)
+
+    @property
+    def running(self) -> int:
+        """Comandos ejecutándose ahora."""
+        with self._lock:
+            return sum(1 for task in self._active.values()
+                       if task.started is not None and task.finished is None)
+
+    def submit(self, fn: Callable[..., Any], *args, name: str = "",
+               timeout: Any = _DEFAULT, serial: bool = False,
+               **kwargs) -> Optional[CommandTask]:
+        """
+        Envía un comando al grupo de hilos.
+
+        Args:
+            fn: Manejador; puede consultar ``current_token()`` para cancelarse
+            name: Nombre para registros y métricas
+            timeout: Segundos máximos de ejecución (por defecto ``default_timeout``; None = sin límite)
+            serial: Ejecutar en el carril de un solo hilo, después de los comandos
+                en serie anteriores (p. ej. los que escriben con el teclado)
+
+        Returns:
+            La tarea, o None si se rechazó por haber demasiados comandos pendientes
+        """
+        task = CommandTask(next(self._ids), name or getattr(fn, "__name__", "comando"),
+                           self.default_timeout if timeout is _DEFAULT else timeout)
+        with self._lock:
+            if len(self._active) >= self.max_pending:
+                self.rejected += 1
+                logger.warning(f"Comando '{task.name}' rechazado: {len(self._active)} pendientes")
+                return None
+            task.submitted = self.clock()
+            self._active[task.id] = task
+            self.submitted += 1
+            depth = sum(1 for t in self._active.values() if t.started is None)
+            self.max_depth = max(self.max_depth, depth)
+        (self._serial if serial else self._pool).submit(self._run, task, fn, args, kwargs)
+        return task
+
+    def _run(self, task: CommandTask, fn: Callable[..., Any], args, kwargs):
+        """Ejecuta la tarea en un hilo del grupo con su testigo y su temporizador."""
+        with self._lock:
+            task.started = self.clock()
+            wait = task.started - task.submitted
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        if task.token.cancelled:
+            self._finish(task, exception=CommandCancelled(task.token.reason))
+            return
+
+        timer = None
+        if task.timeout is not None:
+            timer = threading.Timer(task.timeout, self._expire, args=(task,))
+            timer.daemon = True
+            timer.start()
+
+        _local.token = task.token
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(task, exception=e)
+        else:
+            if task.token.cancelled:
+                self._finish(task, exception=CommandCancelled(task.token.reason))
+            else:
+                self._finish(task, result=result)
+        finally:
+            _local.token = _NEVER
+            if timer is not None:
+                timer.cancel()
+
+    def _expire(self, task: CommandTask):
+        """Cancela una tarea que ha agotado su tiempo."""
+        if task.finished is not None:
+            return
+        with self._lock:
+            self.timed_out += 1
+        task.token.cancel("tiempo agotado")
+        logger.warning(f"Comando '{task.name}' cancelado tras {task.timeout:.1f} s")
+        if self.on_timeout is not None:
+            try:
+                self.on_timeout(task)
+            except Exception as e:
+                logger.error(f"Error en on_timeout: {e}")
+
+    def _finish(self, task: CommandTask, result: Any = None, exception: Optional[BaseException] = None):
+        with self._lock:
+            task.finished = self.clock()
+            self._active.pop(task.id, None)
+            if isinstance(exception, CommandCancelled):
+                self.cancelled += 1
+            elif exception is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if exception is None:
+            task.future.set_result(result)
+        else:
+            if not isinstance(exception, CommandCancelled):
+                logger.error(f"Error ejecutando comando '{task.name}': {exception}")
+            task.future.set_exception(exception)
+
+    def cancel_all(self, reason: str = "cancelado por el usuario") -> int:
+        """
+        Cancela los comandos en ejecución y en cola.
+
+        Returns:
+            Número de comandos avisados
+        """
+        with self._lock:
+            tasks = list(self._active.values())
+        for task in tasks:
+            task.token.cancel(reason)
+        if tasks:
+            logger.info(f"{len(tasks)} comandos cancelados: {reason}")
+        return len(tasks)
+
+    def active(self) -> List[CommandTask]:
+        """Comandos admitidos que no han terminado."""
+        with self._lock:
+            return list(self._active.values())
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Contadores, profundidad de la cola y tiempos de espera hasta empezar.
+
+        ``running`` incluye los ``zombies``: comandos ya cancelados (por tiempo
+        o por el usuario) cuyo manejador aún no ha vuelto y que siguen
+        ocupando un hilo y una plaza de ``max_pending``.
+        """
+        with self._lock:
+            started = self.completed + self.failed + self.cancelled + sum(
+                1 for t in self._active.values() if t.started is not None)
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'timed_out': self.timed_out,
+                'rejected': self.rejected,
+                'queue_depth': sum(1 for t in self._active.values() if t.started is None),
+                'running': sum(1 for t in self._active.values()
+                               if t.started is not None and t.finished is None),
+                'zombies': sum(1 for t in self._active.values()
+                               if t.started is not None and t.token.cancelled),
+                'max_queue_depth': self.max_depth,
+                'avg_wait': self.total_wait / started if started else 0.0,
+                'max_wait': self.max_wait,
+            }
+
+    def shutdown(self, wait: bool = True, cancel: bool = True):
+        """Detiene el grupo de hilos, cancelando antes los comandos pendientes."""
+        if cancel:
+            self.cancel_all("apagado")
+        self._pool.shutdown(wait=wait)
+        self._serial.shutdown(wait=wait)
@@ -0,0 +1,206 @@
+"""
+Cola de comandos con prioridades.
+Sustituye a la ``queue.Queue`` FIFO entre el reconocimiento y el hilo de
+comandos. Cada texto se clasifica al encolarlo como control (exactamente
+"salir", "para", "cancela"...), interactivo (lo normal) o de fondo (trabajo
+lento que puede esperar); los de control se atienden antes que todo lo encolado y
+además avisan al instante a los oyentes de interrupción, que cortan la voz
+o el comando en curso sin esperar a que el hilo de comandos los saque. Se
+mide por clase la espera en la cola y, si el consumidor la notifica, la
+latencia total hasta terminar el comando.
+"""
+import heapq
+import itertools
+import logging
+import queue
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from core.text_normalizer import fold, trie_pattern
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> str:
+    """Palabras del texto sin acentos, mayúsculas ni signos, separadas por un espacio."""
+    return " ".join(_WORD.findall(fold(text)))
+
+
+class Priority(IntEnum):
+    """Clase de un comando; un valor menor se atiende antes."""
+    CONTROL = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+class PriorityClassifier:
+    """Clasifica textos en control, interactivos o de fondo."""
+
+    def __init__(self, control: Iterable[str] = (), background: Iterable[str] = ()):
+        """
+        Inicializa el clasificador.
+
+        Args:
+            control: Frases de control; el texto debe ser exactamente una de ellas
+                (sin contar mayúsculas, acentos ni signos), porque un comando de
+                control corta la voz y descarta lo pendiente: "para qué sirve
+                esto" o "para la música" no lo son
+            background: Palabras clave de trabajo de fondo, en cualquier posición
+        """
+        self._control = frozenset(_words(p) for p in control) - {""}
+        background = {" ".join(fold(p).split()) for p in background if p.strip()}
+        self._background = (re.compile(r"(?<!\w)(?:" + trie_pattern(background) + r")(?!\w)")
+                            if background else None)
+
+    def __call__(self, item: Any) -> Priority:
+        # El centinela de parada (None) también es de control
+        if item is None:
+            return Priority.CONTROL
+        if _words(str(item)) in self._control:
+            return Priority.CONTROL
+        text = " ".join(fold(str(item)).split())
+        if self._background is not None and self._background.search(text):
+            return Priority.BACKGROUND
+        return Priority.INTERACTIVE
+
+
+@dataclass
+class QueuedCommand:
+    """Elemento sacado de la cola."""
+    item: Any
+    priority: Priority
+    enqueued: float  # Reloj monotónico al encolar
+    wait: float  # Segundos en la cola
+
+
+class _Latency:
+    """Muestras recientes de una latencia y sus agregados."""
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> Dict[str, float]:
+        recent = sorted(self.samples)
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0,
+            'p95': recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0,
+            'max': self.max,
+        }
+
+
+class CommandQueue(queue.Queue):
+    """``queue.Queue`` que entrega antes los comandos de mayor prioridad."""
+
+    def __init__(self, classify: Optional[Callable[[Any], Priority]] = None,
+                 maxsize: int = 0, window: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa la cola.
+
+        Args:
+            classify: Función que da la prioridad de cada elemento (por defecto, interactiva)
+            maxsize: Tamaño máximo, como en ``queue.Queue``
+            window: Muestras recientes por clase para el percentil 95
+            clock: Reloj monotónico (inyectable en pruebas)
+        """
+        self.classify = classify or (lambda item: Priority.CONTROL if item is None
+                                     else Priority.INTERACTIVE)
+        self.clock = clock
+        self._listeners: List[Callable[[Any], None]] = []
+        self._stats_lock = threading.Lock()
+        self._waits = {p: _Latency(window) for p in Priority}
+        self._totals = {p: _Latency(window) for p in Priority}
+        self._preemptions = 0
+        super().__init__(maxsize)
+
+    # Almacenamiento de queue.Queue: un montículo (prioridad, orden de llegada)
+    def _init(self, maxsize):
+        self.queue = []
+        self._seq = itertools.count()
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, entry):
+        heapq.heappush(self.queue, (entry.priority, next(self._seq), entry))
+
+    def _get(self):
+        return heapq.heappop(self.queue)[2]
+
+    def add_preempt_listener(self, listener: Callable[[Any], None]):
+        """
+        Registra una función a la que se llama al encolar un comando de control.
+
+        Se llama en el hilo que encola, antes de que el comando salga de la
+        cola, para cortar la voz o el trabajo en curso.
+        """
+        self._listeners.append(listener)
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        priority = Priority(self.classify(item))
+        if priority is Priority.CONTROL and item is not None:
+            with self._stats_lock:
+                self._preemptions += 1
+            for listener in self._listeners:
+                try:
+                    listener(item)
+                except Exception as e:
+                    logger.error(f"Error al interrumpir por '{item}': {e}")
+        super().put(QueuedCommand(item, priority, self.clock(), 0.0), block, timeout)
+
+    def get_entry(self, block: bool = True, timeout: Optional[float] = None) -> QueuedCommand:
+        """Como ``get`` pero devuelve también la prioridad y la espera en la cola."""
+        entry = super().get(block, timeout)
+        entry.wait = self.clock() - entry.enqueued
+        with self._stats_lock:
+            self._waits[entry.priority].add(entry.wait)
+        return entry
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        return self.get_entry(block, timeout).item
+
+    def observe(self, entry: QueuedCommand, finished: Optional[float] = None):
+        """Registra la latencia total (desde que se encoló hasta terminar) de un comando."""
+        finished = self.clock() if finished is None else finished
+        with self._stats_lock:
+            self._totals[entry.priority].add(finished - entry.enqueued)
+
+    def depths(self) -> Dict[str, int]:
+        """Elementos encolados por clase."""
+        with self.mutex:
+            counts = {p.name.lower(): 0 for p in Priority}
+            for priority, _, _ in self.queue:
+                counts[Priority(priority).name.lower()] += 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        """Profundidad, espera en la cola y latencia total por clase."""
+        depths = self.depths()
+        with self._stats_lock:
+            result: Dict[str, Any] = {
+                p.name.lower(): {
+                    'queued': depths[p.name.lower()],
+                    'wait': self._waits[p].summary(),
+                    'total': self._totals[p].summary(),
+                }
+                for p in Priority
+            }
+            result['preemptions'] = self._preemptions
+        return result
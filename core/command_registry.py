@@ -0,0 +1,507 @@
+"""
+Registro único de comandos.
+Reúne los comandos de ``comandos.json``, los de los plugins y los manejadores
+integrados de cada interfaz, y los compila en una estructura de despacho:
+un diccionario de frases exactas, una expresión con forma de trie para los
+prefijos con argumento ("busca ...", "escribe ..."), otra para las palabras
+clave que pueden aparecer en cualquier parte de la frase, y los índices
+fonético y de n-gramas para las variantes. Como último recurso, un
+clasificador TF-IDF entrenado con las frases de ejemplo de los comandos
+(las de los plugins) resuelve las peticiones en lenguaje natural. Cada
+texto se resuelve con una consulta por etapa en lugar de recorrer cadenas
+de ``if ... in texto``, y los textos ya resueltos se recuerdan en una
+memoria LRU que se vacía al cambiar los comandos: las frases que se repiten
+a diario cuestan una consulta de diccionario.
+"""
+import bisect
+import json
+import logging
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from core.intent_classifier import IntentClassifier
+from core.intent_index import IntentIndex
+from core.phonetic import PhoneticIndex
+from core.text_normalizer import fold, trie_pattern
+
+logger = logging.getLogger(__name__)
+
+
+def _key(text: str) -> str:
+    return " ".join(fold(text).split())
+
+
+def load_actions(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Lee un archivo de acciones (objeto JSON frase -> acción, como ``comandos.json``).
+
+    Raises:
+        OSError: Si no se puede leer el archivo
+        ValueError: Si no es JSON válido o no es un objeto de cadenas
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        actions = json.load(f)
+    if not isinstance(actions, dict):
+        raise ValueError(f"{path} debe contener un objeto frase -> acción")
+    for phrase, action in actions.items():
+        if not isinstance(action, str) or not _key(phrase):
+            raise ValueError(f"Entrada no válida en {path}: {phrase!r}")
+    return actions
+
+
+@dataclass
+class Command:
+    """Comando registrado y sus disparadores."""
+    name: str  # Identificador único
+    handler: Callable[..., Any]  # Acción a ejecutar
+    phrases: List[str] = field(default_factory=list)  # Frases completas (sin argumentos)
+    prefixes: List[str] = field(default_factory=list)  # Inicio de frase; el resto es el argumento
+    keywords: List[str] = field(default_factory=list)  # Palabras clave en cualquier posición
+    source: str = "builtin"  # Origen: "builtin", "json", "plugin:<nombre>"...
+    description: str = ""
+    examples: List[str] = field(default_factory=list)
+    # Comandos irreversibles (apagar): solo se resuelven literalmente, por sus
+    # frases y ejemplos, nunca por pronunciación, parecido ni intención
+    destructive: bool = False
+
+
+@dataclass
+class CommandMatch:
+    """Resultado de resolver un texto."""
+    command: Command
+    trigger: str  # Frase, prefijo o palabra clave que ha coincidido
+    method: str  # "exact", "prefix", "keyword", "phonetic", "fuzzy" o "intent"
+    score: float = 1.0  # Similitud entre 0.0 y 1.0
+    args: Tuple = ()  # Argumentos para el manejador
+
+    def execute(self) -> Any:
+        """Ejecuta el manejador del comando con los argumentos extraídos."""
+        return self.command.handler(*self.args)
+
+
+class _Dispatch:
+    """Estructuras de despacho compiladas a partir de una lista de comandos (no se modifican)."""
+
+    def __init__(self, commands: Iterable[Command]):
+        self.exact: Dict[str, Tuple[Command, str]] = {}
+        self.prefixes: Dict[str, Tuple[Command, str]] = {}
+        # Las palabras clave conservan el orden de registro como prioridad
+        self.keywords: Dict[str, Tuple[Command, str, int]] = {}
+
+        for command in commands:
+            phrases = command.phrases + (command.examples if command.destructive else [])
+            for phrase in phrases:
+                self._add(self.exact, _key(phrase), (command, phrase))
+            for prefix in command.prefixes:
+                self._add(self.prefixes, _key(prefix), (command, prefix))
+            for keyword in command.keywords:
+                self._add(self.keywords, _key(keyword), (command, keyword, len(self.keywords)))
+
+        # Todos los disparadores ordenados, para saber si uno alarga a un texto
+        self.triggers = sorted(set(self.exact) | set(self.prefixes) | set(self.keywords))
+        self.prefix_pattern = (re.compile(r"(?:" + trie_pattern(self.prefixes) + r")(?!\w)")
+                               if self.prefixes else None)
+        self.keyword_pattern = (re.compile(r"(?<!\w)(?:" + trie_pattern(self.keywords) + r")(?!\w)")
+                                if self.keywords else None)
+        # Un comando destructivo solo se resuelve con sus frases literales
+        approximate = [key for key, (command, _) in self.exact.items() if not command.destructive]
+        self.phonetic = PhoneticIndex({key: key for key in approximate})
+        self.fuzzy = IntentIndex(approximate)
+
+    @staticmethod
+    def _add(table: Dict, key: str, value: Tuple):
+        """Añade un disparador; si ya existe se conserva el del comando registrado antes."""
+        if not key:
+            return
+        existing = table.setdefault(key, value)
+        if existing[0] is not value[0]:
+            logger.debug(f"'{key}' ya pertenece a '{existing[0].name}'; se ignora para '{value[0].name}'")
+
+
+class CommandRegistry:
+    """Registro de comandos con despacho precompilado, común a todas las interfaces."""
+
+    def __init__(self, fuzzy_threshold: float = 0.75, phonetic_score: float = 0.9,
+                 intent_threshold: float = 0.55, intent_margin: float = 0.15,
+                 memo_size: int = 256):
+        """
+        Inicializa el registro.
+
+        Args:
+            fuzzy_threshold: Similitud mínima para aceptar una frase aproximada
+            phonetic_score: Similitud asignada a las coincidencias fonéticas
+            intent_threshold: Similitud mínima con los ejemplos para aceptar una intención
+            intent_margin: Ventaja mínima de la intención elegida sobre la segunda
+            memo_size: Textos resueltos que se recuerdan (0 = ninguno)
+        """
+        self.fuzzy_threshold = fuzzy_threshold
+        self.phonetic_score = phonetic_score
+        self._commands: Dict[str, Command] = {}
+        # Se actualiza de forma incremental, fuera de las instantáneas de despacho
+        self._classifier = IntentClassifier(min_score=intent_threshold, margin=intent_margin)
+        self._dispatch: Optional[_Dispatch] = None
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self.version = 0  # Aumenta con cada cambio de los comandos
+        # Texto normalizado -> coincidencia (o None), válida para la versión _memo_version
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Optional[CommandMatch]]" = OrderedDict()
+        self._memo_version = 0
+        self._memo_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._commands
+
+    def get(self, name: str) -> Optional[Command]:
+        """Comando registrado con ese nombre, si existe."""
+        return self._commands.get(name)
+
+    def commands(self, source: Optional[str] = None) -> List[Command]:
+        """Comandos registrados, en orden de registro, opcionalmente de un origen."""
+        return [c for c in self._commands.values() if source is None or c.source == source]
+
+    def register(self, name: str, handler: Callable[..., Any],
+                 phrases: Optional[Iterable[str]] = None,
+                 prefixes: Optional[Iterable[str]] = None,
+                 keywords: Optional[Iterable[str]] = None,
+                 source: str = "builtin", description: str = "",
+                 examples: Optional[Iterable[str]] = None,
+                 destructive: bool = False) -> Command:
+        """
+        Registra (o sustituye) un comando.
+
+        El manejador recibe ``()`` si coincide una frase, el resto del texto
+        si coincide un prefijo y el texto completo si coincide una palabra
+        clave. Si no se indica ningún disparador se usa el nombre como frase.
+        Ante disparadores repetidos gana el comando registrado antes, y entre
+        palabras clave presentes en el mismo texto, también. Un comando
+        ``destructive`` solo se resuelve literalmente: sus ejemplos cuentan
+        como frases y no se usan las etapas fonética, aproximada ni de intención.
+
+        Returns:
+            El comando registrado
+        """
+        phrases = list(phrases or ())
+        prefixes = list(prefixes or ())
+        keywords = list(keywords or ())
+        if not (phrases or prefixes or keywords):
+            phrases = [name]
+        command = Command(name, handler, phrases, prefixes, keywords, source,
+                          description, list(examples or ()), destructive)
+        with self._lock:
+            self._commands[name] = command
+            self._learn(command)
+            self._changed()
+        return command
+
+    def register_actions(self, actions: Dict[str, Any], handler: Callable[[str, Any], Any],
+                         source: str = "json") -> int:
+        """
+        Registra un comando por frase de un diccionario frase -> acción.
+
+        Las frases que ya son el nombre de un comando de otro origen se
+        ignoran: gana el registrado antes.
+
+        Args:
+            actions: Por ejemplo, el contenido de ``comandos.json``
+            handler: Función ``handler(frase, acción)`` que ejecuta la acción
+            source: Origen de los comandos
+
+        Returns:
+            Número de comandos registrados
+        """
+        with self._lock:
+            commands = self._action_commands(actions, handler, source, self._commands.items())
+            for command in commands:
+                self._commands[command.name] = command
+                self._learn(command)
+            self._changed()
+        return len(commands)
+
+    @staticmethod
+    def _action_commands(actions: Dict[str, Any], handler: Callable[[str, Any], Any], source: str,
+                         current: Iterable[Tuple[str, Command]]) -> List[Command]:
+        """Comandos de un diccionario de acciones, sin los nombres que ya son de otro origen."""
+        taken = {name for name, command in current if command.source != source}
+        commands = []
+        for phrase, action in actions.items():
+            if phrase in taken:
+                logger.debug(f"'{phrase}' ya es un comando registrado; se ignora la acción de {source}")
+                continue
+            commands.append(Command(phrase, partial(handler, phrase, action), [phrase],
+                                    source=source, description=str(action)))
+        return commands
+
+    def register_plugins(self, manager, plugin: Optional[str] = None) -> int:
+        """
+        Registra los comandos de un ``PluginManager`` (o solo los de un plugin).
+
+        Cada comando se ejecuta mediante ``manager.handle_command`` con el
+        origen ``plugin:<nombre>``; las frases de ejemplo se guardan en el comando.
+
+        Returns:
+            Número de comandos registrados
+        """
+        count = 0
+        with self._lock:
+            for cmd, info in manager.commands.items():
+                if plugin is not None and info.get('plugin') != plugin:
+                    continue
+                command = Command(
+                    cmd, partial(manager.handle_command, cmd), [cmd],
+                    source=f"plugin:{info.get('plugin')}",
+                    description=info.get('description', ''),
+                    examples=list(info.get('examples', [])),
+                    destructive=bool(info.get('destructive', False)))
+                self._commands[cmd] = command
+                self._learn(command)
+                count += 1
+            self._changed()
+        return count
+
+    def track_plugins(self, manager) -> int:
+        """
+        Registra los comandos de un ``PluginManager`` y sigue sus cambios.
+
+        Al cargar o descargar un plugin se añaden o quitan solo sus
+        comandos (y sus ejemplos del clasificador), y se compila el
+        despacho en el hilo que hizo el cambio.
+
+        Returns:
+            Número de comandos registrados ahora
+        """
+        count = self.register_plugins(manager)
+        manager.add_listener(partial(self._on_plugin_event, manager))
+        return count
+
+    def _on_plugin_event(self, manager, event: str, plugin: str):
+        if event == "load":
+            self.register_plugins(manager, plugin=plugin)
+        elif event == "unload":
+            self.unregister_source(f"plugin:{plugin}")
+        self.compile()
+
+    def replace_actions(self, actions: Dict[str, Any], handler: Callable[[str, Any], Any],
+                        source: str = "json") -> int:
+        """
+        Sustituye todos los comandos de un origen por los de ``actions``.
+
+        El nuevo despacho se compila en el hilo que llama y se publica de
+        una vez junto con los comandos: las resoluciones concurrentes siguen
+        usando el anterior hasta el intercambio y nunca esperan a la
+        compilación. Los comandos nuevos ocupan la posición de prioridad
+        que tenían los del mismo origen.
+
+        Returns:
+            Número de comandos del origen tras el cambio
+        """
+        while True:
+            with self._lock:
+                version = self.version
+                current = list(self._commands.items())
+            new = self._action_commands(actions, handler, source, current)
+            commands: Dict[str, Command] = {}
+            inserted = False
+            for name, command in current:
+                if command.source == source:
+                    if not inserted:
+                        commands.update((c.name, c) for c in new)
+                        inserted = True
+                    continue
+                commands[name] = command
+            if not inserted:
+                commands.update((c.name, c) for c in new)
+            dispatch = _Dispatch(commands.values())
+            with self._lock:
+                # Si otro hilo cambió el registro mientras se compilaba, se repite
+                if self.version == version:
+                    for name, command in current:
+                        if command.source == source:
+                            self._classifier.remove(name)
+                    for command in new:
+                        self._learn(command)
+                    self._commands = commands
+                    self._dispatch = dispatch
+                    self.version += 1
+                    return len(new)
+
+    def unregister(self, name: str) -> bool:
+        """Quita un comando; devuelve False si no estaba registrado."""
+        with self._lock:
+            if self._commands.pop(name, None) is None:
+                return False
+            self._classifier.remove(name)
+            self._changed()
+        return True
+
+    def unregister_source(self, source: str) -> int:
+        """Quita todos los comandos de un origen y devuelve cuántos había."""
+        with self._lock:
+            names = [name for name, c in self._commands.items() if c.source == source]
+            for name in names:
+                del self._commands[name]
+                self._classifier.remove(name)
+            if names:
+                self._changed()
+        return len(names)
+
+    def _learn(self, command: Command):
+        """Actualiza los ejemplos del comando en el clasificador (con el cerrojo adquirido)."""
+        if command.examples and not command.destructive:
+            self._classifier.add(command.name, command.examples)
+        else:
+            self._classifier.remove(command.name)
+
+    def _changed(self):
+        """Invalida el despacho compilado (se llama con el cerrojo adquirido)."""
+        self._dispatch = None
+        self.version += 1
+
+    def compile(self) -> None:
+        """Compila el despacho (y el clasificador) ahora en lugar de en la primera resolución."""
+        self._compiled()
+        self._classifier.refresh()
+
+    def _compiled(self) -> _Dispatch:
+        dispatch = self._dispatch
+        if dispatch is None:
+            with self._lock:
+                if self._dispatch is None:
+                    self._dispatch = _Dispatch(self._commands.values())
+                dispatch = self._dispatch
+        return dispatch
+
+    def resolve(self, text: str) -> Optional[CommandMatch]:
+        """
+        Resuelve un texto a un comando.
+
+        Etapas, de más a menos segura: frase exacta, prefijo al inicio,
+        palabra clave en cualquier posición, frase con la misma clave
+        fonética, frase aproximada por n-gramas y, por último, intención
+        más parecida a los ejemplos de los comandos.
+
+        El resultado de cada texto normalizado (también si no hay comando)
+        se recuerda hasta que cambien los comandos; la coincidencia devuelta
+        se comparte entre llamadas y no debe modificarse.
+
+        Returns:
+            La coincidencia, o None si el texto no corresponde a ningún comando
+        """
+        key = " ".join(text.lower().split())
+        version = self.version
+        with self._memo_lock:
+            if self._memo_version != version:
+                # Los comandos han cambiado: lo recordado ya no vale
+                self._memo.clear()
+                self._memo_version = version
+            found = key in self._memo
+            if found:
+                self._memo.move_to_end(key)
+                match = self._memo[key]
+                self._stats["memo_hit"] += 1
+        if not found:
+            match = self._resolve(self._compiled(), key)
+            self._stats["memo_miss"] += 1
+            if self.memo_size > 0:
+                with self._memo_lock:
+                    # No se guarda si el registro cambió mientras se resolvía
+                    if self._memo_version == version == self.version:
+                        self._memo[key] = match
+                        if len(self._memo) > self.memo_size:
+                            self._memo.popitem(last=False)
+        self._stats[match.method if match is not None else "miss"] += 1
+        return match
+
+    def _resolve(self, dispatch: _Dispatch, text: str) -> Optional[CommandMatch]:
+        text = " ".join(text.lower().split())
+        if not text:
+            return None
+        # Mismo texto sin acentos y con la misma longitud: las posiciones coinciden
+        folded = fold(text)
+
+        found = dispatch.exact.get(folded)
+        if found is not None:
+            return CommandMatch(found[0], found[1], "exact")
+
+        if dispatch.prefix_pattern is not None:
+            m = dispatch.prefix_pattern.match(folded)
+            if m is not None:
+                command, prefix = dispatch.prefixes[m.group()]
+                return CommandMatch(command, prefix, "prefix", args=(text[m.end():].strip(),))
+
+        if dispatch.keyword_pattern is not None:
+            best = None
+            for m in dispatch.keyword_pattern.finditer(folded):
+                entry = dispatch.keywords[m.group()]
+                if best is None or entry[2] < best[2]:
+                    best = entry
+            if best is not None:
+                return CommandMatch(best[0], best[1], "keyword", args=(text,))
+
+        key = dispatch.phonetic.lookup(folded)
+        if key is not None:
+            command, phrase = dispatch.exact[key]
+            return CommandMatch(command, phrase, "phonetic", self.phonetic_score)
+
+        fuzzy = dispatch.fuzzy.best(folded, min_score=self.fuzzy_threshold)
+        if fuzzy is not None:
+            command, phrase = dispatch.exact[fuzzy.phrase]
+            return CommandMatch(command, phrase, "fuzzy", fuzzy.score)
+
+        intent = self._classifier.best(folded)
+        if intent is not None:
+            command = self._commands.get(intent.intent)
+            if command is not None:
+                return CommandMatch(command, intent.example, "intent", intent.score)
+        return None
+
+    def extensible(self, text: str) -> bool:
+        """
+        Indica si alguna frase, prefijo o palabra clave registrada empieza por
+        el texto y sigue con más palabras (``"para"`` si está ``"para ya"``).
+
+        Un texto extensible puede ser solo el principio de otra orden, así que
+        no conviene actuar sobre él hasta tener la frase completa.
+        """
+        key = _key(text)
+        if not key:
+            return False
+        triggers = self._compiled().triggers
+        i = bisect.bisect_left(triggers, key + " ")
+        return i < len(triggers) and triggers[i].startswith(key + " ")
+
+    def dispatch(self, text: str) -> Tuple[Optional[CommandMatch], Any]:
+        """
+        Resuelve el texto y ejecuta el comando.
+
+        Returns:
+            Tupla (coincidencia, resultado del manejador); (None, None) si no hay comando
+        """
+        match = self.resolve(text)
+        if match is None:
+            return None, None
+        return match, match.execute()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Resoluciones por etapa (``exact``, ``prefix``... y ``miss``), tamaño del
+        registro y aciertos de la memoria de textos resueltos.
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        stats['commands'] = len(self._commands)
+        stats['examples'] = self._classifier.n_examples
+        stats['version'] = self.version
+        stats['memo_hit'] = stats.get('memo_hit', 0)
+        stats['memo_miss'] = stats.get('memo_miss', 0)
+        lookups = stats['memo_hit'] + stats['memo_miss']
+        stats['memo_size'] = len(self._memo)
+        stats['memo_hit_rate'] = stats['memo_hit'] / lookups if lookups else 0.0
+        return stats
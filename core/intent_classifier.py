@@ -0,0 +1,253 @@
+"""
+Clasificador de intenciones a partir de frases de ejemplo.
+Cada ejemplo es una fila de una matriz TF-IDF de n-gramas de caracteres
+guardada por columnas (para cada n-grama, las filas que lo contienen y su
+frecuencia). Clasificar un texto es un único producto matriz dispersa por
+vector: se reúnen las columnas de los n-gramas del texto y se acumulan por
+fila con ``np.bincount``. Añadir o quitar una intención solo toca las
+columnas de sus ejemplos; el IDF y las normas de las filas se recalculan de
+forma vectorizada en la primera consulta posterior.
+"""
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.text_normalizer import fold
+
+logger = logging.getLogger(__name__)
+
+# Signos de puntuación ("¿", "?", ","): no distinguen intenciones y sus
+# n-gramas inflarían la similitud entre ejemplos y consultas que los comparten
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+@dataclass
+class IntentScore:
+    """Intención candidata para un texto."""
+    intent: Any  # Intención (p. ej. nombre del comando)
+    score: float  # Similitud coseno TF-IDF entre 0.0 y 1.0
+    example: str  # Ejemplo más parecido
+
+
+class IntentClassifier:
+    """Clasificador TF-IDF de n-gramas de caracteres con actualización incremental."""
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 4), min_score: float = 0.5,
+                 margin: float = 0.0):
+        """
+        Inicializa el clasificador vacío.
+
+        Args:
+            ngram_range: Longitudes mínima y máxima de los n-gramas
+            min_score: Similitud mínima por defecto para aceptar una intención
+            margin: Ventaja mínima por defecto de la mejor intención sobre la
+                segunda; si dos intenciones se parecen igual al texto no se elige
+        """
+        self.ngram_range = ngram_range
+        self.min_score = min_score
+        self.margin = margin
+        self._vocab: Dict[str, int] = {}
+        self._df: List[int] = []
+        # Columnas de la matriz: filas que contienen el n-grama y su frecuencia
+        self._col_rows: List[np.ndarray] = []
+        self._col_tf: List[np.ndarray] = []
+        # Filas (un ejemplo cada una); las libres se reutilizan
+        self._rows: List[Optional[Tuple[Any, str, np.ndarray, np.ndarray]]] = []
+        self._free: List[int] = []
+        self._intent_rows: Dict[Any, List[int]] = {}
+        self._idf = np.zeros(0)
+        self._norms = np.zeros(0)
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._intent_rows)
+
+    def __contains__(self, intent: Any) -> bool:
+        return intent in self._intent_rows
+
+    @property
+    def n_examples(self) -> int:
+        """Número de ejemplos indexados."""
+        return len(self._rows) - len(self._free)
+
+    def _ngrams(self, text: str) -> Counter:
+        padded = " " + " ".join(_PUNCTUATION.sub(" ", fold(text)).split()) + " "
+        grams: Counter = Counter()
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            grams.update(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return grams
+
+    def add(self, intent: Any, examples: Iterable[str]) -> int:
+        """
+        Añade los ejemplos de una intención (sustituye los que tuviera).
+
+        Returns:
+            Número de ejemplos añadidos
+        """
+        examples = [e for e in examples if e and e.strip()]
+        with self._lock:
+            self._remove(intent)
+            rows = []
+            for example in examples:
+                grams = self._ngrams(example)
+                cols = np.empty(len(grams), dtype=np.int32)
+                tf = np.empty(len(grams), dtype=np.float32)
+                for i, (gram, count) in enumerate(grams.items()):
+                    col = self._vocab.get(gram)
+                    if col is None:
+                        col = self._vocab[gram] = len(self._df)
+                        self._df.append(0)
+                        self._col_rows.append(np.zeros(0, dtype=np.int32))
+                        self._col_tf.append(np.zeros(0, dtype=np.float32))
+                    cols[i] = col
+                    # Frecuencia sublineal: las repeticiones pesan menos
+                    tf[i] = 1.0 + math.log(count)
+
+                row = self._free.pop() if self._free else len(self._rows)
+                if row == len(self._rows):
+                    self._rows.append(None)
+                self._rows[row] = (intent, example, cols, tf)
+                for col, weight in zip(cols.tolist(), tf.tolist()):
+                    self._df[col] += 1
+                    self._col_rows[col] = np.append(self._col_rows[col], np.int32(row))
+                    self._col_tf[col] = np.append(self._col_tf[col], np.float32(weight))
+                rows.append(row)
+            if rows:
+                self._intent_rows[intent] = rows
+                self._dirty = True
+        return len(rows)
+
+    def remove(self, intent: Any) -> bool:
+        """Quita una intención y sus ejemplos; devuelve False si no estaba."""
+        with self._lock:
+            return self._remove(intent)
+
+    def _remove(self, intent: Any) -> bool:
+        rows = self._intent_rows.pop(intent, None)
+        if rows is None:
+            return False
+        for row in rows:
+            _, _, cols, _ = self._rows[row]
+            for col in cols.tolist():
+                keep = self._col_rows[col] != row
+                self._col_rows[col] = self._col_rows[col][keep]
+                self._col_tf[col] = self._col_tf[col][keep]
+                self._df[col] -= 1
+            self._rows[row] = None
+            self._free.append(row)
+        self._dirty = True
+        return True
+
+    def refresh(self):
+        """
+        Recalcula ya el IDF y las normas pendientes.
+
+        Útil tras cargar plugins, para que el coste lo pague el hilo que
+        carga y no la siguiente consulta.
+        """
+        with self._lock:
+            if self._dirty:
+                self._refresh()
+
+    def _refresh(self):
+        """Recalcula el IDF y las normas de las filas tras añadir o quitar ejemplos."""
+        n_docs = self.n_examples
+        df = np.asarray(self._df, dtype=np.float64)
+        # IDF suavizado, como en scikit-learn
+        self._idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        live = [(row, entry[2], entry[3]) for row, entry in enumerate(self._rows) if entry is not None]
+        norms = np.full(len(self._rows), np.inf, dtype=np.float32)
+        if live:
+            row_ids = np.repeat(np.array([row for row, _, _ in live]),
+                                [len(cols) for _, cols, _ in live])
+            cols = np.concatenate([cols for _, cols, _ in live])
+            tf = np.concatenate([tf for _, _, tf in live])
+            squares = np.bincount(row_ids, (tf * self._idf[cols]) ** 2, minlength=len(self._rows))
+            norms = np.sqrt(squares).astype(np.float32)
+            norms[norms == 0] = np.inf
+        self._norms = norms
+        self._dirty = False
+
+    def _scores(self, text: str) -> Optional[np.ndarray]:
+        """Similitud del texto con cada fila (un producto matriz dispersa por vector)."""
+        if self._dirty:
+            self._refresh()
+        cols, weights = [], []
+        unknown = 0.0
+        for gram, count in self._ngrams(text).items():
+            col = self._vocab.get(gram)
+            if col is not None and self._df[col]:
+                cols.append(col)
+                weights.append(1.0 + math.log(count))
+            else:
+                unknown += (1.0 + math.log(count)) ** 2
+        if not cols:
+            return None
+        cols = np.asarray(cols)
+        query = np.asarray(weights, dtype=np.float32) * self._idf[cols]
+        # Los n-gramas que no aparecen en ningún ejemplo cuentan en la norma
+        # de la consulta con el IDF máximo: las palabras de más bajan la similitud
+        max_idf = math.log(1.0 + self.n_examples) + 1.0
+        norm = math.sqrt(float(np.dot(query, query)) + unknown * max_idf ** 2)
+
+        lengths = [len(self._col_rows[c]) for c in cols.tolist()]
+        rows = np.concatenate([self._col_rows[c] for c in cols.tolist()])
+        values = np.concatenate([self._col_tf[c] for c in cols.tolist()])
+        values = values * np.repeat(query * self._idf[cols], lengths)
+        return np.bincount(rows, values, minlength=len(self._rows)) / (self._norms * norm)
+
+    def classify(self, text: str, k: int = 3, min_score: Optional[float] = None) -> List[IntentScore]:
+        """
+        Devuelve las ``k`` intenciones más parecidas al texto.
+
+        Args:
+            text: Texto a clasificar
+            k: Número máximo de intenciones
+            min_score: Similitud mínima (por defecto la del clasificador)
+
+        Returns:
+            Intenciones ordenadas de mayor a menor similitud
+        """
+        min_score = self.min_score if min_score is None else min_score
+        with self._lock:
+            scores = self._scores(text)
+            if scores is None:
+                return []
+            candidates = np.flatnonzero(scores >= min_score)
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            results: List[IntentScore] = []
+            seen = set()
+            for row in candidates.tolist():
+                intent, example, _, _ = self._rows[row]
+                if intent in seen:
+                    continue
+                seen.add(intent)
+                results.append(IntentScore(intent, float(scores[row]), example))
+                if len(results) == k:
+                    break
+        return results
+
+    def best(self, text: str, min_score: Optional[float] = None,
+             margin: Optional[float] = None) -> Optional[IntentScore]:
+        """
+        La intención más parecida, si alcanza la similitud mínima y supera a la
+        segunda por al menos ``margin``; si no, None.
+        """
+        min_score = self.min_score if min_score is None else min_score
+        margin = self.margin if margin is None else margin
+        # La segunda intención cuenta aunque no llegue a la similitud mínima
+        results = self.classify(text, k=2, min_score=0.0 if margin > 0 else min_score)
+        if not results or results[0].score < min_score:
+            return None
+        if len(results) > 1 and results[0].score - results[1].score < margin:
+            return None
+        return results[0]
@@ -0,0 +1,175 @@
+"""
+Índice de intenciones para resolver comandos de forma aproximada.
+Cada frase se indexa por sus trigramas de caracteres en un índice invertido;
+una consulta solo cuenta trigramas compartidos con las frases que tienen
+alguno en común, descarta las que no pueden alcanzar la similitud mínima
+(cada edición destruye como mucho n n-gramas) y reordena con la distancia
+de edición acotada solo las de mayor solapamiento. El índice se actualiza
+de forma incremental.
+"""
+import heapq
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from core.text_normalizer import fold
+from core.wake_word import bit_parallel_distance, pattern_masks
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntentMatch:
+    """Intención candidata para un texto."""
+    phrase: str  # Frase registrada
+    intent: Any  # Valor asociado (acción, nombre de intención...)
+    score: float  # Similitud entre 0.0 y 1.0 (1 - distancia / longitud)
+
+
+class IntentIndex:
+    """Índice invertido de n-gramas de caracteres con reordenación por distancia de edición."""
+
+    def __init__(self, phrases: Union[Iterable[str], Dict[str, Any], None] = None,
+                 n: int = 3, min_score: float = 0.6, max_candidates: int = 32):
+        """
+        Inicializa el índice.
+
+        Args:
+            phrases: Frases a indexar, o diccionario frase -> intención
+            n: Longitud de los n-gramas
+            min_score: Similitud mínima por defecto en las búsquedas
+            max_candidates: Frases con más n-gramas en común que se reordenan
+                con la distancia de edición en cada búsqueda
+        """
+        self.n = n
+        self.min_score = min_score
+        self.max_candidates = max_candidates
+        self._phrases: List[Optional[str]] = []
+        self._keys: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._intents: List[Any] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+        if isinstance(phrases, dict):
+            for phrase, intent in phrases.items():
+                self.add(phrase, intent)
+        elif phrases is not None:
+            for phrase in phrases:
+                self.add(phrase)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, phrase: str) -> bool:
+        return self._key(phrase) in self._ids
+
+    def _key(self, text: str) -> str:
+        return " ".join(fold(text).split())
+
+    def _ngrams(self, key: str) -> Set[str]:
+        padded = f" {key} "
+        if len(padded) <= self.n:
+            return {padded}
+        return {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}
+
+    def add(self, phrase: str, intent: Any = None):
+        """
+        Añade o actualiza una frase.
+
+        Args:
+            phrase: Frase del comando
+            intent: Valor devuelto en las coincidencias (por defecto, la propia frase)
+        """
+        key = self._key(phrase)
+        if not key:
+            return
+        intent = phrase if intent is None else intent
+        existing = self._ids.get(key)
+        if existing is not None:
+            self._phrases[existing] = phrase
+            self._intents[existing] = intent
+            return
+
+        index = len(self._phrases)
+        grams = self._ngrams(key)
+        self._phrases.append(phrase)
+        self._keys.append(key)
+        self._grams.append(grams)
+        self._intents.append(intent)
+        self._ids[key] = index
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(index)
+
+    def remove(self, phrase: str) -> bool:
+        """Quita una frase del índice; devuelve False si no estaba."""
+        index = self._ids.pop(self._key(phrase), None)
+        if index is None:
+            return False
+        for gram in self._grams[index]:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(index)
+                if not postings:
+                    del self._postings[gram]
+        self._phrases[index] = None
+        self._intents[index] = None
+        self._grams[index] = set()
+        return True
+
+    def search(self, text: str, k: int = 5, min_score: Optional[float] = None) -> List[IntentMatch]:
+        """
+        Devuelve las ``k`` intenciones más parecidas al texto.
+
+        Args:
+            text: Texto a resolver
+            k: Número máximo de resultados
+            min_score: Similitud mínima (por defecto la del índice)
+
+        Returns:
+            Coincidencias ordenadas de mayor a menor similitud
+        """
+        min_score = self.min_score if min_score is None else min_score
+        key = self._key(text)
+        if not key:
+            return []
+
+        exact = self._ids.get(key)
+        if exact is not None and k == 1:
+            return [IntentMatch(self._phrases[exact], self._intents[exact], 1.0)]
+
+        grams = self._ngrams(key)
+        shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+
+        # Cota superior de la similitud a partir de los n-gramas compartidos:
+        # la distancia es al menos (máx. n-gramas distintos - compartidos) / n
+        candidates = []
+        for index, common in shared.most_common(2 * self.max_candidates):
+            target_grams = len(self._grams[index])
+            longest = max(len(key), len(self._keys[index]))
+            lower_bound = max(-(-(max(len(grams), target_grams) - common) // self.n),
+                              abs(len(key) - len(self._keys[index])))
+            if 1.0 - lower_bound / longest >= min_score:
+                # Coeficiente de Dice: proporción de n-gramas compartidos
+                candidates.append((2.0 * common / (len(grams) + target_grams), index))
+        candidates = heapq.nlargest(self.max_candidates, candidates)
+
+        masks = pattern_masks(key)
+        results: List[IntentMatch] = []
+        for _, index in candidates:
+            target = self._keys[index]
+            longest = max(len(key), len(target))
+            max_distance = int((1.0 - min_score) * longest + 1e-9)
+            distance = bit_parallel_distance(masks, len(key), target, max_distance)
+            if distance is not None:
+                results.append(IntentMatch(self._phrases[index], self._intents[index],
+                                           1.0 - distance / longest))
+        results.sort(key=lambda match: match.score, reverse=True)
+        return results[:k]
+
+    def best(self, text: str, min_score: Optional[float] = None) -> Optional[IntentMatch]:
+        """La intención más parecida, o None si ninguna alcanza la similitud mínima."""
+        results = self.search(text, k=1, min_score=min_score)
+        return results[0] if results else None
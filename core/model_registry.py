@@ -0,0 +1,164 @@
+"""
+Registro compartido de modelos Vosk.
+Cada modelo se carga una sola vez por proceso y se comparte entre todos
+los reconocedores; la carga y el calentamiento pueden hacerse en segundo
+plano mientras aparece la interfaz.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import vosk
+
+try:
+    import psutil
+    PSUTIL_DISPONIBLE = True
+except ImportError:
+    PSUTIL_DISPONIBLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelInfo:
+    """Métricas de carga de un modelo."""
+    path: str
+    load_time: float = 0.0  # Segundos en cargar el modelo
+    warmup_time: float = 0.0  # Segundos en el primer reconocimiento sintético
+    resident_bytes: Optional[int] = None  # Aumento de memoria residente al cargarlo
+
+
+class ModelRegistry:
+    """Carga perezosa y compartida de modelos Vosk."""
+
+    def __init__(self, sample_rate: int = 16000, warmup_seconds: float = 0.5):
+        """
+        Inicializa el registro.
+
+        Args:
+            sample_rate: Frecuencia usada para el reconocedor de calentamiento
+            warmup_seconds: Duración del audio sintético de calentamiento
+        """
+        self.sample_rate = sample_rate
+        self.warmup_seconds = warmup_seconds
+        self._models: Dict[str, Future] = {}
+        self._info: Dict[str, ModelInfo] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return str(Path(path).resolve())
+
+    def get(self, path: Union[str, Path], warm_up: bool = False) -> vosk.Model:
+        """
+        Devuelve el modelo, cargándolo si es la primera vez.
+
+        Si otra llamada ya lo está cargando (p. ej. ``preload``) se espera a que termine.
+
+        Raises:
+            Exception: La misma que lanzó la carga del modelo
+        """
+        future, owner = self._reserve(path)
+        if owner:
+            self._load(path, future, warm_up)
+        return future.result()
+
+    def preload(self, path: Union[str, Path], warm_up: bool = True) -> Future:
+        """
+        Carga (y calienta) el modelo en un hilo en segundo plano.
+
+        Returns:
+            Future que se resuelve con el modelo cargado
+        """
+        future, owner = self._reserve(path)
+        if owner:
+            threading.Thread(target=self._load, args=(path, future, warm_up),
+                             name="vosk-preload", daemon=True).start()
+        return future
+
+    def info(self, path: Union[str, Path]) -> Optional[ModelInfo]:
+        """Métricas de carga del modelo, si ya se cargó."""
+        return self._info.get(self._key(path))
+
+    def unload(self, path: Union[str, Path]):
+        """Olvida el modelo; se liberará cuando ningún reconocedor lo use."""
+        with self._lock:
+            self._models.pop(self._key(path), None)
+            self._info.pop(self._key(path), None)
+
+    def _reserve(self, path: Union[str, Path]):
+        """Devuelve el Future del modelo y si esta llamada debe cargarlo."""
+        key = self._key(path)
+        with self._lock:
+            future = self._models.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._models[key] = future
+            return future, True
+
+    def _load(self, path: Union[str, Path], future: Future, warm_up: bool):
+        """Carga el modelo, mide tiempo y memoria y resuelve el Future."""
+        key = self._key(path)
+        info = ModelInfo(path=str(path))
+        rss_before = self._rss()
+
+        try:
+            inicio = time.perf_counter()
+            model = vosk.Model(str(path))
+            info.load_time = time.perf_counter() - inicio
+
+            if warm_up:
+                info.warmup_time = self._warm_up(model)
+        except Exception as e:
+            logger.error(f"Error al cargar el modelo {path}: {e}")
+            with self._lock:
+                self._models.pop(key, None)
+            future.set_exception(e)
+            return
+
+        rss_after = self._rss()
+        if rss_before is not None and rss_after is not None:
+            info.resident_bytes = rss_after - rss_before
+        self._info[key] = info
+
+        memoria = f", {info.resident_bytes / 2**20:.0f} MB" if info.resident_bytes is not None else ""
+        logger.info(f"Modelo {path} cargado en {info.load_time:.2f} s "
+                    f"(calentamiento {info.warmup_time:.2f} s{memoria})")
+        future.set_result(model)
+
+    def _warm_up(self, model: vosk.Model) -> float:
+        """Pasa un audio sintético por un reconocedor para calentar el modelo."""
+        inicio = time.perf_counter()
+        rng = np.random.default_rng(0)
+        ruido = (rng.standard_normal(int(self.sample_rate * self.warmup_seconds)) * 100).astype(np.int16)
+        rec = vosk.KaldiRecognizer(model, self.sample_rate)
+        rec.AcceptWaveform(ruido.tobytes())
+        rec.FinalResult()
+        return time.perf_counter() - inicio
+
+    @staticmethod
+    def _rss() -> Optional[int]:
+        """Memoria residente del proceso en bytes, si psutil está disponible."""
+        if not PSUTIL_DISPONIBLE:
+            return None
+        return psutil.Process().memory_info().rss
+
+
+# Registro compartido por todo el proceso
+model_registry = ModelRegistry()
+
+
+def get_model(path: Union[str, Path], warm_up: bool = False) -> vosk.Model:
+    """Atajo a ``model_registry.get``."""
+    return model_registry.get(path, warm_up)
+
+
+def preload_model(path: Union[str, Path], warm_up: bool = True) -> Future:
+    """Atajo a ``model_registry.preload``."""
+    return model_registry.preload(path, warm_up)
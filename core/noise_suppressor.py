@@ -0,0 +1,147 @@
+"""
+Supresión espectral de ruido por STFT con solapamiento-suma.
+Estima el ruido por bin durante los frames sin voz y aplica una
+máscara de ganancia tipo Wiener de forma vectorizada.
+"""
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpectralNoiseSuppressor:
+    """Supresor de ruido estacionario en streaming con latencia acotada."""
+
+    def __init__(self, sample_rate: int = 16000, frame_size: int = 512,
+                 noise_update: float = 0.05, gain_floor: float = 0.1,
+                 speech_ratio: float = 3.0, init_frames: int = 10,
+                 max_latency_ms: float = 40.0):
+        """
+        Inicializa el supresor.
+
+        Args:
+            sample_rate: Frecuencia de muestreo en Hz
+            frame_size: Tamaño de la FFT (par); el salto es la mitad
+            noise_update: Peso de cada actualización del perfil de ruido (0-1)
+            gain_floor: Ganancia mínima por bin, evita el "ruido musical"
+            speech_ratio: Relación energía/ruido a partir de la cual un frame se considera voz
+            init_frames: Frames iniciales usados siempre para aprender el ruido
+            max_latency_ms: Latencia máxima admitida; el frame debe caber en ella
+        """
+        if frame_size % 2:
+            raise ValueError("frame_size debe ser par")
+
+        latency_ms = 1000.0 * frame_size / sample_rate
+        if latency_ms > max_latency_ms:
+            raise ValueError(
+                f"Un frame de {frame_size} muestras ({latency_ms:.1f} ms) supera "
+                f"la latencia máxima de {max_latency_ms:.1f} ms")
+
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = frame_size // 2
+        self.noise_update = noise_update
+        self.gain_floor = gain_floor
+        self.speech_ratio = speech_ratio
+        self.init_frames = init_frames
+
+        # Ventana raíz de Hann periódica: análisis y síntesis con 50 % de
+        # solapamiento reconstruyen la señal exactamente cuando la ganancia es 1
+        n = np.arange(frame_size)
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * n / frame_size)).astype(np.float32)
+
+        self.reset()
+        logger.debug(f"Supresor espectral inicializado (latencia {latency_ms:.1f} ms)")
+
+    @property
+    def latency(self) -> int:
+        """Retardo introducido, en muestras."""
+        return self.frame_size
+
+    def reset(self):
+        """Olvida el perfil de ruido y el estado de solapamiento."""
+        self.noise_psd: Optional[np.ndarray] = None
+        self._frames_seen = 0
+        self._input = np.zeros(self.frame_size - self.hop_size, dtype=np.float32)
+        self._tail = np.zeros(self.frame_size - self.hop_size, dtype=np.float32)
+        self._output = np.zeros(self.hop_size, dtype=np.float32)
+
+    def process(self, audio: np.ndarray, is_speech: Optional[bool] = None) -> np.ndarray:
+        """
+        Suprime el ruido de un chunk y devuelve el mismo número de muestras.
+
+        La salida va retrasada ``latency`` muestras respecto a la entrada.
+
+        Args:
+            audio: Chunk mono de cualquier longitud
+            is_speech: Indicación externa de voz para todo el chunk; si es None
+                se decide por frame comparando su energía con el perfil de ruido
+
+        Returns:
+            Array float32 con el audio limpio
+        """
+        if audio.size == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        buffer = np.concatenate([self._input, audio.astype(np.float32, copy=False)])
+        n_frames = (buffer.size - self.frame_size) // self.hop_size + 1
+
+        if n_frames > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(
+                buffer, self.frame_size)[::self.hop_size][:n_frames]
+            self._output = np.concatenate([self._output, self._process_frames(frames, is_speech)])
+            self._input = buffer[n_frames * self.hop_size:].copy()
+        else:
+            self._input = buffer
+
+        result, self._output = self._output[:audio.size], self._output[audio.size:]
+        return result
+
+    def _process_frames(self, frames: np.ndarray, is_speech: Optional[bool]) -> np.ndarray:
+        """Filtra una matriz de frames y devuelve las muestras completadas."""
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+
+        self._update_noise(power, is_speech)
+
+        # Ganancia de Wiener con SNR a priori estimada por sustracción espectral
+        snr_post = power / np.maximum(self.noise_psd, 1e-12)
+        snr_prior = np.maximum(snr_post - 1.0, 0.0)
+        gain = np.maximum(snr_prior / (1.0 + snr_prior), self.gain_floor)
+
+        cleaned = np.fft.irfft(spectrum * gain, n=self.frame_size, axis=1).astype(np.float32)
+        cleaned *= self.window
+
+        # Solapamiento-suma de todos los frames a la vez
+        n_frames = frames.shape[0]
+        overlap = np.zeros((n_frames + 1) * self.hop_size, dtype=np.float32)
+        overlap[:self._tail.size] += self._tail
+        halves = cleaned.reshape(n_frames, 2, self.hop_size)
+        overlap[:n_frames * self.hop_size] += halves[:, 0].reshape(-1)
+        overlap[self.hop_size:] += halves[:, 1].reshape(-1)
+
+        self._tail = overlap[n_frames * self.hop_size:].copy()
+        return overlap[:n_frames * self.hop_size]
+
+    def _update_noise(self, power: np.ndarray, is_speech: Optional[bool]):
+        """Actualiza el perfil de ruido con los frames que no contienen voz."""
+        if self.noise_psd is None:
+            self.noise_psd = power[0].copy()
+
+        if is_speech is None:
+            ratio = power.sum(axis=1) / max(self.noise_psd.sum(), 1e-12)
+            noise_mask = ratio < self.speech_ratio
+        else:
+            noise_mask = np.full(power.shape[0], not is_speech)
+
+        # Los primeros frames se usan siempre para aprender el ruido de fondo
+        warmup = max(self.init_frames - self._frames_seen, 0)
+        noise_mask[:warmup] = True
+        self._frames_seen += power.shape[0]
+
+        noise_frames = power[noise_mask]
+        if noise_frames.size:
+            weight = 1.0 - (1.0 - self.noise_update) ** noise_frames.shape[0]
+            self.noise_psd = (1.0 - weight) * self.noise_psd + weight * noise_frames.mean(axis=0)
@@ -0,0 +1,126 @@
+"""
+Decisiones tempranas a partir de los resultados parciales de Vosk.
+En lugar de esperar al final de la frase, se lee ``PartialResult()`` en
+cada bloque y se evalúa el prefijo que ya no cambia entre parciales; si el
+evaluador da una confianza alta, la frase se confirma antes del final.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EarlyCommit:
+    """Decisión tomada sobre un resultado parcial."""
+    text: str  # Prefijo estable evaluado
+    score: float  # Confianza devuelta por el evaluador (0.0 a 1.0)
+
+
+class PartialResultTracker:
+    """Sigue los parciales de una frase y decide cuándo confirmarla antes de tiempo."""
+
+    def __init__(self, scorer: Callable[[str], float], stable_partials: int = 2,
+                 commit_threshold: float = 0.9):
+        """
+        Inicializa el seguimiento.
+
+        Args:
+            scorer: Función que puntúa un texto entre 0.0 y 1.0 (p. ej. palabra
+                de activación o comando conocido)
+            stable_partials: Parciales consecutivos que deben coincidir en un
+                prefijo para considerarlo estable
+            commit_threshold: Puntuación mínima para confirmar antes del final
+        """
+        self.scorer = scorer
+        self.stable_partials = max(1, stable_partials)
+        self.commit_threshold = commit_threshold
+
+        self._recent: List[List[str]] = []
+        self.committed: Optional[EarlyCommit] = None
+
+        self.partials = 0  # Parciales leídos
+        self.early_commits = 0  # Frases confirmadas antes del final
+        self.confirmations = 0  # Confirmaciones tempranas que el final respetó
+        self.corrections = 0  # Confirmaciones tempranas que el final contradijo
+
+    def update(self, partial: str) -> Optional[EarlyCommit]:
+        """
+        Registra un resultado parcial.
+
+        Returns:
+            La decisión temprana si esta actualización la produce (solo una por frase)
+        """
+        words = partial.split()
+        if not words:
+            return None
+        self.partials += 1
+        if self.committed is not None:
+            return None
+
+        self._recent.append(words)
+        del self._recent[:-self.stable_partials]
+        if len(self._recent) < self.stable_partials:
+            return None
+
+        stable = self._stable_prefix()
+        if not stable:
+            return None
+
+        text = " ".join(stable)
+        score = self.scorer(text)
+        if score < self.commit_threshold:
+            return None
+
+        self.committed = EarlyCommit(text, score)
+        self.early_commits += 1
+        return self.committed
+
+    def finalize(self, final: str) -> Optional[bool]:
+        """
+        Cierra la frase con el resultado final y reinicia el seguimiento.
+
+        Returns:
+            None si no hubo decisión temprana; True si el final es
+            exactamente el texto confirmado y False si lo corrige o lo alarga
+            ("para" -> "para mañana"), en cuyo caso el final debe procesarse
+        """
+        committed = self.committed
+        self.reset()
+        if committed is None:
+            return None
+
+        if final.split() == committed.text.split():
+            self.confirmations += 1
+            return True
+
+        self.corrections += 1
+        logger.debug(f"Confirmación temprana corregida: '{committed.text}' -> '{final}'")
+        return False
+
+    def reset(self):
+        """Olvida los parciales de la frase en curso."""
+        self._recent.clear()
+        self.committed = None
+
+    def _stable_prefix(self) -> List[str]:
+        """Prefijo de palabras común a los últimos parciales."""
+        first = self._recent[0]
+        n = len(first)
+        for words in self._recent[1:]:
+            n = min(n, len(words))
+            for i in range(n):
+                if words[i] != first[i]:
+                    n = i
+                    break
+        return first[:n]
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de decisiones tempranas."""
+        return {
+            'partials': self.partials,
+            'early_commits': self.early_commits,
+            'confirmations': self.confirmations,
+            'corrections': self.corrections,
+        }
@@ -0,0 +1,210 @@
+"""
+Claves fonéticas para español.
+Reduce cada palabra a su esqueleto de consonantes tal como suenan (seseo,
+yeísmo, b/v, h muda, gu/qu, c/z/s...) y marca si empieza por vocal, de modo
+que las variantes que produce Vosk ("a jipi" por "agp", "guguel" por
+"google") comparten clave con la forma canónica y se resuelven con una sola
+búsqueda en un diccionario precalculado.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from core.text_normalizer import fold
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+_VOWELS = frozenset("aeiou")
+_FRONT = frozenset("ei")
+
+# Códigos de las consonantes que no dependen del contexto
+_CODES = {
+    "b": "B", "v": "B", "w": "B", "z": "S", "s": "S", "x": "KS", "k": "K", "j": "J",
+    "ñ": "N", "n": "N", "m": "M", "d": "D", "t": "T", "f": "F", "l": "L", "r": "R",
+    "p": "P",
+}
+
+# Nombre de cada letra, para indexar siglas tal como se deletrean ("agp" -> "a ge pe")
+_LETTER_NAMES = {
+    "a": "a", "b": "be", "c": "ce", "d": "de", "e": "e", "f": "efe", "g": "ge",
+    "h": "hache", "i": "i", "j": "jota", "k": "ka", "l": "ele", "m": "eme", "n": "ene",
+    "ñ": "eñe", "o": "o", "p": "pe", "q": "cu", "r": "erre", "s": "ese", "t": "te",
+    "u": "u", "v": "uve", "w": "uve doble", "x": "equis", "y": "ye", "z": "zeta",
+}
+
+
+def _word_key(word: str) -> Tuple[bool, str]:
+    """
+    Clave de una palabra ya en minúsculas y sin acentos.
+
+    Returns:
+        Tupla (empieza por vocal, consonantes codificadas)
+    """
+    codes = []
+    n = len(word)
+    i = 0
+    while i < n:
+        c = word[i]
+        nxt = word[i + 1] if i + 1 < n else ""
+        code = ""
+        if c in _VOWELS or c == "h":
+            pass
+        elif i > 0 and c == word[i - 1] and c not in "c":
+            # Letras dobles ("pp", "rr", "ss"); "ll" se trata antes
+            pass
+        elif c == "c":
+            if nxt == "h":
+                code, i = "X", i + 1
+            else:
+                code = "S" if nxt in _FRONT else "K"
+        elif c == "q":
+            code = "K"
+            if nxt == "u":
+                i += 1
+        elif c == "g":
+            if nxt in _FRONT:
+                code = "J"
+            else:
+                code = "G"
+                # "gue", "gui": la u no suena
+                if nxt == "u" and i + 2 < n and word[i + 2] in _FRONT:
+                    i += 1
+        elif c == "l" and nxt == "l":
+            code, i = "Y", i + 1
+        elif c == "y":
+            # Ante vocal es consonante; al final o ante consonante suena como "i"
+            code = "Y" if nxt in _VOWELS else ""
+        elif c == "p" and nxt == "h":
+            code, i = "F", i + 1
+        else:
+            code = _CODES.get(c, "")
+        if code:
+            codes.append(code)
+        i += 1
+
+    first = word[1:2] if word[:1] == "h" else word[:1]
+    starts_with_vowel = first in _VOWELS or (first == "y" and word[1:2] not in _VOWELS)
+    return starts_with_vowel, "".join(codes)
+
+
+def _join_keys(keys: List[Tuple[bool, str]]) -> str:
+    """Clave de una secuencia de palabras: la vocal inicial solo cuenta al principio."""
+    if not keys:
+        return ""
+    return ("A" if keys[0][0] else "") + "".join(skeleton for _, skeleton in keys)
+
+
+def phonetic_key(text: str) -> str:
+    """
+    Clave fonética de un texto (una o varias palabras).
+
+    Ejemplos: "google" y "guguel" -> "GGL"; "abre youtube" y "abre yu tiub" -> "ABRYTB".
+    """
+    return _join_keys([_word_key(word) for word in _TOKEN.findall(fold(text))])
+
+
+def _spelled(word: str) -> Optional[str]:
+    """Forma deletreada de una sigla (sin vocales tras la primera letra), si lo es."""
+    if not 2 <= len(word) <= 5 or any(c in _VOWELS for c in word[1:]):
+        return None
+    return " ".join(_LETTER_NAMES.get(c, c) for c in word)
+
+
+@dataclass
+class PhoneticMatch:
+    """Frase del índice encontrada en un texto."""
+    canonical: str  # Forma canónica registrada
+    start: int  # Posición de inicio en el texto original
+    end: int  # Posición final (exclusiva) en el texto original
+    key: str  # Clave fonética común
+
+
+class PhoneticIndex:
+    """Índice precalculado de claves fonéticas a formas canónicas."""
+
+    def __init__(self, phrases: Union[Iterable[str], Dict[str, str], None] = None,
+                 min_key_length: int = 3):
+        """
+        Inicializa el índice.
+
+        Args:
+            phrases: Frases canónicas, o diccionario variante -> forma canónica
+            min_key_length: Longitud mínima de clave para indexar o buscar; las
+                claves muy cortas ("illo" -> "AY") coincidirían con demasiadas palabras
+        """
+        self.min_key_length = min_key_length
+        self._keys: Dict[str, str] = {}
+        self.collisions: List[Tuple[str, str, str]] = []  # (clave, existente, descartada)
+        self._max_tokens = 1
+
+        if isinstance(phrases, dict):
+            for variant, canonical in phrases.items():
+                self.add(variant, canonical)
+        elif phrases is not None:
+            for phrase in phrases:
+                self.add(phrase)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, phrase: str, canonical: Optional[str] = None):
+        """
+        Registra una frase (y su forma deletreada si contiene siglas).
+
+        Si la clave ya pertenece a otra forma canónica se conserva la primera
+        y la colisión queda en ``collisions``.
+        """
+        canonical = canonical if canonical is not None else phrase
+        words = _TOKEN.findall(fold(phrase))
+        if not words:
+            return
+
+        variants = [words]
+        spelled = [_spelled(word) or word for word in words]
+        if spelled != words:
+            variants.append(" ".join(spelled).split())
+
+        for variant in variants:
+            key = _join_keys([_word_key(word) for word in variant])
+            if len(key) < self.min_key_length:
+                continue
+            existing = self._keys.setdefault(key, canonical)
+            if existing != canonical:
+                self.collisions.append((key, existing, canonical))
+                logger.debug(f"Clave fonética {key} compartida por '{existing}' y '{canonical}'")
+            # Una palabra más por si Vosk parte alguna en dos ("auto gestión")
+            self._max_tokens = max(self._max_tokens, len(variant) + 1)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Forma canónica del texto completo, si su clave está en el índice."""
+        key = phonetic_key(text)
+        if len(key) < self.min_key_length:
+            return None
+        return self._keys.get(key)
+
+    def find(self, text: str) -> Optional[PhoneticMatch]:
+        """
+        Busca la primera y más larga ventana de palabras del texto cuya clave está indexada.
+
+        Returns:
+            La coincidencia, o None si no hay ninguna
+        """
+        folded = fold(text)
+        spans = [m.span() for m in _TOKEN.finditer(folded)]
+        keys = [_word_key(folded[start:end]) for start, end in spans]
+
+        for i in range(len(spans)):
+            found = None
+            key = "A" if keys[i][0] else ""
+            for j in range(i, min(len(spans), i + self._max_tokens)):
+                key += keys[j][1]
+                if len(key) < self.min_key_length:
+                    continue
+                canonical = self._keys.get(key)
+                if canonical is not None:
+                    found = PhoneticMatch(canonical, spans[i][0], spans[j][1], key)
+            if found is not None:
+                return found
+        return None
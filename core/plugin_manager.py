@@ -41,7 +41,8 @@ class Plugin:
                 'comando': {
                     'description': str,
                     'function': callable,
-                    'examples': List[str]
+                    'examples': List[str],
+                    'destructive': bool  # Opcional: solo se ejecuta por su nombre o ejemplos literales
                 }
             }
         """
@@ -83,8 +84,26 @@ class PluginManager:
         self.plugins_dir = plugins_dir
         self.plugins: Dict[str, Plugin] = {}
         self.commands: Dict[str, dict] = {}
+        self._listeners: List[Callable[[str, str], None]] = []
         logger.info(f"Gestor de plugins inicializado. Directorio: {plugins_dir}")
     
+    def add_listener(self, listener: Callable[[str, str], None]):
+        """
+        Registra una función que se llama tras cargar o descargar un plugin.
+        
+        Args:
+            listener: Función ``listener(evento, nombre_plugin)`` con evento "load" o "unload"
+        """
+        self._listeners.append(listener)
+    
+    def _notify(self, event: str, plugin_name: str):
+        """Avisa a las funciones registradas de un cambio en los plugins."""
+        for listener in self._listeners:
+            try:
+                listener(event, plugin_name)
+            except Exception as e:
+                logger.error(f"Error al notificar '{event}' del plugin '{plugin_name}': {e}")
+    
     def discover_plugins(self) -> List[str]:
         """
         Descubre los plugins disponibles en el directorio de plugins.
@@ -159,12 +178,14 @@ class PluginManager:
                         'plugin': plugin_name,
                         'function': cmd_info.get('function'),
                         'description': cmd_info.get('description', 'Sin descripción'),
-                        'examples': cmd_info.get('examples', [])
+                        'examples': cmd_info.get('examples', []),
+                        'destructive': cmd_info.get('destructive', False)
                     }
             
             # Registrar el plugin
             self.plugins[plugin_name] = plugin_instance
             logger.info(f"Plugin '{plugin_name}' cargado correctamente con {len(plugin_commands)} comandos")
+            self._notify("load", plugin_name)
             return True
             
         except Exception as e:
@@ -200,6 +221,7 @@ class PluginManager:
             del self.plugins[plugin_name]
             
             logger.info(f"Plugin '{plugin_name}' descargado correctamente")
+            self._notify("unload", plugin_name)
             return True
             
         except Exception as e:
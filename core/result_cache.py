@@ -0,0 +1,145 @@
+"""
+Caché con caducidad para resultados de comandos de solo lectura.
+Consultas como las particiones del disco, la lista de procesos o la IP
+local cuestan decenas o cientos de milisegundos y su resultado apenas
+cambia entre dos preguntas seguidas. Cada comando declara cuánto tiempo es
+válido su resultado; pasado ese tiempo se sigue devolviendo el valor
+anterior al instante mientras un hilo en segundo plano lo recalcula, y
+solo se espera al cálculo si no hay valor o es demasiado antiguo.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    created: float  # Reloj monotónico al calcular el valor
+    ttl: float
+    refreshing: bool = False
+
+
+class ResultCache:
+    """Caché por clave con caducidad y recálculo en segundo plano."""
+
+    def __init__(self, max_stale: Optional[float] = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_stale: Segundos tras caducar durante los que aún se devuelve el
+                valor anterior mientras se recalcula (None = siempre)
+            clock: Reloj monotónico (inyectable en pruebas)
+        """
+        self.max_stale = max_stale
+        self.clock = clock
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        # Un cerrojo por clave: dos fallos simultáneos calculan el valor una vez
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, compute: Callable[[], Any], ttl: float) -> Any:
+        """
+        Devuelve el valor de ``key``, calculándolo con ``compute`` si hace falta.
+
+        Las excepciones de ``compute`` no se guardan: se propagan si no hay
+        valor que devolver y se registran si ocurren en segundo plano.
+
+        Args:
+            key: Clave del resultado (p. ej. el nombre del comando)
+            compute: Función sin argumentos que calcula el valor
+            ttl: Segundos durante los que el valor es válido
+
+        Returns:
+            El valor guardado o recién calculado
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.created
+                if age <= entry.ttl:
+                    self.hits += 1
+                    return entry.value
+                if self.max_stale is None or age <= entry.ttl + self.max_stale:
+                    self.stale_hits += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(target=self._refresh, args=(key, compute, ttl),
+                                         name="cache-refresh", daemon=True).start()
+                    return entry.value
+            self.misses += 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Otro hilo puede haberlo calculado mientras esperábamos
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self.clock() - entry.created <= entry.ttl:
+                    return entry.value
+            value = compute()
+            with self._lock:
+                self._entries[key] = _Entry(value, self.clock(), ttl)
+            return value
+
+    def _refresh(self, key: Hashable, compute: Callable[[], Any], ttl: float):
+        """Recalcula un valor caducado en segundo plano."""
+        try:
+            value = compute()
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            logger.warning(f"No se pudo refrescar '{key}': {e}")
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, self.clock(), ttl)
+            self.refreshes += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> int:
+        """
+        Olvida el valor de una clave, o todos si no se indica.
+
+        Returns:
+            Número de valores olvidados
+        """
+        with self._lock:
+            if key is None:
+                count = len(self._entries)
+                self._entries.clear()
+                return count
+            return 1 if self._entries.pop(key, None) is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Aciertos (vigentes y caducados), fallos, recálculos y tasa de aciertos."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+                'entries': len(self._entries),
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
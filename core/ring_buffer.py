@@ -0,0 +1,151 @@
+"""
+Buffer circular preasignado para la captura de audio en tiempo real.
+Pensado para un único productor (callback de PortAudio) y un único
+consumidor (worker de reconocimiento) sin locks: cada índice solo lo
+modifica uno de los dos hilos.
+"""
+import logging
+import time
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """Buffer circular SPSC de muestras con lectura sin copias."""
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """
+        Inicializa el buffer.
+
+        Args:
+            capacity: Número máximo de muestras almacenadas
+            dtype: Tipo de las muestras
+        """
+        if capacity <= 0:
+            raise ValueError("capacity debe ser mayor que 0")
+
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._bytes = memoryview(self._buffer).cast('B')
+        self._itemsize = self._buffer.itemsize
+
+        # Contadores monótonos: solo el productor escribe _write_pos
+        # y solo el consumidor escribe _read_pos
+        self._write_pos = 0
+        self._read_pos = 0
+
+        self.overruns = 0  # Bloques descartados por falta de espacio
+        self.dropped_samples = 0
+        self.underruns = 0  # Lecturas que encontraron el buffer vacío
+
+    @property
+    def available(self) -> int:
+        """Muestras pendientes de leer."""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Espacio libre en muestras."""
+        return self.capacity - self.available
+
+    def write(self, data) -> bool:
+        """
+        Copia un bloque al buffer (una sola copia, dos si da la vuelta).
+
+        Si no cabe entero se descarta y se cuenta como desbordamiento, de modo
+        que el productor nunca pisa datos que el consumidor está leyendo.
+
+        Args:
+            data: Array de numpy o cualquier objeto con protocolo buffer
+                (p. ej. el ``indata`` de ``sounddevice.RawInputStream``)
+
+        Returns:
+            True si el bloque se almacenó
+        """
+        samples = np.frombuffer(data, dtype=self._buffer.dtype)
+        n = samples.size
+        if n > self.free:
+            self.overruns += 1
+            self.dropped_samples += n
+            return False
+
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < n:
+            self._buffer[:n - first] = samples[first:]
+
+        # Publicar el bloque solo cuando ya está copiado
+        self._write_pos += n
+        return True
+
+    def peek(self, max_samples: Optional[int] = None) -> List[memoryview]:
+        """
+        Devuelve vistas de bytes sobre las muestras pendientes, sin copiarlas.
+
+        Son una o dos vistas (si los datos dan la vuelta al buffer) y siguen
+        siendo válidas hasta que se llame a ``consume``.
+
+        Args:
+            max_samples: Máximo de muestras a devolver (por defecto todas)
+
+        Returns:
+            Lista de memoryviews; vacía si no hay datos
+        """
+        n = self.available
+        if max_samples is not None:
+            n = min(n, max_samples)
+        if n <= 0:
+            self.underruns += 1
+            return []
+
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        views = [self._bytes[start * self._itemsize:(start + first) * self._itemsize]]
+        if first < n:
+            views.append(self._bytes[:(n - first) * self._itemsize])
+        return views
+
+    def consume(self, n_samples: int):
+        """Libera muestras ya procesadas para que el productor pueda reutilizarlas."""
+        self._read_pos += min(n_samples, self.available)
+
+    def wait(self, min_samples: int = 1, timeout: Optional[float] = None,
+             poll_interval: float = 0.005) -> bool:
+        """
+        Espera sin locks a que haya al menos ``min_samples`` disponibles.
+
+        Returns:
+            True si hay datos suficientes, False si se agotó el tiempo
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.available < min_samples:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def wait_free(self, min_samples: int, timeout: Optional[float] = None,
+                  poll_interval: float = 0.005) -> bool:
+        """
+        Espera sin locks a que quepan al menos ``min_samples`` (desde el productor).
+
+        Sirve para frenar a productores sin ritmo propio, como una reproducción
+        sin tiempo real, en lugar de descartar sus bloques.
+
+        Returns:
+            True si hay espacio suficiente, False si se agotó el tiempo
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.free < min_samples:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def clear(self):
+        """Descarta los datos pendientes (solo desde el consumidor)."""
+        self._read_pos = self._write_pos
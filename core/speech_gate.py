@@ -0,0 +1,160 @@
+"""
+Compuerta de voz para el reconocedor.
+Solo los segmentos con voz (más un margen previo) llegan a Vosk; al
+terminar cada segmento el reconocedor se finaliza limpiamente.
+Opcionalmente se leen los resultados parciales para decidir antes del final.
+"""
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.partial_results import PartialResultTracker
+from core.vad import FrameVAD
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechGate:
+    """Alimenta un KaldiRecognizer solo con los segmentos que contienen voz."""
+
+    def __init__(self, recognizer, sample_rate: int = 16000, padding_ms: int = 300,
+                 vad: Optional[FrameVAD] = None,
+                 partials: Optional[PartialResultTracker] = None):
+        """
+        Inicializa la compuerta.
+
+        Args:
+            recognizer: Reconocedor con la interfaz de vosk.KaldiRecognizer
+            sample_rate: Frecuencia de muestreo del audio
+            padding_ms: Audio previo al inicio de voz que también se envía
+                (el margen final lo aporta el hangover del VAD)
+            vad: Detector a usar; por defecto un FrameVAD con valores estándar
+            partials: Seguimiento de parciales; si se pasa, ``feed`` también
+                devuelve decisiones tempranas marcadas con ``"early": True``
+        """
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.vad = vad or FrameVAD(sample_rate=sample_rate)
+        self.partials = partials
+        self.padding = sample_rate * padding_ms // 1000
+
+        # Historial suficiente para cubrir el margen y los frames de onset
+        self._history_size = self.padding + (self.vad.onset_frames + 1) * self.vad.frame_size
+        self._history = np.zeros(0, dtype=np.int16)
+        self._position = 0  # Muestras recibidas en total
+        self._fed_until = 0  # Posición hasta la que ya se envió audio
+        self.active = False
+
+        self.samples_total = 0
+        self.samples_fed = 0
+        self.segments = 0
+        self.decode_time = 0.0
+
+    def feed(self, audio: np.ndarray) -> List[Dict]:
+        """
+        Procesa un chunk int16 y devuelve los resultados finales de Vosk.
+
+        Returns:
+            Lista de resultados (dict de ``Result``/``FinalResult``) producidos.
+            Con seguimiento de parciales, las decisiones tempranas llegan como
+            ``{"text", "score", "early": True}`` y el resultado final de esa
+            frase lleva ``"early_confirmed"`` (True si coincide, False si la corrige)
+        """
+        audio = audio.astype(np.int16, copy=False)
+        self._position += audio.size
+        self.samples_total += audio.size
+        self._history = np.concatenate([self._history, audio])[-(self._history_size + audio.size):]
+
+        results = []
+        for event in self.vad.process(audio):
+            if event.kind == "start":
+                self.active = True
+                self.segments += 1
+                self._fed_until = max(self._fed_until, event.sample - self.padding)
+            elif event.kind == "end":
+                # Enviar lo que quede hasta el final del segmento y cerrar
+                self._feed_until(event.sample, results)
+                self._finalize(results)
+                self.active = False
+
+        if self.active:
+            self._feed_until(self._position, results)
+        return results
+
+    def _feed_until(self, position: int, results: List[Dict]):
+        """Envía al reconocedor el audio del historial hasta ``position``."""
+        history_start = self._position - self._history.size
+        start = max(self._fed_until, history_start)
+        if position <= start:
+            return
+
+        data = self._history[start - history_start:position - history_start]
+        inicio = time.perf_counter()
+        accepted = self.recognizer.AcceptWaveform(data.tobytes())
+        self.decode_time += time.perf_counter() - inicio
+        self.samples_fed += data.size
+        self._fed_until = position
+
+        if accepted:
+            self._append_result(self.recognizer.Result(), results)
+        elif self.partials is not None:
+            self._check_partial(results)
+
+    def _check_partial(self, results: List[Dict]):
+        """Lee el resultado parcial y añade la decisión temprana, si la hay."""
+        try:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        except (TypeError, ValueError):
+            return
+        commit = self.partials.update(partial)
+        if commit is not None:
+            results.append({"text": commit.text, "score": commit.score, "early": True})
+
+    def _finalize(self, results: List[Dict]):
+        """Cierra el segmento actual y reinicia el reconocedor."""
+        inicio = time.perf_counter()
+        final = self.recognizer.FinalResult()
+        self.decode_time += time.perf_counter() - inicio
+        self._append_result(final, results)
+
+    def _append_result(self, raw: str, results: List[Dict]):
+        """Añade un resultado de Vosk si contiene texto y cierra sus parciales."""
+        try:
+            result = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Resultado de Vosk no válido: {raw!r}")
+            result = {}
+
+        text = result.get("text", "").strip()
+        if self.partials is not None:
+            confirmed = self.partials.finalize(text)
+            if confirmed is not None:
+                result["early_confirmed"] = confirmed
+        if text:
+            results.append(result)
+
+    def flush(self) -> List[Dict]:
+        """Cierra el segmento en curso, si lo hay (p. ej. al detener el audio)."""
+        results = []
+        if self.active:
+            self._finalize(results)
+            self.active = False
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        """Métricas de ahorro: audio no decodificado y CPU estimada ahorrada."""
+        skipped = self.samples_total - self.samples_fed
+        cost_per_sample = self.decode_time / self.samples_fed if self.samples_fed else 0.0
+        return {
+            'audio_seconds': self.samples_total / self.sample_rate,
+            'fed_seconds': self.samples_fed / self.sample_rate,
+            'skipped_ratio': skipped / self.samples_total if self.samples_total else 0.0,
+            'segments': self.segments,
+            'segments_dropped': self.vad.rejected_bursts,
+            'decode_time': self.decode_time,
+            'cpu_saved_seconds': skipped * cost_per_sample,
+            **(self.partials.stats() if self.partials is not None else {}),
+        }
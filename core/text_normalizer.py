@@ -0,0 +1,116 @@
+"""
+Normalización de texto reconocido en una sola pasada.
+Todas las correcciones se compilan en una única expresión regular con forma
+de trie, de modo que el coste por texto depende de su longitud y no del
+número de correcciones. La comparación ignora acentos sin alterar los del
+resultado. Las palabras de activación no se quitan aquí: admiten variantes
+aproximadas y fonéticas, y las recorta ``WakeWordMatcher.strip``.
+"""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_ACCENTS = str.maketrans("áéíóúüàèìòùâêîôû", "aeiouuaeiouaeiou")
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin acentos, con la misma longitud que el texto original."""
+    return text.lower().translate(_ACCENTS)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Expresión regular equivalente a la alternancia de ``words`` pero con forma de trie.
+
+    Los prefijos comunes se comparten, así que en cada posición del texto el
+    motor avanza carácter a carácter en lugar de probar cada alternativa.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        end = "" in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # Preferir la forma más larga y, si no encaja, terminar aquí
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class TextNormalizer:
+    """Aplica correcciones con una única expresión compilada."""
+
+    def __init__(self, corrections: Optional[Dict[str, str]] = None, fold_accents: bool = False):
+        """
+        Compila el normalizador.
+
+        Args:
+            corrections: Diccionario frase reconocida -> frase corregida
+            fold_accents: Quitar también los acentos del resultado
+        """
+        self.fold_accents = fold_accents
+        self._replacements: Dict[str, str] = {}
+        for original, corrected in (corrections or {}).items():
+            key = " ".join(fold(original).split())
+            if key:
+                self._replacements[key] = corrected.lower()
+
+        if self._replacements:
+            self._pattern = re.compile(r"(?<!\w)" + trie_pattern(self._replacements) + r"(?!\w)")
+        else:
+            self._pattern = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], fold_accents: bool = False) -> "TextNormalizer":
+        """
+        Crea el normalizador con las correcciones de un archivo JSON (objeto frase -> corrección).
+
+        Si el archivo no existe o no es válido se usa sin correcciones.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                corrections = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No se pudieron cargar las correcciones de {path}: {e}")
+            corrections = {}
+        return cls(corrections, fold_accents)
+
+    def __len__(self) -> int:
+        return len(self._replacements)
+
+    def normalize(self, text: str) -> str:
+        """
+        Normaliza un texto: minúsculas, espacios simples y correcciones en una pasada.
+        """
+        text = " ".join(text.lower().split())
+        folded = text.translate(_ACCENTS)
+        if self._pattern is not None:
+            # Se busca sobre el texto sin acentos y se recorta el original:
+            # ambos tienen la misma longitud
+            parts = []
+            last = 0
+            for match in self._pattern.finditer(folded):
+                parts.append(text[last:match.start()])
+                parts.append(self._replacements[match.group()])
+                last = match.end()
+            if parts:
+                parts.append(text[last:])
+                text = " ".join("".join(parts).split())
+                folded = text.translate(_ACCENTS)
+        return folded if self.fold_accents else text
+
+    __call__ = normalize
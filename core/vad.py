@@ -0,0 +1,133 @@
+"""
+Detección de voz activa (VAD) alineada a frames.
+Reencuadra el flujo de audio en frames válidos para webrtcvad (10/20/30 ms)
+a través de los bordes de chunk y suaviza la decisión con una máquina de
+estados de arranque (onset) y mantenimiento (hangover).
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import webrtcvad
+
+logger = logging.getLogger(__name__)
+
+VALID_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+VALID_FRAME_MS = (10, 20, 30)
+
+
+@dataclass
+class VADEvent:
+    """Evento de inicio o fin de voz."""
+    kind: str  # "start" o "end"
+    sample: int  # Posición absoluta en muestras desde el último reset
+
+
+class FrameVAD:
+    """VAD con reencuadre entre chunks y suavizado onset/hangover."""
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30,
+                 aggressiveness: int = 3, onset_frames: int = 3,
+                 hangover_frames: int = 10, vad: Optional[webrtcvad.Vad] = None):
+        """
+        Inicializa el detector.
+
+        Args:
+            sample_rate: Frecuencia de muestreo (8000, 16000, 32000 o 48000 Hz)
+            frame_ms: Duración de cada frame enviado a webrtcvad (10, 20 o 30 ms)
+            aggressiveness: Agresividad de webrtcvad (0-3) si no se pasa ``vad``
+            onset_frames: Frames de voz consecutivos necesarios para emitir "start"
+            hangover_frames: Frames sin voz consecutivos necesarios para emitir "end"
+            vad: Instancia de webrtcvad.Vad a reutilizar
+        """
+        if sample_rate not in VALID_SAMPLE_RATES:
+            raise ValueError(f"Frecuencia no soportada por webrtcvad: {sample_rate}")
+        if frame_ms not in VALID_FRAME_MS:
+            raise ValueError(f"Duración de frame no soportada por webrtcvad: {frame_ms} ms")
+
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.onset_frames = max(1, onset_frames)
+        self.hangover_frames = max(1, hangover_frames)
+        self.vad = vad or webrtcvad.Vad(aggressiveness)
+
+        self.reset()
+
+    def reset(self):
+        """Reinicia el estado y la posición del flujo."""
+        self.in_speech = False
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._position = 0  # Muestras ya votadas
+        self._speech_run = 0
+        self._silence_run = 0
+        self._last_speech_end = 0
+        self._error_logged = False
+        self.rejected_bursts = 0  # Ráfagas de voz más cortas que el onset
+
+    @property
+    def active(self) -> bool:
+        """True si hay voz o un arranque de voz en curso (aún sin completar el onset)."""
+        return self.in_speech or self._speech_run > 0
+
+    def process(self, audio: np.ndarray, silent: bool = False) -> List[VADEvent]:
+        """
+        Vota los frames completos disponibles y devuelve los eventos producidos.
+
+        Las muestras que no completan un frame se guardan para el siguiente chunk.
+
+        Args:
+            audio: Chunk int16 mono de cualquier longitud
+            silent: Si es True el chunk se cuenta como silencio sin consultar a webrtcvad
+
+        Returns:
+            Lista de eventos de inicio/fin de voz, en orden
+        """
+        if self._pending.size:
+            audio = np.concatenate([self._pending, audio.astype(np.int16, copy=False)])
+        else:
+            audio = audio.astype(np.int16, copy=False)
+
+        n_frames = audio.size // self.frame_size
+        self._pending = audio[n_frames * self.frame_size:].copy()
+
+        events = []
+        for i in range(n_frames):
+            frame = audio[i * self.frame_size:(i + 1) * self.frame_size]
+            event = self._update(False if silent else self._vote(frame))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _vote(self, frame: np.ndarray) -> bool:
+        """Consulta a webrtcvad para un frame."""
+        try:
+            return self.vad.is_speech(frame.tobytes(), self.sample_rate)
+        except Exception as e:
+            if not self._error_logged:
+                logger.warning(f"Error en detección de voz: {e}")
+                self._error_logged = True
+            return False
+
+    def _update(self, voiced: bool) -> Optional[VADEvent]:
+        """Avanza la máquina de estados un frame."""
+        self._position += self.frame_size
+
+        if voiced:
+            self._speech_run += 1
+            self._silence_run = 0
+            self._last_speech_end = self._position
+            if not self.in_speech and self._speech_run >= self.onset_frames:
+                self.in_speech = True
+                onset = self._position - self._speech_run * self.frame_size
+                return VADEvent("start", onset)
+        else:
+            if not self.in_speech and self._speech_run:
+                self.rejected_bursts += 1
+            self._silence_run += 1
+            self._speech_run = 0
+            if self.in_speech and self._silence_run >= self.hangover_frames:
+                self.in_speech = False
+                return VADEvent("end", self._last_speech_end)
+        return None
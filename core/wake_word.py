@@ -0,0 +1,225 @@
+"""
+Búsqueda aproximada de palabras de activación.
+Las frases se compilan una sola vez en un índice por forma compacta (sin
+espacios ni acentos) y por longitud de ventana; cada ventana de palabras del
+texto se compara solo con las frases de longitud compatible que pasan un
+filtro de letras, mediante una distancia de edición por vectores de bits
+que abandona en cuanto supera el máximo permitido. Las variantes que solo se
+parecen al oído se resuelven con el índice fonético. Las frases cortas solo
+se aceptan literalmente: a una edición o con una clave fonética de tres
+consonantes ("compae" -> KMP, "agp" -> AJP) coinciden con palabras
+corrientes ("compás", "campo", "hijo pa"), así que sus variantes se
+declaran explícitamente.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.phonetic import PhoneticIndex
+from core.text_normalizer import fold
+
+_TOKEN = re.compile(r"\w+")
+def pattern_masks(pattern: str) -> Dict[str, int]:
+    """Máscara de bits de posiciones de cada carácter del patrón."""
+    masks: Dict[str, int] = {}
+    for i, c in enumerate(pattern):
+        masks[c] = masks.get(c, 0) | (1 << i)
+    return masks
+
+
+def bit_parallel_distance(masks: Dict[str, int], length: int, text: str,
+                           max_distance: int) -> Optional[int]:
+    """
+    Distancia de edición entre un patrón (dado por sus máscaras) y ``text``.
+
+    Algoritmo de vectores de bits de Myers/Hyyrö: una columna completa de la
+    matriz de programación dinámica por carácter con unas pocas operaciones
+    enteras. Abandona en cuanto ni con coincidencias perfectas en el resto del
+    texto se podría bajar de ``max_distance``.
+    """
+    if length == 0:
+        return len(text) if len(text) <= max_distance else None
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+    remaining = len(text)
+    for c in text:
+        eq = masks.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        remaining -= 1
+        if score - remaining > max_distance:
+            return None
+    return score if score <= max_distance else None
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Distancia de Levenshtein si no supera ``max_distance``.
+
+    Returns:
+        La distancia, o None si es mayor que ``max_distance``
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    return bit_parallel_distance(pattern_masks(a), len(a), b, max_distance)
+
+
+@dataclass
+class WakeWordMatch:
+    """Frase de activación encontrada en un texto."""
+    phrase: str  # Frase configurada
+    start: int  # Posición de inicio en el texto original
+    end: int  # Posición final (exclusiva) en el texto original
+    score: float  # Similitud entre 0.0 y 1.0 (1.0 = coincidencia exacta)
+
+
+class WakeWordMatcher:
+    """Detector de palabras de activación compilado una vez a partir de la configuración."""
+
+    def __init__(self, wake_words: Iterable[str], threshold: float = 0.7,
+                 phonetic: bool = True, phonetic_score: float = 0.9,
+                 phonetic_min_key: int = 4, min_fuzzy_length: int = 7):
+        """
+        Compila el índice.
+
+        Args:
+            wake_words: Frases de activación
+            threshold: Similitud mínima (1 - distancia / longitud) para aceptar
+                una coincidencia aproximada
+            phonetic: Resolver también las variantes con la misma clave fonética
+            phonetic_score: Similitud asignada a las coincidencias fonéticas
+            phonetic_min_key: Longitud mínima de la clave fonética; una activación
+                en falso es peor que una perdida, así que es mayor que en los comandos
+            min_fuzzy_length: Letras mínimas de una frase para buscarla de forma
+                aproximada; las más cortas ("compae", "illo") están a una edición
+                de palabras corrientes ("compás", "hilo") y solo coinciden literalmente
+        """
+        self.threshold = threshold
+        self.phonetic_score = phonetic_score
+        self.phrases: List[str] = []
+        self._exact: Dict[str, str] = {}
+        self._max_tokens = 1
+        self._max_length = 0
+
+        for phrase in wake_words:
+            phrase = phrase.lower().strip()
+            tokens = _TOKEN.findall(fold(phrase))
+            compact = "".join(tokens)
+            if not compact or compact in self._exact:
+                continue
+            self.phrases.append(phrase)
+            self._exact[compact] = phrase
+            # Se admite una palabra más para variantes partidas ("auto gestión")
+            self._max_tokens = max(self._max_tokens, len(tokens) + 1)
+            self._max_length = max(self._max_length, len(compact))
+
+        # Ninguna ventana más larga puede alcanzar el umbral
+        self._max_window = int(self._max_length / threshold) if threshold > 0 else self._max_length
+
+        self._phonetic = (PhoneticIndex(self.phrases, min_key_length=phonetic_min_key)
+                          if phonetic else None)
+
+        # Para cada longitud de ventana, las frases alcanzables con su distancia máxima
+        self._candidates: Dict[int, List[Tuple[dict, int, frozenset, str, int, int]]] = {}
+        for length in range(1, self._max_window + 1):
+            for compact, phrase in self._exact.items():
+                if len(compact) < min_fuzzy_length:
+                    continue
+                longest = max(length, len(compact))
+                max_distance = int((1.0 - threshold) * longest)
+                if abs(length - len(compact)) <= max_distance:
+                    self._candidates.setdefault(length, []).append(
+                        (pattern_masks(compact), len(compact), frozenset(compact),
+                         phrase, max_distance, longest))
+
+    def find(self, text: str) -> Optional[WakeWordMatch]:
+        """
+        Busca la mejor coincidencia en el texto.
+
+        Gana la de mayor similitud y, a igualdad, la primera; una coincidencia
+        exacta termina la búsqueda.
+
+        Returns:
+            La coincidencia, o None si ninguna alcanza el umbral
+        """
+        if not text:
+            return None
+        folded = fold(text)
+        spans = [m.span() for m in _TOKEN.finditer(folded)]
+
+        best = None
+        for i, (start, _) in enumerate(spans):
+            compact = ""
+            for j in range(i, min(len(spans), i + self._max_tokens)):
+                compact += folded[spans[j][0]:spans[j][1]]
+                if len(compact) > self._max_window:
+                    break
+                phrase, score = self._score(compact)
+                if phrase is not None and (best is None or score > best.score):
+                    best = WakeWordMatch(phrase, start, spans[j][1], score)
+            if best is not None and best.score == 1.0:
+                return best
+
+        if self._phonetic is not None and (best is None or best.score < self.phonetic_score):
+            match = self._phonetic.find(text)
+            if match is not None:
+                best = WakeWordMatch(match.canonical, match.start, match.end, self.phonetic_score)
+        return best
+
+    def _score(self, compact: str) -> Tuple[Optional[str], float]:
+        """Frase más parecida a una ventana compacta y su similitud."""
+        phrase = self._exact.get(compact)
+        if phrase is not None:
+            return phrase, 1.0
+
+        best_phrase, best_score = None, 0.0
+        candidates = self._candidates.get(len(compact))
+        if not candidates:
+            return best_phrase, best_score
+
+        letters = frozenset(compact)
+        for masks, target_length, target_letters, phrase, max_distance, longest in candidates:
+            # Cada letra presente en solo una de las dos exige al menos una edición
+            if (len(letters - target_letters) > max_distance
+                    or len(target_letters - letters) > max_distance):
+                continue
+            distance = bit_parallel_distance(masks, target_length, compact, max_distance)
+            if distance is None:
+                continue
+            score = 1.0 - distance / longest
+            if score > best_score:
+                best_phrase, best_score = phrase, score
+        return best_phrase, best_score
+
+    def contains(self, text: str) -> bool:
+        """Indica si el texto contiene alguna palabra de activación."""
+        return self.find(text) is not None
+
+    def strip(self, text: str, match: Optional[WakeWordMatch] = None) -> str:
+        """
+        Quita la palabra de activación del texto y devuelve el comando.
+
+        Args:
+            text: Texto reconocido
+            match: Coincidencia ya calculada con ``find`` (se busca si no se pasa)
+
+        Returns:
+            El resto del texto en minúsculas, sin espacios sobrantes
+        """
+        match = match or self.find(text)
+        if match is not None:
+            text = text[:match.start] + " " + text[match.end:]
+        return " ".join(text.lower().split())
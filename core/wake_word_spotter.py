@@ -0,0 +1,139 @@
+"""
+Detección de palabra de activación en dos etapas.
+En reposo solo decodifica un KaldiRecognizer con gramática restringida a
+las frases de activación más ``[unk]``, mucho más barato que el modelo de
+vocabulario completo; tras una detección pasa al reconocedor completo y
+vuelve a la gramática cuando pasa el tiempo de espera sin actividad.
+"""
+import json
+import logging
+import time
+from typing import Callable, Dict, List
+
+import vosk
+
+logger = logging.getLogger(__name__)
+
+UNK = "[unk]"
+
+
+class WakeWordSpotter:
+    """Reconocedor con la interfaz de KaldiRecognizer que alterna gramática y vocabulario completo."""
+
+    def __init__(self, model, sample_rate: int, wake_words: List[str], timeout: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic, recognizer_factory=None):
+        """
+        Inicializa los dos reconocedores.
+
+        Los modelos con grafo dinámico (los "small") admiten gramáticas; con
+        uno que no las admita Vosk ignora la gramática y la primera etapa no ahorra nada.
+
+        Args:
+            model: Modelo Vosk compartido por ambas etapas
+            sample_rate: Frecuencia de muestreo del audio
+            wake_words: Frases de activación (``WAKE_WORDS``)
+            timeout: Segundos sin actividad en modo completo antes de volver a la gramática
+            clock: Reloj monotónico (inyectable en pruebas)
+            recognizer_factory: Constructor de reconocedores; por defecto ``vosk.KaldiRecognizer``
+        """
+        factory = recognizer_factory or vosk.KaldiRecognizer
+        self.wake_words = [w.lower().strip() for w in wake_words if w.strip()]
+        self.timeout = timeout
+        self.clock = clock
+
+        grammar = json.dumps(self.wake_words + [UNK], ensure_ascii=False)
+        self.spotter = factory(model, sample_rate, grammar)
+        self.full = factory(model, sample_rate)
+        self.sample_rate = sample_rate
+
+        self.spotting = True
+        self._last_activity = 0.0
+
+        self.activations = 0
+        self.spotting_samples = 0
+        self.full_samples = 0
+
+    @property
+    def current(self):
+        """Reconocedor de la etapa activa."""
+        return self.spotter if self.spotting else self.full
+
+    def SetWords(self, enabled: bool):
+        self.spotter.SetWords(enabled)
+        self.full.SetWords(enabled)
+
+    def AcceptWaveform(self, data) -> bool:
+        """Decodifica el bloque con la etapa activa."""
+        if not self.spotting and self.clock() - self._last_activity > self.timeout:
+            logger.debug("Tiempo de espera agotado: volviendo a la gramática de activación")
+            self.switch_to_spotting()
+
+        samples = len(data) // 2
+        if self.spotting:
+            self.spotting_samples += samples
+        else:
+            self.full_samples += samples
+        return self.current.AcceptWaveform(data)
+
+    def Result(self) -> str:
+        return self._handle_result(self.current.Result())
+
+    def FinalResult(self) -> str:
+        return self._handle_result(self.current.FinalResult())
+
+    def PartialResult(self) -> str:
+        raw = self.current.PartialResult()
+        if self.spotting:
+            return self._strip_unk(raw, "partial")
+        if json.loads(raw).get("partial"):
+            self.touch()
+        return raw
+
+    def switch_to_full(self):
+        """Pasa al reconocedor de vocabulario completo descartando la frase de la gramática."""
+        if self.spotting:
+            self.spotter.FinalResult()
+            self.spotting = False
+            self.activations += 1
+        self.touch()
+
+    def switch_to_spotting(self):
+        """Vuelve a la gramática de activación descartando la frase en curso."""
+        if not self.spotting:
+            self.full.FinalResult()
+            self.spotting = True
+
+    def touch(self):
+        """Registra actividad para retrasar la vuelta a la gramática."""
+        self._last_activity = self.clock()
+
+    def _handle_result(self, raw: str) -> str:
+        """Limpia ``[unk]`` en la primera etapa y cambia de etapa si hay una detección."""
+        if not self.spotting:
+            if json.loads(raw).get("text"):
+                self.touch()
+            return raw
+
+        raw = self._strip_unk(raw, "text")
+        text = json.loads(raw).get("text", "")
+        if any(wake in text for wake in self.wake_words):
+            logger.debug(f"Palabra de activación detectada por la gramática: '{text}'")
+            self.switch_to_full()
+        return raw
+
+    @staticmethod
+    def _strip_unk(raw: str, key: str) -> str:
+        """Elimina los ``[unk]`` del texto y de las palabras de un resultado."""
+        result = json.loads(raw)
+        result[key] = " ".join(w for w in result.get(key, "").split() if w != UNK)
+        if "result" in result:
+            result["result"] = [w for w in result["result"] if w.get("word") != UNK]
+        return json.dumps(result, ensure_ascii=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Audio decodificado por cada etapa y número de activaciones."""
+        return {
+            'spotting_seconds': self.spotting_samples / self.sample_rate,
+            'full_seconds': self.full_samples / self.sample_rate,
+            'activations': self.activations,
+        }
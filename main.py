@@ -9,15 +9,16 @@ import os
 import sys
 import threading
 from queue import Queue
-
-import vosk
+from typing import Optional
 
 from config import MODEL_PATH, TIMEOUT, WAKE_WORDS
+from core.audio_source import AudioSource
+from core.model_registry import get_model, model_registry, preload_model
 from core.resource_monitor import ResourceMonitor
 from interfaz_simple import AsistenteVentana
 from reconocimiento import start_audio_worker
 from tts import start_tts_worker, hablar
-from comandos import start_comando_worker
+from comandos import crear_cola_comandos, start_comando_worker
 
 # Configurar logging
 logging.basicConfig(
@@ -45,62 +46,63 @@ def validate_model_path(model_path: str) -> bool:
     return True
 
 
-def initialize_vosk_model(model_path: str):
-    """Inicializa el modelo de reconocimiento de voz Vosk.
+def load_vosk_model(model_path: str):
+    """Obtiene el modelo Vosk compartido del registro de modelos.
+    
+    Si ``preload_model`` ya lo está cargando se espera a que termine; el
+    worker de audio crea su propio reconocedor a partir del modelo.
     
     Args:
         model_path: Ruta al modelo Vosk
         
     Returns:
-        Tupla (model, recognizer) o None si hay error
+        El modelo cargado
+        
+    Raises:
+        Exception: La misma que lanzó la carga del modelo
+    """
+    logger.info("Esperando al modelo de voz Vosk...")
+    model = get_model(model_path)
+    info = model_registry.info(model_path)
+    if info is not None:
+        logger.info(f"Modelo cargado en {info.load_time:.2f} s, calentamiento: {info.warmup_time:.2f} s")
+    return model
+
+
+def report_startup_error(asistente: AsistenteVentana, mensaje: str):
+    """Muestra un error de arranque en la ventana desde cualquier hilo.
+    
+    Tkinter no es seguro entre hilos: el cambio se programa en el bucle
+    principal con ``root.after``.
+    
+    Args:
+        asistente: Interfaz del asistente
+        mensaje: Texto a mostrar en el estado
     """
+    logger.error(mensaje)
     try:
-        logger.info("="*50)
-        logger.info("Inicializando modelo de voz Vosk")
-        logger.info(f"Ruta del modelo: {model_path}")
-        
-        # Validar modelo
-        if not validate_model_path(model_path):
-            return None
-        
-        # Cargar modelo
-        logger.info("Cargando modelo...")
-        model = vosk.Model(model_path)
-        
-        # Crear reconocedor
-        sample_rate = 16000
-        rec = vosk.KaldiRecognizer(model, sample_rate)
-        rec.SetWords(True)  # Habilitar reconocimiento de palabras
-        
-        logger.info(f"Modelo cargado exitosamente")
-        logger.info(f"Tasa de muestreo: {sample_rate} Hz")
-        logger.info("="*50)
-        
-        return model, rec
-        
+        asistente.root.after(0, asistente.cambiar_color, "red", mensaje)
     except Exception as e:
-        logger.error("="*50)
-        logger.error(f"Error al inicializar modelo Vosk: {type(e).__name__}")
-        logger.error(f"Detalles: {str(e)}")
-        logger.error("="*50)
-        return None
+        logger.warning(f"No se pudo mostrar el error en la interfaz: {e}")
 
 
-def start_workers(audio_q: Queue, rec, comando_q: Queue, tts_q: Queue) -> bool:
+def start_workers(audio_q: Queue, model, comando_q: Queue, tts_q: Queue,
+                  fuente_audio: Optional[AudioSource] = None) -> bool:
     """Inicia los workers de procesamiento en segundo plano.
     
     Args:
         audio_q: Cola de audio
-        rec: Reconocedor Vosk
+        model: Modelo Vosk compartido (el worker de audio crea su reconocedor)
         comando_q: Cola de comandos
         tts_q: Cola de síntesis de voz
+        fuente_audio: Fuente de audio; por defecto el micrófono predeterminado
         
     Returns:
         True si se inician correctamente, False en caso contrario
     """
     try:
         logger.info("Iniciando workers...")
-        start_audio_worker(audio_q, rec, comando_q)
+        start_audio_worker(audio_q, model, comando_q, fuente_audio)
         logger.debug("Worker de audio iniciado")
         
         start_comando_worker(comando_q)
@@ -175,29 +177,35 @@ def main() -> int:
     try:
         # Crear colas de comunicación entre procesos
         audio_q = Queue()
-        comando_q = Queue()
+        # Los comandos de control ("para", "salir") se adelantan a los encolados
+        comando_q = crear_cola_comandos()
         tts_q = Queue()
         logger.debug("Colas de comunicación creadas")
         
-        # Inicializar modelo Vosk
-        result = initialize_vosk_model(MODEL_PATH)
-        if result is None:
-            logger.error("No se pudo inicializar el modelo Vosk")
+        # Precargar y calentar el modelo Vosk en segundo plano
+        if not validate_model_path(MODEL_PATH):
             return 1
+        preload_model(MODEL_PATH)
         
-        model, rec = result
-        
-        # Iniciar workers
-        if not start_workers(audio_q, rec, comando_q, tts_q):
-            logger.error("No se pudieron iniciar los workers")
-            return 1
-        
-        # Configurar interfaz gráfica
+        # Configurar interfaz gráfica mientras se carga el modelo
         asistente = setup_gui(audio_q, comando_q, tts_q)
         if asistente is None:
             logger.error("No se pudo configurar la interfaz")
             return 1
         
+        # Iniciar los workers cuando el modelo esté listo, sin bloquear la interfaz
+        def start_when_ready():
+            try:
+                model = load_vosk_model(MODEL_PATH)
+            except Exception as e:
+                report_startup_error(asistente, f"Error al cargar el modelo de voz: {type(e).__name__}: {e}")
+                return
+            
+            if not start_workers(audio_q, model, comando_q, tts_q):
+                report_startup_error(asistente, "No se pudieron iniciar los workers")
+        
+        threading.Thread(target=start_when_ready, name="vosk-startup", daemon=True).start()
+        
         # Planificar mensaje de bienvenida
         def welcome_message():
             logger.info("Asistente listo. Esperando palabra de activación...")
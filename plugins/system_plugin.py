@@ -7,7 +7,7 @@ import datetime
 import logging
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-from ..core.plugin_manager import Plugin
+from core.plugin_manager import Plugin
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +42,9 @@ class SystemPlugin(Plugin):
             "apagar": {
                 "function": self.shutdown,
                 "description": "Apaga el asistente",
-                "examples": ["Apágate", "Cierra el programa"]
+                "examples": ["Apágate", "Cierra el programa"],
+                # Solo por su nombre: "cierra el programa de música" no debe apagar
+                "destructive": True
             }
         }
     
@@ -5,13 +5,54 @@ import json
 import queue
 import logging
 import numpy as np
-from config import WAKE_WORDS, TIMEOUT, SENSIBILIDAD_WAKE, MODEL_PATH
+from cffi import FFI
+from config import (WAKE_WORDS, TIMEOUT, SENSIBILIDAD_WAKE, MODEL_PATH, UMBRAL_VOLUMEN, PREROLL_MS,
+                    COMPUERTA_VOZ, RESULTADOS_PARCIALES, PARCIALES_ESTABLES, UMBRAL_CONFIRMACION_TEMPRANA,
+                    DOS_ETAPAS_WAKE)
+from comandos import confianza_temprana
+from core.audio_processor import AutomaticGainControl, PolyphaseResampler
+from core.audio_source import SoundDeviceSource
+from core.partial_results import PartialResultTracker
+from core.ring_buffer import AudioRingBuffer
+from core.speech_gate import SpeechGate
+from core.wake_word import WakeWordMatcher
+from core.wake_word_spotter import WakeWordSpotter
 from tts import hablar
+from utils import normalizar_texto
 from interfaz import asistente
 import time
 
-# Cola global para el audio
+# Cola global para el audio (se conserva por compatibilidad; la captura usa audio_ring)
 audio_queue = None
+# Fuente de audio (micrófono por defecto; ReplaySource para pruebas y benchmarks)
+fuente_audio = None
+# Buffer circular de captura: lo llena el callback y lo vacía worker_audio
+audio_ring = None
+# Segundos de audio que caben en el buffer circular; la capacidad en muestras
+# se calcula con la frecuencia real de captura al abrir la fuente
+SEGUNDOS_RING = 10
+# Muestras (a la frecuencia de captura) que el worker entrega a Vosk en cada iteración
+BLOQUE_MUESTRAS = 8000
+# Nivel de pico objetivo del AGC (0.0 a 1.0) y ganancia máxima permitida
+NIVEL_OBJETIVO_AGC = 0.3
+GANANCIA_MAXIMA_AGC = 8.0
+# Avisos de estado de PortAudio (p. ej. input overflow) contados desde el callback
+avisos_stream = 0
+# Compuerta de voz (VAD) que decide qué audio llega a Vosk, si COMPUERTA_VOZ
+compuerta_voz = None
+# Seguimiento de resultados parciales para decidir antes del final, si RESULTADOS_PARCIALES
+parciales = None
+# Control automático de ganancia aplicado en el worker antes del reconocedor
+agc = None
+# Remuestreador a 16 kHz cuando el dispositivo captura a otra frecuencia
+remuestreador = None
+# Frecuencia de trabajo del reconocedor
+FRECUENCIA_VOSK = 16000
+# Muestras de pre-roll a 16 kHz: el inicio suave de la voz, por debajo del
+# umbral, se envía a Vosk al detectar voz para no recortar la primera sílaba
+PREROLL_MUESTRAS = FRECUENCIA_VOSK * PREROLL_MS // 1000
+# Permite pasar a Vosk punteros a las vistas del buffer sin copiarlas a bytes
+_ffi = FFI()
 # Reconocedor de voz
 rec = None
 # Cola para enviar comandos procesados
@@ -22,121 +63,203 @@ escuchando = False
 TIEMPO_ESPERA = 5.0
 ultimo_tiempo_actividad = time.time()
 
+# Detector de palabras de activación compilado una sola vez
+detector_wake = WakeWordMatcher(WAKE_WORDS, threshold=SENSIBILIDAD_WAKE)
+
 # Función para verificar si el texto contiene alguna palabra de activación
 def contiene_wakeword(texto):
-    if not texto:
-        return False
-    
-    texto = texto.lower().strip()
-    print(f"\n=== Análisis de reconocimiento ===")
-    print(f"Texto reconocido: '{texto}'")
-    print(f"Palabras de activación: {WAKE_WORDS}")
-    
-    # Verificar si alguna palabra de activación está en el texto
-    for palabra in WAKE_WORDS:
-        # Búsqueda más flexible de palabras de activación
-        if palabra in texto or any(palabra.split()[0] in texto.split() for palabra in WAKE_WORDS if len(palabra.split()) > 1):
-            print(f"¡Posible palabra de activación detectada en: '{texto}'!")
-            # Verificar el nivel de confianza
-            palabras_texto = set(texto.split())
-            palabras_activacion = set(palabra.split())
-            coincidencias = palabras_texto.intersection(palabras_activacion)
-            
-            # Calcular porcentaje de coincidencia
-            porcentaje = len(coincidencias) / len(palabras_activacion) if palabras_activacion else 0
-            print(f"Nivel de confianza: {porcentaje*100:.1f}%")
-            
-            if porcentaje >= SENSIBILIDAD_WAKE:
-                print(f"¡Palabra de activación confirmada!")
-                return True
-    
-    print("No se detectaron palabras de activación con suficiente confianza")
-    return False
+    coincidencia = detector_wake.find(texto)
+    if coincidencia is not None:
+        logging.debug(f"Palabra de activación '{coincidencia.phrase}' "
+                      f"(similitud {coincidencia.score:.2f}) en: '{texto}'")
+    return coincidencia is not None
 
-# Función para limpiar el texto de palabras de activación
+# Función para limpiar el texto de palabras de activación y aplicar las correcciones
 def limpiar_comando(texto):
-    texto = texto.lower()
-    for palabra in WAKE_WORDS:
-        texto = texto.replace(palabra, '')
-    return texto.strip()
+    return normalizar_texto(detector_wake.strip(texto))
 
-def callback(indata, frames, time, status):
-    global ultimo_tiempo_actividad
-    
+def callback(indata, frames, time_info, status):
+    """Callback de PortAudio: una única copia al buffer circular, sin prints ni colas."""
+    global avisos_stream
     if status:
-        logging.warning(f"Audio status: {status}")
+        avisos_stream += 1
+    if fuente_audio is not None and not fuente_audio.realtime:
+        # Una reproducción sin ritmo real espera a que el worker libere sitio
+        # en lugar de perder bloques; si el worker no avanza, se descarta
+        audio_ring.wait_free(frames, timeout=TIMEOUT)
+    audio_ring.write(indata)
+
+def estadisticas_captura():
+    """Devuelve los contadores de desbordamiento y vaciado de la captura."""
+    if audio_ring is None:
+        return {}
+    estadisticas = {
+        'overruns': audio_ring.overruns,
+        'underruns': audio_ring.underruns,
+        'muestras_descartadas': audio_ring.dropped_samples,
+        'avisos_stream': avisos_stream,
+    }
+    if compuerta_voz is not None:
+        estadisticas['compuerta'] = compuerta_voz.stats()
+    if agc is not None:
+        estadisticas['ganancia_agc_db'] = agc.gain_db
+    if parciales is not None:
+        estadisticas['parciales'] = parciales.stats()
+    if isinstance(rec, WakeWordSpotter):
+        estadisticas['dos_etapas'] = rec.stats()
+    return estadisticas
+
+def _volumen(muestras):
+    """Nivel de pico del bloque en porcentaje de la escala completa."""
+    if muestras.size == 0:
+        return 0.0
+    return max(int(muestras.max()), -int(muestras.min())) * 100.0 / 32768
+
+def _preparar_bloque(vista):
+    """Remuestrea a 16 kHz y aplica el AGC; devuelve el bloque int16 listo para Vosk."""
+    muestras = np.frombuffer(vista, dtype=np.int16)
+    if remuestreador is not None:
+        muestras = remuestreador.process(muestras)
+    return agc.process(muestras)
+
+def _puntuar_parcial(texto):
+    """Confianza para actuar sobre un parcial: wake word en reposo o comando exacto y completo al escuchar."""
+    if not escuchando:
+        return 1.0 if contiene_wakeword(texto) else 0.0
+    return confianza_temprana(limpiar_comando(texto))
+
+def _alimentar_reconocedor(datos, resultados):
+    """Envía un bloque ya preparado a Vosk y añade a ``resultados`` el final o la decisión temprana."""
+    if rec.AcceptWaveform(_ffi.from_buffer(datos)):
+        result = json.loads(rec.Result())
+        texto = result.get("text", "").strip()
+        if parciales is not None:
+            confirmado = parciales.finalize(texto)
+            if confirmado is not None:
+                result["early_confirmed"] = confirmado
+        if texto:
+            resultados.append(result)
+    elif parciales is not None:
+        parcial = json.loads(rec.PartialResult()).get("partial", "")
+        decision = parciales.update(parcial)
+        if decision is not None:
+            resultados.append({"text": decision.text, "score": decision.score, "early": True})
+
+def _etapa_completa(activa):
+    """Cambia entre la gramática de activación y el reconocedor completo, si hay dos etapas."""
+    if not isinstance(rec, WakeWordSpotter):
+        return
+    if activa:
+        rec.switch_to_full()
+    else:
+        rec.switch_to_spotting()
+    # La frase en curso pertenece a la etapa anterior
+    if parciales is not None:
+        parciales.reset()
+
+def _procesar_texto(texto):
+    """Aplica la lógica de activación y comandos a un texto reconocido."""
+    global escuchando, ultimo_tiempo_actividad
+    
+    # Mostrar en la interfaz
+    asistente.agregar_log(f"Reconocido: {texto}")
+    print(f"\nTexto reconocido: '{texto}'")
+    print(f"Palabras de activación: {WAKE_WORDS}")
     
-    # Calcular el volumen actual
-    volumen_actual = np.max(np.abs(indata)) * 100  # Convertir a porcentaje
+    # Actualizar el último tiempo de actividad
+    ultimo_tiempo_actividad = time.time()
     
-    # Solo procesar si el volumen supera el umbral
-    if volumen_actual > UMBRAL_VOLUMEN:
-        # Aplicar ganancia al audio
-        audio_ampliado = indata * ganancia
-        audio_ampliado = audio_ampliado.astype('int16')
-        
-        # Actualizar el tiempo de última actividad
-        ultimo_tiempo_actividad = time.time()
-        
-        # Mostrar nivel de volumen (opcional, para depuración)
-        print(f"\rNivel de volumen: {volumen_actual:.1f}%" + " " * 10, end="")
-        
-        # Enviar a la cola de procesamiento
-        audio_queue.put(bytes(audio_ampliado))
-    else:
-        tiempo_transcurrido = time.time() - ultimo_tiempo_actividad
-        if tiempo_transcurrido > 2.0:  # Solo mostrar el mensaje si ha pasado un tiempo sin actividad
-            print("\rEsperando voz..." + " " * 20, end="")
+    # Verificar si el texto contiene alguna palabra de activación
+    if contiene_wakeword(texto):
+        if not escuchando:
+            escuchando = True
+            _etapa_completa(True)
+            asistente.cambiar_color("blue", "Escuchando...")
+            asistente.agregar_log("¡Palabra de activación detectada!")
+            hablar("¿En qué puedo ayudarte?")
+    
+    # Si está en modo escucha, procesar el comando
+    elif escuchando:
+        comando = limpiar_comando(texto)
+        if comando:  # Solo procesar si hay algo después de la palabra de activación
+            asistente.agregar_log(f"Procesando comando: {comando}")
+            asistente.cambiar_color("yellow", "Procesando...")
+            if comando_queue:
+                comando_queue.put(comando)
+        else:
+            escuchando = False
+            _etapa_completa(False)
+            asistente.cambiar_color("green", "Listo")
+            asistente.agregar_log("Modo de escucha desactivado")
 
 def worker_audio():
-    global escuchando, ultimo_tiempo_actividad, rec
+    global escuchando, ultimo_tiempo_actividad, rec, compuerta_voz, remuestreador, agc, parciales, audio_ring
     
     # Configuración de audio
-    samplerate = 16000
+    samplerate = fuente_audio.samplerate if fuente_audio is not None else FRECUENCIA_VOSK
     channels = 1
-    dtype = 'int16'
-    
-    # Ajustes de ganancia de audio (puedes ajustar este valor)
-    ganancia = 1.5  # Aumentar si el micrófono es muy bajo
-    
-    # Listar y mostrar dispositivos de audio disponibles
-    print("\n=== Configuración de Audio ===")
-    print("Dispositivos de audio disponibles:")
-    dispositivos = sd.query_devices()
     
-    # Mostrar dispositivos disponibles
-    for i, dispositivo in enumerate(dispositivos):
-        print(f"{i}: {dispositivo['name']} (Entradas: {dispositivo['max_input_channels']})")
+    # Indica si el último bloque leído superaba el umbral de volumen
+    hay_voz = False
+    # Pre-roll ya remuestreado a 16 kHz: solo los bloques de silencio que Vosk
+    # aún no ha recibido, en orden, así que nunca se repite audio ya enviado
+    preroll = np.zeros(0, dtype=np.int16)
+    # Decidir sobre los parciales estables sin esperar al final de cada frase
+    parciales = PartialResultTracker(_puntuar_parcial, stable_partials=PARCIALES_ESTABLES,
+                                     commit_threshold=UMBRAL_CONFIRMACION_TEMPRANA) if RESULTADOS_PARCIALES else None
+    # Con la compuerta, el margen previo del VAD sustituye al pre-roll por volumen
+    compuerta_voz = SpeechGate(rec, sample_rate=FRECUENCIA_VOSK, padding_ms=PREROLL_MS,
+                               partials=parciales) if COMPUERTA_VOZ else None
     
-    # Intentar con el dispositivo predeterminado
-    dispositivo_entrada = sd.default.device[0]
-    print(f"\nUsando dispositivo de audio (entrada): {dispositivos[dispositivo_entrada]['name']}")
+    fuente = fuente_audio
+    if fuente is None:
+        # Listar y mostrar dispositivos de audio disponibles
+        print("\n=== Configuración de Audio ===")
+        print("Dispositivos de audio disponibles:")
+        dispositivos = sd.query_devices()
+        
+        # Mostrar dispositivos disponibles
+        for i, dispositivo in enumerate(dispositivos):
+            print(f"{i}: {dispositivo['name']} (Entradas: {dispositivo['max_input_channels']})")
+        
+        # Intentar con el dispositivo predeterminado
+        dispositivo_entrada = sd.default.device[0]
+        print(f"\nUsando dispositivo de audio (entrada): {dispositivos[dispositivo_entrada]['name']}")
+        
+        # Verificar si el dispositivo de entrada es válido
+        if dispositivos[dispositivo_entrada]['max_input_channels'] == 0:
+            error_msg = "¡Error! El dispositivo seleccionado no tiene canales de entrada."
+            print(error_msg)
+            asistente.agregar_log(error_msg)
+            asistente.cambiar_color("red", "Error de micrófono")
+            return
+        
+        # Capturar a la frecuencia nativa: evita el remuestreo implícito de
+        # PortAudio y los fallos al abrir dispositivos que solo ofrecen 44.1/48 kHz
+        samplerate = int(dispositivos[dispositivo_entrada]['default_samplerate'])
+        fuente = SoundDeviceSource(
+            device=dispositivo_entrada,
+            samplerate=samplerate,
+            blocksize=8000,
+            channels=channels
+        )
     
-    # Verificar si el dispositivo de entrada es válido
-    if dispositivos[dispositivo_entrada]['max_input_channels'] == 0:
-        error_msg = "¡Error! El dispositivo seleccionado no tiene canales de entrada."
-        print(error_msg)
-        asistente.agregar_log(error_msg)
-        asistente.cambiar_color("red", "Error de micrófono")
-        return
+    # El buffer guarda muestras a la frecuencia de captura: se dimensiona con ella
+    audio_ring = AudioRingBuffer(samplerate * SEGUNDOS_RING)
+    remuestreador = PolyphaseResampler(samplerate, FRECUENCIA_VOSK) if samplerate != FRECUENCIA_VOSK else None
+    agc = AutomaticGainControl(FRECUENCIA_VOSK, target_level=NIVEL_OBJETIVO_AGC,
+                               max_gain=GANANCIA_MAXIMA_AGC)
     
     try:
         # Configurar el stream de audio
-        with sd.RawInputStream(
-            samplerate=samplerate,
-            blocksize=8000,
-            device=dispositivo_entrada,
-            dtype=dtype,
-            channels=channels,
-            callback=callback
-        ) as stream:
+        with fuente.open(callback) as stream:
             print("\n=== Iniciando reconocimiento de voz ===")
             print("Di 'autogestión' o 'asistente' para activar el modo de escucha...")
             
             # Actualizar la interfaz
             asistente.cambiar_color("green", "Listo")
             asistente.agregar_log("Sistema de reconocimiento de voz inicializado")
-            asistente.agregar_log(f"Dispositivo: {dispositivos[dispositivo_entrada]['name']}")
+            asistente.agregar_log(f"Dispositivo: {stream.name}")
             asistente.agregar_log(f"Tasa de muestreo: {samplerate} Hz")
             
             # Verificar si el stream de audio está activo
@@ -147,49 +270,62 @@ def worker_audio():
             
             while True:
                 try:
-                    # Obtener datos de audio de la cola
-                    data = audio_queue.get(timeout=TIMEOUT)
+                    # Esperar datos en el buffer circular
+                    if not audio_ring.wait(timeout=TIMEOUT):
+                        raise queue.Empty
                     
-                    # Procesar el audio con Vosk
-                    if rec.AcceptWaveform(data):
-                        result = json.loads(rec.Result())
-                        texto = result.get("text", "").strip()
+                    # Leer sin copiar y liberar el espacio al terminar
+                    vistas = audio_ring.peek(BLOQUE_MUESTRAS)
+                    resultados = []
+                    for vista in vistas:
+                        muestras = np.frombuffer(vista, dtype=np.int16)
                         
-                        if not texto:
+                        if compuerta_voz is not None:
+                            # Solo los segmentos con voz llegan a Vosk
+                            bloque = _preparar_bloque(vista)
+                            resultados.extend(compuerta_voz.feed(bloque))
+                            if compuerta_voz.active:
+                                ultimo_tiempo_actividad = time.time()
+                            audio_ring.consume(muestras.size)
                             continue
-                            
-                        # Mostrar en la interfaz
-                        asistente.agregar_log(f"Reconocido: {texto}")
-                        print(f"\nTexto reconocido: '{texto}'")
-                        print(f"Palabras de activación: {WAKE_WORDS}")
-                        
-                        # Actualizar el último tiempo de actividad
-                        ultimo_tiempo_actividad = time.time()
                         
-                        # Verificar si el texto contiene alguna palabra de activación
-                        if contiene_wakeword(texto):
-                            if not escuchando:
-                                escuchando = True
-                                asistente.cambiar_color("blue", "Escuchando...")
-                                asistente.agregar_log("¡Palabra de activación detectada!")
-                                hablar("¿En qué puedo ayudarte?")
+                        # Todo el audio pasa en orden por el remuestreador y el AGC
+                        # (tienen estado); a Vosk solo llega si supera el umbral de
+                        # volumen, y el silencio se guarda como pre-roll
+                        bloque = _preparar_bloque(vista)
+                        if _volumen(muestras) > UMBRAL_VOLUMEN:
+                            ultimo_tiempo_actividad = time.time()
+                            
+                            # Al empezar la voz, enviar primero el audio previo
+                            if not hay_voz and preroll.size:
+                                _alimentar_reconocedor(preroll, resultados)
+                            preroll = preroll[:0]
+                            hay_voz = True
+                            
+                            # Procesar el audio con Vosk
+                            _alimentar_reconocedor(bloque, resultados)
+                        else:
+                            hay_voz = False
+                            preroll = np.concatenate([preroll, bloque])[-PREROLL_MUESTRAS:]
                         
-                        # Si está en modo escucha, procesar el comando
-                        elif escuchando:
-                            comando = limpiar_comando(texto)
-                            if comando:  # Solo procesar si hay algo después de la palabra de activación
-                                asistente.agregar_log(f"Procesando comando: {comando}")
-                                asistente.cambiar_color("yellow", "Procesando...")
-                                if comando_queue:
-                                    comando_queue.put(comando)
-                            else:
-                                escuchando = False
-                                asistente.cambiar_color("green", "Listo")
-                                asistente.agregar_log("Modo de escucha desactivado")
+                        # La vista deja de usarse: el callback puede reutilizar ese espacio
+                        audio_ring.consume(muestras.size)
+                    
+                    if not resultados:
+                        continue
+                    
+                    for resultado in resultados:
+                        # Si ya se actuó sobre el parcial y el final lo confirma, no repetir
+                        if resultado.get("early_confirmed"):
+                            continue
+                        if resultado.get("early_confirmed") is False:
+                            asistente.agregar_log(f"Corrección del reconocimiento: {resultado['text']}")
+                        _procesar_texto(resultado["text"])
                     
                     # Verificar tiempo de inactividad
                     if escuchando and (time.time() - ultimo_tiempo_actividad > TIEMPO_ESPERA):
                         escuchando = False
+                        _etapa_completa(False)
                         asistente.cambiar_color("green", "Listo")
                         asistente.agregar_log("Tiempo de inactividad excedido")
                     
@@ -197,6 +333,7 @@ def worker_audio():
                     # Verificar tiempo de inactividad
                     if escuchando and (time.time() - ultimo_tiempo_actividad > TIEMPO_ESPERA):
                         escuchando = False
+                        _etapa_completa(False)
                         asistente.cambiar_color("green", "Listo")
                         asistente.agregar_log("Tiempo de inactividad excedido")
                         asistente.detener_animacion()
@@ -215,9 +352,12 @@ def worker_audio():
         raise  # Relanzar la excepción para que sea manejada por run_worker
 
 # Inicializar el worker de audio
-def start_audio_worker(audio_q, modelo_vosk, cmd_queue=None):
-    global audio_queue, rec, comando_queue
+def start_audio_worker(audio_q, modelo_vosk, cmd_queue=None, fuente=None):
+    global audio_queue, audio_ring, rec, comando_queue, fuente_audio
     audio_queue = audio_q
+    fuente_audio = fuente
+    # worker_audio crea el buffer cuando conoce la frecuencia de captura
+    audio_ring = None
     comando_queue = cmd_queue
     
     # Configurar el modelo Vosk
@@ -232,18 +372,24 @@ def start_audio_worker(audio_q, modelo_vosk, cmd_queue=None):
             print("Asegúrate de que el modelo Vosk para español esté descargado y en la carpeta correcta.")
             return
             
-        # Inicializar el reconocedor
-        rec = vosk.KaldiRecognizer(modelo_vosk, 16000)
+        # Inicializar el reconocedor: en reposo solo la gramática de activación
+        if DOS_ETAPAS_WAKE:
+            rec = WakeWordSpotter(modelo_vosk, FRECUENCIA_VOSK, WAKE_WORDS, timeout=TIEMPO_ESPERA)
+        else:
+            rec = vosk.KaldiRecognizer(modelo_vosk, FRECUENCIA_VOSK)
         rec.SetWords(True)
         print("Modelo de reconocimiento de voz inicializado correctamente.")
         
-        # Listar dispositivos de audio disponibles
-        print("\nDispositivos de audio disponibles:")
-        print(sd.query_devices())
-        
-        # Configurar el dispositivo de audio predeterminado
-        dispositivo_entrada = sd.default.device[0]  # Usar el dispositivo predeterminado
-        print(f"\nUsando dispositivo de audio (entrada): {sd.query_devices(dispositivo_entrada)['name']}")
+        if fuente is None:
+            # Listar dispositivos de audio disponibles
+            print("\nDispositivos de audio disponibles:")
+            print(sd.query_devices())
+            
+            # Configurar el dispositivo de audio predeterminado
+            dispositivo_entrada = sd.default.device[0]  # Usar el dispositivo predeterminado
+            print(f"\nUsando dispositivo de audio (entrada): {sd.query_devices(dispositivo_entrada)['name']}")
+        else:
+            print(f"\nUsando fuente de audio: {fuente.name}")
         
         def run_worker():
             while True:
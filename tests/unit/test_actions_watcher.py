@@ -0,0 +1,91 @@
+"""
+Pruebas unitarias para el módulo core/actions_watcher.py
+"""
+import itertools
+import json
+import os
+
+import pytest
+
+from core.actions_watcher import ActionsWatcher
+from core.command_registry import CommandRegistry
+
+
+_SEGUNDOS = itertools.count(1)
+
+
+def escribir(ruta, contenido):
+    """Escribe el archivo y adelanta su fecha para que el cambio sea visible."""
+    ruta.write_text(contenido if isinstance(contenido, str) else json.dumps(contenido),
+                    encoding="utf-8")
+    instante = next(_SEGUNDOS) * 10**9
+    os.utime(ruta, ns=(instante, instante))
+
+
+@pytest.fixture
+def entorno(tmp_path):
+    ruta = tmp_path / "comandos.json"
+    escribir(ruta, {"saluda": "¡Hola!"})
+    registro = CommandRegistry()
+    registro.register("integrado", lambda: "integrado", phrases=["qué hora es"])
+    registro.register_actions({"saluda": "¡Hola!"}, lambda frase, accion: accion)
+    vigilante = ActionsWatcher(ruta, registro, lambda frase, accion: accion)
+    return ruta, registro, vigilante
+
+
+class TestActionsWatcher:
+    """Pruebas para la clase ActionsWatcher."""
+
+    def test_sin_cambios_no_recarga(self, entorno):
+        _, _, vigilante = entorno
+        assert not vigilante.check()
+        assert vigilante.reloads == 0
+
+    def test_recarga_al_cambiar(self, entorno):
+        """Los comandos nuevos sustituyen a los anteriores del mismo origen."""
+        ruta, registro, vigilante = entorno
+        escribir(ruta, {"despídete": "¡Adiós!", "qué hora es": "Son las 17:00"})
+
+        assert vigilante.check()
+        assert registro.dispatch("despídete")[1] == "¡Adiós!"
+        assert registro.resolve("saluda") is None
+        # Los comandos de otros orígenes se conservan y mantienen la prioridad
+        assert registro.dispatch("qué hora es")[1] == "integrado"
+        assert vigilante.stats()['reloads'] == 1
+
+    @pytest.mark.parametrize("contenido", ['{"saluda": ', '["saluda"]'])
+    def test_archivo_invalido_conserva_la_version_buena(self, entorno, contenido):
+        ruta, registro, vigilante = entorno
+        escribir(ruta, contenido)
+
+        assert not vigilante.check()
+        assert registro.dispatch("saluda")[1] == "¡Hola!"
+        assert vigilante.rejected == 1
+        assert vigilante.last_error
+
+        # No se reintenta hasta el siguiente cambio
+        assert not vigilante.check()
+        escribir(ruta, {"saluda": "¡Buenas!"})
+        assert vigilante.check()
+        assert registro.dispatch("saluda")[1] == "¡Buenas!"
+        assert vigilante.last_error is None
+
+    def test_archivo_borrado(self, entorno):
+        ruta, registro, vigilante = entorno
+        ruta.unlink()
+        assert not vigilante.check()
+        assert registro.resolve("saluda") is not None
+
+    def test_hilo_en_segundo_plano(self, entorno):
+        ruta, registro, vigilante = entorno
+        vigilante.interval = 0.01
+        vigilante.start()
+        try:
+            escribir(ruta, {"despídete": "¡Adiós!"})
+            for _ in range(200):
+                if vigilante.reloads:
+                    break
+                vigilante._stop.wait(0.01)
+        finally:
+            vigilante.stop()
+        assert registro.resolve("despídete") is not None
@@ -0,0 +1,250 @@
+"""
+Pruebas unitarias para el módulo core/audio_processor.py
+"""
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+# sounddevice necesita PortAudio; en entornos sin tarjeta de sonido se simula
+try:
+    import sounddevice  # noqa: F401
+except (ImportError, OSError):
+    sys.modules['sounddevice'] = MagicMock()
+
+from core.audio_processor import (AudioConfig, AudioProcessor, AutomaticGainControl,
+                                  PolyphaseResampler)
+
+
+def _tono(frecuencia=1000, duracion=0.5, sample_rate=16000, amplitud=0.5):
+    """Genera un tono senoidal float32 de prueba."""
+    t = np.arange(int(duracion * sample_rate)) / sample_rate
+    return (amplitud * np.sin(2 * np.pi * frecuencia * t)).astype(np.float32)
+
+
+class TestStreamingFilter:
+    """Pruebas para el modo de filtrado en streaming."""
+
+    @pytest.fixture
+    def processor(self):
+        """Procesador en modo streaming sin etapas adicionales."""
+        config = AudioConfig(streaming_filter=True, noise_reduction=False, auto_gain=False)
+        return AudioProcessor(config)
+
+    def test_chunks_equivalen_a_una_sola_pasada(self, processor):
+        """Filtrar por chunks debe dar el mismo resultado que filtrar todo de una vez."""
+        audio = _tono()
+        completo = processor._filter_stream(audio.copy())
+
+        processor.reset_stream()
+        partes = [processor._filter_stream(chunk) for chunk in np.array_split(audio, 8)]
+
+        np.testing.assert_allclose(np.concatenate(partes), completo, atol=1e-5)
+
+    def test_float32_de_principio_a_fin(self, processor):
+        """El modo streaming no debe cambiar el tipo del audio."""
+        with patch.object(processor, '_is_speech', return_value=True):
+            resultado = processor.process_chunk(_tono(duracion=0.064))
+
+        assert resultado.dtype == np.float32
+
+    def test_int16_se_escala_una_vez(self):
+        """La entrada int16 se normaliza a [-1.0, 1.0]."""
+        audio = np.array([0, 16384, -32768], dtype=np.int16)
+        convertido = AudioProcessor._to_float32(audio)
+
+        assert convertido.dtype == np.float32
+        np.testing.assert_allclose(convertido, [0.0, 0.5, -1.0])
+
+    def test_estadisticas_de_filtrado(self, processor):
+        """Cada chunk filtrado actualiza las estadísticas de coste."""
+        with patch.object(processor, '_is_speech', return_value=False):
+            for _ in range(3):
+                processor.process_chunk(_tono(duracion=0.064))
+
+        assert processor.filter_stats['chunks'] == 3
+        assert processor.average_filter_time >= 0.0
+
+
+class TestProcessBatch:
+    """Pruebas para el procesamiento por lotes."""
+
+    def test_equivale_a_procesar_chunk_a_chunk(self):
+        """El lote debe producir lo mismo que llamadas sucesivas a process_chunk."""
+        frames = (_tono(duracion=0.512) * 32767).astype(np.int16).reshape(-1, 1024)
+
+        individual = AudioProcessor(AudioConfig(vad_onset_frames=1))
+        lote = AudioProcessor(AudioConfig(vad_onset_frames=1))
+        for processor in (individual, lote):
+            processor.frame_vad.vad = MagicMock()
+            processor.frame_vad.vad.is_speech.return_value = True
+
+        esperado = np.stack([individual.process_chunk(frame) for frame in frames])
+        procesado, voz = lote.process_batch(frames)
+
+        assert voz.all()
+        np.testing.assert_allclose(procesado, esperado, atol=2)
+
+    def test_buffer_1d_se_divide_en_frames(self):
+        """Un buffer 1-D se trocea en frames de chunk_size rellenando el último."""
+        processor = AudioProcessor(AudioConfig(streaming_filter=True))
+        processor.frame_vad.vad = MagicMock()
+        processor.frame_vad.vad.is_speech.return_value = False
+        procesado, voz = processor.process_batch(_tono(duracion=0.2))
+
+        assert procesado.shape == (4, 1024)
+        assert procesado.dtype == np.float32
+        assert voz.shape == (4,)
+        assert not voz.any()
+
+    def test_silencio_no_llega_al_vad(self):
+        """Los frames por debajo del umbral de silencio no se consultan al VAD."""
+        processor = AudioProcessor(AudioConfig(auto_gain=False, noise_reduction=False))
+        processor.frame_vad.vad = MagicMock()
+        _, voz = processor.process_batch(np.zeros((5, 1024), dtype=np.int16))
+        mock_vad = processor.frame_vad.vad.is_speech
+
+        mock_vad.assert_not_called()
+        assert not voz.any()
+
+
+class TestSpectralNoiseReduction:
+    """Pruebas de la integración del supresor espectral."""
+
+    def test_usa_el_supresor_si_esta_activado(self):
+        """Con spectral_noise_reduction la reducción de ruido delega en el supresor."""
+        processor = AudioProcessor(AudioConfig(streaming_filter=True, spectral_noise_reduction=True))
+
+        assert processor.noise_suppressor is not None
+        with patch.object(processor.noise_suppressor, 'process',
+                          side_effect=lambda audio, is_speech=None: audio) as mock_process:
+            processor._reduce_noise(_tono(duracion=0.064))
+
+        mock_process.assert_called_once()
+
+    def test_ruido_congelado_durante_la_voz(self):
+        """Mientras el VAD detecta voz el perfil de ruido no se actualiza."""
+        processor = AudioProcessor(AudioConfig(streaming_filter=True, spectral_noise_reduction=True))
+        ruido = np.random.default_rng(0).normal(0, 0.01, 16000).astype(np.float32)
+        processor._reduce_noise(ruido[:8000])
+        perfil = processor.noise_suppressor.noise_psd.copy()
+
+        processor.frame_vad.in_speech = True
+        processor._reduce_noise(ruido[8000:] * 0.5)
+        np.testing.assert_array_equal(processor.noise_suppressor.noise_psd, perfil)
+
+        processor.frame_vad.in_speech = False
+        processor._reduce_noise(ruido[8000:] * 0.5)
+        assert not np.array_equal(processor.noise_suppressor.noise_psd, perfil)
+
+    def test_desactivado_por_defecto(self):
+        """Sin la opción se mantiene la reducción temporal clásica."""
+        assert AudioProcessor(AudioConfig()).noise_suppressor is None
+
+
+class TestFrameAlignedVAD:
+    """Pruebas de la integración del VAD alineado a frames."""
+
+    def test_chunk_de_1024_muestras_llega_al_vad(self):
+        """Un chunk de 1024 muestras se reencuadra en frames de 30 ms válidos."""
+        processor = AudioProcessor(AudioConfig(vad_onset_frames=1))
+        processor.frame_vad.vad = MagicMock()
+        processor.frame_vad.vad.is_speech.return_value = True
+
+        assert processor._is_speech(np.full(1024, 1000, dtype=np.int16))
+        frame = processor.frame_vad.vad.is_speech.call_args[0][0]
+        assert len(frame) == 480 * 2
+        assert [event.kind for event in processor.vad_events] == ["start"]
+
+
+class TestPolyphaseResampler:
+    """Pruebas para el remuestreador polifásico."""
+
+    @pytest.mark.parametrize("frecuencia", [8000, 44100, 48000])
+    def test_por_bloques_igual_que_de_una_vez(self, frecuencia):
+        """El estado entre bloques hace que trocear la entrada no cambie la salida."""
+        audio = _tono(duracion=0.5, sample_rate=frecuencia)
+        completo = PolyphaseResampler(frecuencia).process(audio)
+
+        resampler = PolyphaseResampler(frecuencia)
+        partes = np.concatenate([resampler.process(c) for c in np.array_split(audio, 7)])
+
+        assert completo.size == 8000
+        np.testing.assert_allclose(partes, completo, atol=1e-6)
+
+    def test_reproduce_el_tono(self):
+        """Un tono de 440 Hz a 44.1 kHz sale igual a 16 kHz, con el retardo del filtro."""
+        resampler = PolyphaseResampler(44100)
+        salida = resampler.process(_tono(frecuencia=440, duracion=0.5, sample_rate=44100))
+
+        t = np.arange(salida.size) / 16000 - resampler.latency
+        esperado = 0.5 * np.sin(2 * np.pi * 440 * t)
+        np.testing.assert_allclose(salida[800:], esperado[800:], atol=1e-3)
+
+    def test_int16_y_estadisticas(self):
+        """La salida conserva int16 y cada bloque queda medido."""
+        resampler = PolyphaseResampler(48000)
+        salida = resampler.process(np.zeros(4800, dtype=np.int16))
+
+        assert salida.dtype == np.int16
+        assert salida.size == 1600
+        assert resampler.stats['blocks'] == 1
+
+    def test_integrado_en_el_procesador(self):
+        """Con input_sample_rate el procesador remuestrea antes de filtrar."""
+        processor = AudioProcessor(AudioConfig(input_sample_rate=48000, streaming_filter=True))
+        processor.frame_vad.vad = MagicMock()
+        processor.frame_vad.vad.is_speech.return_value = False
+
+        procesado, _ = processor.process_batch(_tono(duracion=0.192, sample_rate=48000))
+
+        assert procesado.shape == (3, 1024)
+
+
+class TestAutomaticGainControl:
+    """Pruebas para el control automático de ganancia."""
+
+    def test_converge_al_nivel_objetivo(self):
+        """Un tono estable termina con el pico en el nivel objetivo."""
+        agc = AutomaticGainControl(target_level=0.3)
+        for _ in range(20):
+            salida = agc.process(_tono(amplitud=0.05, duracion=0.064))
+
+        assert np.max(np.abs(salida)) == pytest.approx(0.3, rel=0.05)
+        assert agc.gain == pytest.approx(6.0, rel=0.05)
+
+    def test_sin_bombeo_entre_chunks(self):
+        """La ganancia cambia poco de un chunk al siguiente con nivel estable."""
+        agc = AutomaticGainControl()
+        ganancias = []
+        for _ in range(30):
+            agc.process(_tono(amplitud=0.2, duracion=0.064))
+            ganancias.append(agc.gain)
+
+        assert np.ptp(ganancias[10:]) < 0.01
+
+    def test_limitador(self):
+        """Un golpe repentino no supera el techo del limitador."""
+        agc = AutomaticGainControl(target_level=0.3, limit=0.9)
+        for _ in range(10):
+            agc.process(_tono(amplitud=0.02, duracion=0.064))
+
+        salida = agc.process(_tono(amplitud=0.8, duracion=0.064))
+
+        assert np.max(np.abs(salida)) <= 0.9
+
+    def test_no_amplifica_el_silencio(self):
+        """Por debajo del umbral de ruido la ganancia se mantiene."""
+        agc = AutomaticGainControl(noise_floor=0.01)
+        agc.process(np.full(1024, 0.001, dtype=np.float32))
+
+        assert agc.gain == 1.0
+
+    def test_int16(self):
+        """Con int16 la salida conserva el tipo y la escala."""
+        agc = AutomaticGainControl(target_level=0.5)
+        salida = agc.process((_tono(amplitud=0.5, duracion=0.064) * 32767).astype(np.int16))
+
+        assert salida.dtype == np.int16
+        assert agc.gain_db == pytest.approx(0.0, abs=0.5)
@@ -0,0 +1,98 @@
+"""
+Pruebas unitarias para el módulo core/audio_source.py
+"""
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from core.audio_source import AudioSource, ReplaySource
+from core.ring_buffer import AudioRingBuffer
+
+
+class TestReplaySource:
+    """Pruebas para la clase ReplaySource."""
+
+    def _recolector(self):
+        """Callback que guarda los bloques recibidos."""
+        bloques = []
+
+        def callback(indata, frames, time_info, status):
+            bloques.append(np.frombuffer(indata, dtype=np.int16).copy())
+
+        return bloques, callback
+
+    def test_entrega_todo_el_audio_en_orden(self):
+        """Sin ritmo real se entregan todos los bloques, el último incompleto."""
+        audio = np.arange(2500, dtype=np.int16)
+        fuente = ReplaySource(audio, blocksize=1000, realtime=False)
+        bloques, callback = self._recolector()
+
+        with fuente.open(callback):
+            assert fuente.wait(timeout=2)
+
+        assert [b.size for b in bloques] == [1000, 1000, 500]
+        np.testing.assert_array_equal(np.concatenate(bloques), audio)
+        assert fuente.blocks_sent == 3
+
+    def test_ritmo_real(self):
+        """En tiempo real la reproducción dura lo que dura el audio."""
+        fuente = ReplaySource(np.zeros(1600, dtype=np.int16), blocksize=400, realtime=True)
+        _, callback = self._recolector()
+
+        inicio = time.perf_counter()
+        with fuente.open(callback):
+            assert fuente.wait(timeout=2)
+
+        assert time.perf_counter() - inicio >= 0.09
+
+    def test_desde_wav(self, tmp_path):
+        """Un WAV estéreo se mezcla a mono y conserva su frecuencia."""
+        ruta = tmp_path / "prueba.wav"
+        with wave.open(str(ruta), "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(48000)
+            wav.writeframes(np.full(200, 100, dtype=np.int16).tobytes())
+
+        fuente = ReplaySource.from_wav(ruta, realtime=False)
+
+        assert fuente.samplerate == 48000
+        assert fuente.name == "prueba.wav"
+        np.testing.assert_array_equal(fuente.audio, np.full(100, 100))
+
+    def test_requiere_callback(self):
+        """Iniciar sin callback es un error."""
+        with pytest.raises(RuntimeError):
+            with ReplaySource(np.zeros(10, dtype=np.int16)):
+                pass
+
+    def test_contrapresion_sin_tiempo_real(self):
+        """Sin ritmo real la fuente espera al consumidor en lugar de perder bloques."""
+        audio = np.arange(20000, dtype=np.int16)
+        fuente = ReplaySource(audio, blocksize=1000, realtime=False)
+        ring = AudioRingBuffer(2500)
+        recibido = []
+
+        def callback(indata, frames, time_info, status):
+            assert ring.wait_free(frames, timeout=2)
+            ring.write(indata)
+
+        with fuente.open(callback):
+            while not (fuente.finished.is_set() and ring.available == 0):
+                if ring.wait(timeout=0.05):
+                    time.sleep(0.001)
+                    bloque = np.concatenate([np.frombuffer(v, dtype=np.int16) for v in ring.peek()])
+                    recibido.append(bloque)
+                    ring.consume(bloque.size)
+
+        assert ring.overruns == 0
+        np.testing.assert_array_equal(np.concatenate(recibido), audio)
+
+    def test_base_abstracta(self):
+        """Una fuente debe implementar start y stop."""
+        assert ReplaySource.realtime and not ReplaySource(np.zeros(10, dtype=np.int16),
+                                                          realtime=False).realtime
+        with pytest.raises(TypeError):
+            AudioSource()
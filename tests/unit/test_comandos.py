@@ -0,0 +1,32 @@
+"""
+Pruebas unitarias para el módulo comandos.py
+"""
+import pytest
+
+import comandos
+from core.partial_results import PartialResultTracker
+
+
+class TestConfianzaTemprana:
+    """Decisiones tempranas sobre parciales con el registro real."""
+
+    @pytest.mark.parametrize("parciales, final", [
+        (["para", "para", "para mañana"], "para mañana pon una alarma"),
+        (["cierra el programa", "cierra el programa", "cierra el programa de"],
+         "cierra el programa de música"),
+    ])
+    def test_control_y_destructivos_esperan_al_final(self, parciales, final):
+        """Ni "para" ni "cierra el programa" se ejecutan antes de oír la frase entera."""
+        tracker = PartialResultTracker(comandos.confianza_temprana, stable_partials=2)
+
+        assert all(tracker.update(parcial) is None for parcial in parciales)
+        assert tracker.finalize(final) is None
+        assert tracker.early_commits == 0
+
+    def test_frase_exacta_y_completa(self):
+        """Solo una frase exacta no destructiva que ningún disparador alarga confirma."""
+        assert comandos.confianza_temprana("ayuda") == 1.0
+        assert comandos.confianza_temprana("para") == 0.0
+        assert comandos.confianza_temprana("apagar") == 0.0
+        assert comandos.confianza_temprana("cierra el programa") == 0.0
+        assert comandos.confianza_temprana("dime la hora por favor") == 0.0
@@ -0,0 +1,139 @@
+"""
+Pruebas unitarias para el módulo core/command_executor.py
+"""
+import threading
+
+import pytest
+
+from core.command_executor import CancelToken, CommandCancelled, CommandExecutor, current_token
+
+
+@pytest.fixture
+def ejecutor():
+    ejecutor = CommandExecutor(max_workers=2, max_pending=3, default_timeout=None)
+    yield ejecutor
+    ejecutor.shutdown()
+
+
+def esperar_cancelacion(inicio: threading.Event):
+    """Manejador lento que sale en cuanto se cancela su comando."""
+    inicio.set()
+    testigo = current_token()
+    while not testigo.wait(0.01):
+        pass
+    return "no debería llegar"
+
+
+class TestCommandExecutor:
+    """Pruebas para la clase CommandExecutor."""
+
+    def test_ejecuta_y_devuelve(self, ejecutor):
+        tarea = ejecutor.submit(lambda a, b: a + b, 2, 3, name="suma")
+        assert tarea.future.result(timeout=1) == 5
+        assert tarea.name == "suma"
+        assert tarea.wait_time >= 0
+        assert ejecutor.stats()['completed'] == 1
+
+    def test_cancelar_todo(self, ejecutor):
+        """Cancelar avisa a los comandos en curso y descarta los de la cola."""
+        inicios = [threading.Event(), threading.Event()]
+        lentas = []
+        for inicio in inicios:
+            lentas.append(ejecutor.submit(esperar_cancelacion, inicio))
+            assert inicio.wait(1)
+        en_cola = ejecutor.submit(lambda: "tarde")
+        assert ejecutor.queue_depth == 1
+
+        assert ejecutor.cancel_all() == 3
+        for tarea in lentas + [en_cola]:
+            with pytest.raises(CommandCancelled):
+                tarea.future.result(timeout=1)
+        stats = ejecutor.stats()
+        assert stats['cancelled'] == 3
+        assert stats['queue_depth'] == 0
+        assert stats['max_queue_depth'] == 1
+
+    def test_tiempo_agotado(self):
+        agotadas = []
+        avisado = threading.Event()
+        ejecutor = CommandExecutor(max_workers=1, default_timeout=0.05,
+                                   on_timeout=lambda tarea: (agotadas.append(tarea), avisado.set()))
+        try:
+            tarea = ejecutor.submit(esperar_cancelacion, threading.Event(), name="lento")
+            with pytest.raises(CommandCancelled, match="tiempo agotado"):
+                tarea.future.result(timeout=1)
+            assert avisado.wait(1)
+            assert agotadas == [tarea]
+            assert ejecutor.stats()['timed_out'] == 1
+        finally:
+            ejecutor.shutdown()
+
+    def test_carril_en_serie(self, ejecutor):
+        """Los comandos en serie no se solapan y terminan en orden de llegada."""
+        en_curso = []
+        orden = []
+        solapados = []
+
+        def teclear(n):
+            en_curso.append(n)
+            solapados.append(len(en_curso) > 1)
+            threading.Event().wait(0.02)
+            orden.append(n)
+            en_curso.remove(n)
+
+        tareas = [ejecutor.submit(teclear, n, serial=True) for n in range(3)]
+        for tarea in tareas:
+            tarea.future.result(timeout=1)
+        assert orden == [0, 1, 2]
+        assert not any(solapados)
+
+    def test_zombis_ocupan_plaza(self):
+        """Un comando sin tiempo cuyo manejador no vuelve sigue contando hasta terminar."""
+        libera = threading.Event()
+        avisado = threading.Event()
+        ejecutor = CommandExecutor(max_workers=1, max_pending=1, default_timeout=0.05,
+                                   on_timeout=lambda tarea: avisado.set())
+        try:
+            tarea = ejecutor.submit(libera.wait, 1)
+            assert avisado.wait(1)
+            stats = ejecutor.stats()
+            assert stats['zombies'] == 1 and stats['running'] == 1
+            assert ejecutor.submit(lambda: None) is None
+
+            libera.set()
+            with pytest.raises(CommandCancelled):
+                tarea.future.result(timeout=1)
+            assert ejecutor.stats()['zombies'] == 0
+        finally:
+            ejecutor.shutdown()
+
+    def test_cola_acotada(self, ejecutor):
+        """Con max_pending comandos sin terminar se rechazan los nuevos."""
+        inicio = threading.Event()
+        tareas = [ejecutor.submit(esperar_cancelacion, inicio) for _ in range(3)]
+        assert ejecutor.submit(lambda: None) is None
+        assert ejecutor.stats()['rejected'] == 1
+        ejecutor.cancel_all()
+        for tarea in tareas:
+            with pytest.raises(CommandCancelled):
+                tarea.future.result(timeout=1)
+
+    def test_errores(self, ejecutor):
+        def falla():
+            raise RuntimeError("roto")
+
+        tarea = ejecutor.submit(falla)
+        with pytest.raises(RuntimeError):
+            tarea.future.result(timeout=1)
+        assert ejecutor.stats()['failed'] == 1
+
+    def test_testigo_fuera_del_ejecutor(self):
+        """Fuera de un comando el testigo nunca está cancelado."""
+        assert not current_token().cancelled
+
+        testigo = CancelToken()
+        testigo.cancel("motivo")
+        testigo.cancel("otro")
+        assert testigo.reason == "motivo"
+        with pytest.raises(CommandCancelled):
+            testigo.raise_if_cancelled()
@@ -0,0 +1,101 @@
+"""
+Pruebas unitarias para el módulo core/command_queue.py
+"""
+import queue
+import threading
+
+import pytest
+
+from core.command_queue import CommandQueue, Priority, PriorityClassifier
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.fixture
+def clasificador():
+    return PriorityClassifier(control=["para", "cancela", "salir"], background=["openai", "busca archivo"])
+
+
+class TestPriorityClassifier:
+    """Pruebas para la clase PriorityClassifier."""
+
+    @pytest.mark.parametrize("texto, prioridad", [
+        ("Para", Priority.CONTROL),
+        ("¡Cancela!", Priority.CONTROL),
+        ("salir", Priority.CONTROL),
+        (None, Priority.CONTROL),
+        ("pregunta a OpenAI el tiempo", Priority.BACKGROUND),
+        ("busca archivo informe", Priority.BACKGROUND),
+        ("abre google", Priority.INTERACTIVE),
+        # Solo la frase exacta es de control: empezar por ella no basta
+        ("para mañana pon una alarma a las siete", Priority.INTERACTIVE),
+        ("para qué sirve esto", Priority.INTERACTIVE),
+        ("para mañana", Priority.INTERACTIVE),
+        ("salir a cenar", Priority.INTERACTIVE),
+        ("para la música", Priority.INTERACTIVE),
+        ("cancela la búsqueda", Priority.INTERACTIVE),
+        ("paraguas", Priority.INTERACTIVE),
+    ])
+    def test_clases(self, clasificador, texto, prioridad):
+        assert clasificador(texto) is prioridad
+
+
+class TestCommandQueue:
+    """Pruebas para la clase CommandQueue."""
+
+    def test_control_se_adelanta(self, clasificador):
+        cola = CommandQueue(clasificador)
+        for texto in ["openai resume esto", "abre google", "qué hora es", "para"]:
+            cola.put(texto)
+
+        assert cola.depths() == {'control': 1, 'interactive': 2, 'background': 1}
+        orden = [cola.get_nowait() for _ in range(4)]
+        # Dentro de cada clase se mantiene el orden de llegada
+        assert orden == ["para", "abre google", "qué hora es", "openai resume esto"]
+        with pytest.raises(queue.Empty):
+            cola.get_nowait()
+
+    def test_interrupcion_al_encolar(self, clasificador):
+        """Los oyentes se avisan en el hilo que encola, antes de sacar el comando."""
+        avisos = []
+        cola = CommandQueue(clasificador)
+        cola.add_preempt_listener(avisos.append)
+        cola.put("abre google")
+        cola.put("cancela")
+        cola.put(None)
+
+        assert avisos == ["cancela"]
+        assert cola.stats()['preemptions'] == 1
+
+    def test_latencias_por_clase(self, clasificador):
+        reloj = RelojFalso()
+        cola = CommandQueue(clasificador, clock=reloj)
+        cola.put("abre google")
+        cola.put("openai hola")
+        reloj.ahora = 2.0
+        cola.put("para")
+        reloj.ahora = 3.0
+
+        control = cola.get_entry()
+        assert control.priority is Priority.CONTROL and control.wait == 1.0
+        interactivo = cola.get_entry()
+        assert interactivo.wait == 3.0
+        reloj.ahora = 5.0
+        cola.observe(interactivo)
+
+        stats = cola.stats()
+        assert stats['control']['wait']['avg'] == 1.0
+        assert stats['interactive']['total']['max'] == 5.0
+        assert stats['background']['queued'] == 1
+        assert stats['background']['wait']['count'] == 0
+
+    def test_get_bloqueante(self, clasificador):
+        cola = CommandQueue(clasificador)
+        threading.Timer(0.05, cola.put, args=("abre google",)).start()
+        assert cola.get(timeout=1) == "abre google"
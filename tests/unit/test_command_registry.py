@@ -0,0 +1,235 @@
+"""
+Pruebas unitarias para el módulo core/command_registry.py
+"""
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from core.command_registry import CommandRegistry, load_actions
+from core.plugin_manager import PluginManager
+
+
+class GestorFalso:
+    """Sustituto mínimo de PluginManager."""
+
+    def __init__(self):
+        self.commands = {
+            'hora': {'plugin': 'system', 'function': None, 'description': 'Dice la hora',
+                     'examples': ['¿Qué hora es?']},
+            'estado': {'plugin': 'otro', 'function': None, 'description': '', 'examples': []},
+        }
+        self.llamadas = []
+
+    def handle_command(self, command, *args):
+        self.llamadas.append((command, args))
+        return f"plugin:{command}"
+
+
+@pytest.fixture
+def registro():
+    registro = CommandRegistry()
+    registro.register("abre google", lambda: "google")
+    registro.register("buscar", lambda resto: f"busca:{resto}", prefixes=["busca", "busca en internet"])
+    registro.register("salir", lambda texto: "salir", keywords=["salir", "cierra"])
+    registro.register("hora", lambda texto: "hora", keywords=["hora"])
+    registro.register("listar", lambda texto: "listar", keywords=["listar archivos"])
+    registro.register("archivos", lambda texto: "archivos", keywords=["archivos"])
+    return registro
+
+
+class TestCommandRegistry:
+    """Pruebas para la clase CommandRegistry."""
+
+    def test_etapas(self, registro):
+        """Cada tipo de disparador se resuelve por su etapa."""
+        assert registro.resolve("Abre Google").method == "exact"
+        assert registro.resolve("abre guguel").method == "phonetic"
+        assert registro.resolve("abre gogle").command.name == "abre google"
+        assert registro.resolve("dime la hora").method == "keyword"
+        assert registro.resolve("pon música") is None
+
+    def test_prefijo_extrae_argumento(self, registro):
+        """El prefijo más largo gana y el resto del texto es el argumento."""
+        coincidencia = registro.resolve("Busca en internet recetas de Cádiz")
+
+        assert coincidencia.trigger == "busca en internet"
+        assert coincidencia.args == ("recetas de cádiz",)
+        assert coincidencia.execute() == "busca:recetas de cádiz"
+
+    def test_prioridad_de_palabras_clave(self, registro):
+        """Entre palabras clave presentes gana la registrada antes, como en la antigua cadena."""
+        assert registro.dispatch("cierra y dime la hora")[1] == "salir"
+        assert registro.dispatch("qué hora es, cierra")[1] == "salir"
+        # La palabra clave más larga consume a la que contiene
+        assert registro.dispatch("listar archivos en c")[1] == "listar"
+        assert registro.dispatch("muestra los archivos")[1] == "archivos"
+
+    def test_palabras_completas(self, registro):
+        """Las palabras clave no coinciden dentro de otras palabras."""
+        assert registro.resolve("ahora no") is None
+
+    def test_acciones_y_plugins(self):
+        """Los comandos de comandos.json y de los plugins comparten el registro."""
+        registro = CommandRegistry()
+        ejecutadas = []
+        registro.register_actions({"saluda": "¡Hola!"}, lambda frase, accion: ejecutadas.append((frase, accion)))
+        gestor = GestorFalso()
+        assert registro.register_plugins(gestor, plugin="system") == 1
+
+        registro.dispatch("saluda")
+        assert ejecutadas == [("saluda", "¡Hola!")]
+        coincidencia, resultado = registro.dispatch("hora")
+        assert resultado == "plugin:hora"
+        assert coincidencia.command.source == "plugin:system"
+        assert coincidencia.command.examples == ['¿Qué hora es?']
+        assert "estado" not in registro
+
+    def test_cambios_invalidan_el_despacho(self, registro):
+        """Registrar y quitar comandos se refleja en la siguiente resolución."""
+        version = registro.version
+        registro.resolve("abre google")
+        assert registro.unregister("abre google")
+        assert registro.resolve("abre google") is None
+        assert not registro.unregister("abre google")
+
+        registro.register_actions({"abre github": "https://github.com"}, lambda f, a: a)
+        assert registro.resolve("abre github").command.source == "json"
+        assert registro.unregister_source("json") == 1
+        assert registro.resolve("abre github") is None
+        assert registro.version > version
+
+    def test_frase_repetida_gana_la_primera(self):
+        """Si dos comandos declaran la misma frase se usa el registrado antes."""
+        registro = CommandRegistry()
+        registro.register("integrado", lambda: 1, phrases=["qué hora es"])
+        registro.register_actions({"qué hora es": "Son las 17:00"}, lambda f, a: 2)
+        assert registro.dispatch("que hora es")[1] == 1
+
+        # Tampoco se sustituye un comando de otro origen con el mismo nombre
+        registro.register("saluda", lambda: 1)
+        assert registro.register_actions({"saluda": "¡Hola!"}, lambda f, a: 2) == 0
+        assert registro.dispatch("saluda")[1] == 1
+
+    def test_sustitucion_atomica(self, registro):
+        """replace_actions publica los comandos nuevos con su despacho ya compilado."""
+        registro.register_actions({"saluda": "¡Hola!"}, lambda f, a: a)
+        registro.resolve("saluda")
+        version = registro.version
+
+        assert registro.replace_actions({"despídete": "¡Adiós!"}, lambda f, a: a) == 1
+        assert registro._dispatch is not None
+        assert registro.version == version + 1
+        assert registro.resolve("saluda") is None
+        assert registro.dispatch("despidete")[1] == "¡Adiós!"
+        # Los comandos de otros orígenes no cambian
+        assert registro.resolve("abre google").command.name == "abre google"
+
+    def test_intencion_por_ejemplos(self, registro):
+        """Los ejemplos de los comandos resuelven peticiones en lenguaje natural."""
+        registro.register("volumen", lambda: "volumen", phrases=["sube volumen"],
+                          examples=["Sube el volumen", "Pon la música más alta"])
+        coincidencia = registro.resolve("pon la música un poco más alta")
+
+        assert coincidencia.method == "intent"
+        assert coincidencia.command.name == "volumen"
+        assert registro.unregister("volumen")
+        assert registro.resolve("pon la música un poco más alta") is None
+
+    @pytest.mark.parametrize("texto", ["abre el programa", "cierra el programa de música",
+                                       "cierra los programas", "¿qué programa es?"])
+    def test_apagar_no_se_resuelve_por_parecido(self, texto):
+        """Con el plugin de sistema real, nada que no sea literal apaga el asistente."""
+        gestor = PluginManager(Path(__file__).resolve().parents[2] / "plugins")
+        assert gestor.load_plugin("system_plugin")
+        registro = CommandRegistry()
+        registro.track_plugins(gestor)
+
+        coincidencia = registro.resolve(texto)
+        assert coincidencia is None or coincidencia.command.name != "apagar"
+        assert registro.resolve("Cierra el programa").method == "exact"
+        assert registro.resolve("apágate").command.name == "apagar"
+
+    def test_extensible(self, registro):
+        """Un texto es extensible si otro disparador empieza por él y sigue."""
+        assert registro.extensible("Busca")
+        assert registro.extensible("abre")
+        assert not registro.extensible("abre google")
+        assert not registro.extensible("abre goo")
+        assert not registro.extensible("")
+
+    def test_sigue_los_plugins(self, tmp_path):
+        """Cargar y descargar un plugin añade y quita sus comandos y ejemplos."""
+        (tmp_path / "musica.py").write_text(textwrap.dedent("""
+            from core.plugin_manager import Plugin
+
+            class Musica(Plugin):
+                def __init__(self):
+                    super().__init__("musica")
+
+                def get_commands(self):
+                    return {"reproducir": {"function": lambda: "sonando",
+                                           "examples": ["Pon música", "Reproduce una canción"]}}
+        """), encoding="utf-8")
+        gestor = PluginManager(tmp_path)
+        registro = CommandRegistry()
+        assert registro.track_plugins(gestor) == 0
+
+        assert gestor.load_plugin("musica")
+        coincidencia, resultado = registro.dispatch("reproduce alguna canción")
+        assert resultado == "sonando"
+        assert coincidencia.command.source == "plugin:musica"
+
+        assert gestor.unload_plugin("musica")
+        assert registro.resolve("reproduce alguna canción") is None
+        assert registro.stats()['examples'] == 0
+
+    def test_memoria_de_textos_resueltos(self, registro):
+        """Un texto repetido no vuelve a pasar por las etapas hasta que cambian los comandos."""
+        primera = registro.resolve("Dime  la HORA")
+        assert registro.resolve("dime la hora") is primera
+        assert registro.resolve("pon música") is None
+        assert registro.resolve("pon música") is None
+        stats = registro.stats()
+        assert stats['memo_hit'] == 2
+        assert stats['memo_miss'] == 2
+        assert stats['memo_hit_rate'] == 0.5
+
+        registro.register("música", lambda: "música", phrases=["pon música"])
+        assert registro.resolve("pon música").command.name == "música"
+
+        pequeno = CommandRegistry(memo_size=2)
+        pequeno.register("hora", lambda texto: "hora", keywords=["hora"])
+        for texto in ["hora", "qué hora es", "dime la hora", "hora"]:
+            pequeno.resolve(texto)
+        assert pequeno.stats()['memo_size'] == 2
+        assert pequeno.stats()['memo_hit'] == 0
+
+    def test_estadisticas(self, registro):
+        """Cuenta las resoluciones por etapa y los fallos."""
+        registro.resolve("abre google")
+        registro.resolve("dime la hora")
+        registro.resolve("nada de nada")
+        stats = registro.stats()
+
+        assert stats['exact'] == 1
+        assert stats['keyword'] == 1
+        assert stats['miss'] == 1
+        assert stats['commands'] == 6
+
+
+class TestLoadActions:
+    """Pruebas para la lectura de archivos de acciones."""
+
+    def test_archivo_valido(self, tmp_path):
+        ruta = tmp_path / "comandos.json"
+        ruta.write_text(json.dumps({"saluda": "¡Hola!"}), encoding="utf-8")
+        assert load_actions(ruta) == {"saluda": "¡Hola!"}
+
+    @pytest.mark.parametrize("contenido", ['["saluda"]', '{"saluda": 3}', '{"  ": "x"}', '{"saluda":'])
+    def test_archivo_invalido(self, tmp_path, contenido):
+        ruta = tmp_path / "comandos.json"
+        ruta.write_text(contenido, encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_actions(ruta)
@@ -0,0 +1,97 @@
+"""
+Pruebas unitarias para el módulo core/intent_classifier.py
+"""
+import random
+import time
+
+import pytest
+
+from core.intent_classifier import IntentClassifier
+
+
+@pytest.fixture
+def clasificador():
+    clasificador = IntentClassifier()
+    clasificador.add("hora", ["¿Qué hora es?", "Dime la hora"])
+    clasificador.add("fecha", ["¿Qué día es hoy?", "Dime la fecha"])
+    clasificador.add("estado", ["¿Cómo estás?", "Estado del sistema"])
+    clasificador.add("apagar", ["Apágate", "Cierra el programa"])
+    return clasificador
+
+
+class TestIntentClassifier:
+    """Pruebas para la clase IntentClassifier."""
+
+    def test_ejemplo_literal(self, clasificador):
+        """Un ejemplo exacto (sin acentos ni signos) tiene similitud máxima."""
+        resultado = clasificador.best("dime la hora")
+        assert resultado.intent == "hora"
+        assert resultado.score == pytest.approx(1.0, abs=1e-4)
+
+    @pytest.mark.parametrize("texto,intencion", [
+        ("que dia es hoy", "fecha"),
+        ("apagate ya", "apagar"),
+        ("cómo está el sistema", "estado"),
+        ("dime la hora por favor", "hora"),
+    ])
+    def test_parafrasis(self, clasificador, texto, intencion):
+        assert clasificador.best(texto).intent == intencion
+
+    def test_sin_parecido(self, clasificador):
+        assert clasificador.best("pon música") is None
+        assert clasificador.classify("") == []
+
+    def test_ignora_signos_de_puntuacion(self, clasificador):
+        """Los signos no cuentan: "qué hora es" equivale al ejemplo "¿Qué hora es?"."""
+        assert clasificador.best("qué hora es").score == pytest.approx(1.0, abs=1e-4)
+        assert clasificador.best("¡¿dime la hora?!").score == pytest.approx(1.0, abs=1e-4)
+
+    def test_margen_sobre_la_segunda(self, clasificador):
+        """Sin ventaja suficiente sobre la segunda intención no se elige ninguna."""
+        resultados = clasificador.classify("dime la hora y la fecha", k=2, min_score=0.0)
+        diferencia = resultados[0].score - resultados[1].score
+
+        assert clasificador.best("dime la hora y la fecha", min_score=0.0) is not None
+        assert clasificador.best("dime la hora y la fecha", min_score=0.0,
+                                 margin=diferencia + 0.01) is None
+
+    def test_una_entrada_por_intencion(self, clasificador):
+        """classify devuelve cada intención una vez, ordenadas por similitud."""
+        resultados = clasificador.classify("dime la fecha y la hora", k=5, min_score=0.1)
+        intenciones = [r.intent for r in resultados]
+
+        assert len(intenciones) == len(set(intenciones))
+        assert [r.score for r in resultados] == sorted((r.score for r in resultados), reverse=True)
+
+    def test_actualizacion_incremental(self, clasificador):
+        """Añadir, sustituir y quitar intenciones se refleja en la siguiente consulta."""
+        clasificador.add("música", ["Pon música", "Reproduce una canción"])
+        assert clasificador.best("pon musica").intent == "música"
+
+        clasificador.add("música", ["Sube el volumen"])
+        assert clasificador.n_examples == 9
+        assert clasificador.best("pon musica") is None
+
+        assert clasificador.remove("hora")
+        assert not clasificador.remove("hora")
+        assert "hora" not in clasificador
+        assert clasificador.best("dime la hora", min_score=0.6) is None
+        # Las filas libres se reutilizan
+        clasificador.add("hora", ["Dime la hora"])
+        assert clasificador.best("dime la hora").intent == "hora"
+
+    @pytest.mark.slow
+    def test_cientos_de_intenciones(self):
+        """Con cientos de intenciones una consulta sigue por debajo del milisegundo."""
+        rng = random.Random(0)
+        palabras = ("abre cierra pon quita busca dime muestra lista crea borra envía lee "
+                    "correo música vídeo archivo carpeta foto red volumen alarma nota tarea").split()
+        clasificador = IntentClassifier()
+        for i in range(500):
+            clasificador.add(f"cmd{i}", [" ".join(rng.sample(palabras, 3)) for _ in range(3)])
+        clasificador.refresh()
+
+        inicio = time.perf_counter()
+        for _ in range(100):
+            clasificador.best("abre la música del correo")
+        assert (time.perf_counter() - inicio) / 100 < 1e-3
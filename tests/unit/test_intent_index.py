@@ -0,0 +1,60 @@
+"""
+Pruebas unitarias para el módulo core/intent_index.py
+"""
+import pytest
+
+from core.intent_index import IntentIndex
+
+COMANDOS = ["qué hora es", "qué día es", "abre google", "abre youtube", "abre correo",
+            "abre calculadora", "ayuda"]
+
+
+@pytest.fixture
+def indice():
+    return IntentIndex(COMANDOS, min_score=0.6)
+
+
+class TestIntentIndex:
+    """Pruebas para la clase IntentIndex."""
+
+    def test_exacta_y_sin_acentos(self, indice):
+        """Las frases exactas y sin acentos tienen similitud 1.0."""
+        assert indice.best("Qué hora es").score == 1.0
+        assert indice.best("que hora es").phrase == "qué hora es"
+
+    def test_top_k_ordenado(self, indice):
+        """Devuelve las k mejores de mayor a menor similitud."""
+        resultados = indice.search("abre gogle", k=3)
+
+        assert resultados[0].phrase == "abre google"
+        assert [r.score for r in resultados] == sorted((r.score for r in resultados), reverse=True)
+        assert len(resultados) <= 3
+
+    def test_por_debajo_del_umbral(self, indice):
+        """Sin frases suficientemente parecidas no hay resultado."""
+        assert indice.best("pon música") is None
+        assert indice.best("abre gogle", min_score=0.95) is None
+
+    def test_actualizacion_incremental(self, indice):
+        """Se pueden añadir, sustituir y quitar frases sin reconstruir el índice."""
+        indice.add("abre terminal", intent="terminal")
+        assert indice.best("abre terminal").intent == "terminal"
+
+        indice.add("abre terminal", intent="cmd")
+        assert indice.best("abre terminal").intent == "cmd"
+
+        assert indice.remove("abre terminal")
+        assert "abre terminal" not in indice
+        assert all(r.phrase != "abre terminal" for r in indice.search("abre terminal"))
+        assert not indice.remove("abre terminal")
+
+    def test_coincide_con_busqueda_lineal(self):
+        """Con muchas frases el mejor resultado es el mismo que comparando con todas."""
+        frases = [f"{verbo} {objeto}" for verbo in ("abre", "cierra", "busca", "pon")
+                  for objeto in ("google", "youtube", "correo", "calculadora", "terminal",
+                                 "música", "noticias", "el tiempo", "bloc de notas")]
+        indice = IntentIndex(frases)
+
+        assert indice.best("sierra el correo").phrase == "cierra correo"
+        assert indice.best("busca noticia").phrase == "busca noticias"
+        assert len(indice) == len(frases)
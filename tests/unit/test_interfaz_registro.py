@@ -0,0 +1,34 @@
+"""
+Pruebas unitarias para el registro de comandos de las interfaces gráficas
+"""
+import importlib
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _interfaz(modulo):
+    """Importa la interfaz u omite la prueba si falta el audio o la GUI."""
+    try:
+        return importlib.import_module(modulo).InterfazAsistente
+    except (ImportError, OSError) as e:
+        pytest.skip(f"{modulo} no se puede importar: {e}")
+
+
+@pytest.mark.parametrize("modulo", ["asistente_avanzado", "asistente_mejorado"])
+class TestRegistroInterfaz:
+    """Las frases de la interfaz no las tapan las acciones de comandos.json."""
+
+    def test_que_hora_es_llega_a_cmd_hora(self, modulo):
+        interfaz = MagicMock()
+        registro = _interfaz(modulo)._crear_registro(interfaz)
+
+        coincidencia, _ = registro.dispatch("qué hora es")
+
+        assert coincidencia is not None
+        interfaz._cmd_hora.assert_called_once()
+
+    def test_salud_no_se_confunde_con_saluda(self, modulo):
+        registro = _interfaz(modulo)._crear_registro(MagicMock())
+
+        assert registro.resolve("salud") is None
@@ -0,0 +1,66 @@
+"""
+Pruebas unitarias para el módulo core/model_registry.py
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.model_registry import ModelRegistry
+
+
+class TestModelRegistry:
+    """Pruebas para la clase ModelRegistry."""
+
+    @pytest.fixture
+    def mock_vosk(self):
+        """Sustituye vosk para no necesitar un modelo real."""
+        with patch('core.model_registry.vosk') as mock:
+            mock.Model.side_effect = lambda path: MagicMock(name=path)
+            yield mock
+
+    def test_carga_una_sola_vez(self, mock_vosk):
+        """Varias peticiones del mismo modelo comparten la instancia."""
+        registry = ModelRegistry()
+
+        primero = registry.get("models/es")
+        segundo = registry.get("models/es")
+
+        assert primero is segundo
+        mock_vosk.Model.assert_called_once()
+        assert registry.info("models/es").load_time >= 0.0
+
+    def test_precarga_en_segundo_plano_con_calentamiento(self, mock_vosk):
+        """preload carga en otro hilo y get espera al mismo modelo."""
+        registry = ModelRegistry()
+
+        future = registry.preload("models/es")
+        modelo = registry.get("models/es")
+
+        assert future.result(timeout=2) is modelo
+        mock_vosk.Model.assert_called_once()
+        mock_vosk.KaldiRecognizer.return_value.AcceptWaveform.assert_called_once()
+
+    def test_cargas_concurrentes(self, mock_vosk):
+        """Varios hilos pidiendo el modelo a la vez lo cargan una vez."""
+        registry = ModelRegistry()
+        modelos = []
+        hilos = [threading.Thread(target=lambda: modelos.append(registry.get("models/es")))
+                 for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        assert len({id(m) for m in modelos}) == 1
+        mock_vosk.Model.assert_called_once()
+
+    def test_error_permite_reintentar(self, mock_vosk):
+        """Si la carga falla, la siguiente petición vuelve a intentarlo."""
+        registry = ModelRegistry()
+        mock_vosk.Model.side_effect = [RuntimeError("sin modelo"), MagicMock()]
+
+        with pytest.raises(RuntimeError):
+            registry.get("models/es")
+        assert registry.get("models/es") is not None
+        assert mock_vosk.Model.call_count == 2
@@ -0,0 +1,68 @@
+"""
+Pruebas unitarias para el módulo core/noise_suppressor.py
+"""
+import numpy as np
+import pytest
+
+from core.noise_suppressor import SpectralNoiseSuppressor
+
+
+def _procesar_en_chunks(suppressor, audio, chunk_size=1024):
+    """Pasa el audio por el supresor en chunks y concatena la salida."""
+    return np.concatenate([suppressor.process(audio[i:i + chunk_size])
+                           for i in range(0, audio.size, chunk_size)])
+
+
+class TestSpectralNoiseSuppressor:
+    """Pruebas para la clase SpectralNoiseSuppressor."""
+
+    def test_misma_longitud_que_la_entrada(self):
+        """Cada llamada devuelve tantas muestras como recibe."""
+        suppressor = SpectralNoiseSuppressor()
+        for size in (1, 100, 256, 1000, 1024):
+            assert suppressor.process(np.zeros(size, dtype=np.float32)).size == size
+
+    def test_reconstruccion_sin_ruido(self):
+        """Con ganancia unidad la salida es la entrada retrasada ``latency`` muestras."""
+        suppressor = SpectralNoiseSuppressor(gain_floor=1.0)
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(8000).astype(np.float32)
+
+        salida = _procesar_en_chunks(suppressor, audio, chunk_size=700)
+
+        retardo = suppressor.latency
+        np.testing.assert_allclose(salida[retardo:], audio[:-retardo], atol=1e-4)
+
+    def test_atenua_ruido_estacionario(self):
+        """El ruido blanco estacionario pierde buena parte de su energía."""
+        suppressor = SpectralNoiseSuppressor()
+        rng = np.random.default_rng(1)
+        ruido = 0.05 * rng.standard_normal(32000).astype(np.float32)
+
+        salida = _procesar_en_chunks(suppressor, ruido)
+
+        # Se descarta el primer segundo, en el que se aprende el perfil
+        energia_entrada = np.mean(ruido[16000:] ** 2)
+        energia_salida = np.mean(salida[16000:] ** 2)
+        assert energia_salida < 0.25 * energia_entrada
+
+    def test_conserva_la_voz_sobre_el_ruido(self):
+        """Un tono fuerte sobre el ruido aprendido se mantiene."""
+        suppressor = SpectralNoiseSuppressor()
+        rng = np.random.default_rng(2)
+        ruido = 0.01 * rng.standard_normal(32000).astype(np.float32)
+        t = np.arange(16000) / 16000
+        tono = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        audio = ruido.copy()
+        audio[16000:] += tono
+
+        salida = _procesar_en_chunks(suppressor, audio)
+
+        energia_tono = np.mean(tono[4000:] ** 2)
+        energia_salida = np.mean(salida[20000 + suppressor.latency:] ** 2)
+        assert energia_salida > 0.8 * energia_tono
+
+    def test_latencia_maxima(self):
+        """Un frame que no cabe en el presupuesto de latencia se rechaza."""
+        with pytest.raises(ValueError):
+            SpectralNoiseSuppressor(frame_size=2048, max_latency_ms=40.0)
@@ -0,0 +1,86 @@
+"""
+Pruebas unitarias para el módulo core/partial_results.py
+"""
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from core.partial_results import PartialResultTracker
+from core.speech_gate import SpeechGate
+from core.vad import FrameVAD
+
+
+def _puntuar(texto):
+    return 1.0 if texto.startswith("hola asistente") else 0.0
+
+
+class TestPartialResultTracker:
+    """Pruebas para la clase PartialResultTracker."""
+
+    def test_confirma_prefijo_estable(self):
+        """Se confirma cuando el prefijo se repite en parciales consecutivos."""
+        tracker = PartialResultTracker(_puntuar, stable_partials=2)
+
+        assert tracker.update("hola") is None
+        assert tracker.update("hola asis") is None
+        assert tracker.update("hola asistente") is None
+        decision = tracker.update("hola asistente abre")
+
+        assert decision.text == "hola asistente"
+        assert decision.score == 1.0
+        # Solo una decisión por frase
+        assert tracker.update("hola asistente abre google") is None
+        assert tracker.early_commits == 1
+
+    def test_final_confirma_o_corrige(self):
+        """Solo un final idéntico confirma; si lo corrige o lo alarga, es una corrección."""
+        tracker = PartialResultTracker(_puntuar, stable_partials=1)
+
+        assert tracker.finalize("nada") is None
+        tracker.update("hola asistente")
+        assert tracker.finalize("hola asistente") is True
+        tracker.update("hola asistente")
+        assert tracker.finalize("hola asistente abre google") is False
+        tracker.update("hola asistente")
+        assert tracker.finalize("hola a sí es tente") is False
+
+        assert tracker.stats() == {'partials': 3, 'early_commits': 3,
+                                   'confirmations': 1, 'corrections': 2}
+
+    def test_baja_confianza_no_confirma(self):
+        """Un prefijo estable con puntuación baja no se confirma."""
+        tracker = PartialResultTracker(lambda texto: 0.5, stable_partials=1,
+                                       commit_threshold=0.9)
+
+        assert tracker.update("hola asistente") is None
+        assert tracker.early_commits == 0
+
+
+class TestSpeechGatePartials:
+    """Integración del seguimiento de parciales con SpeechGate."""
+
+    def test_decision_temprana_y_final_confirmado(self):
+        """La compuerta devuelve la decisión temprana y marca el final."""
+        mock_vad = MagicMock()
+        mock_vad.is_speech.side_effect = [True] * 4 + [False] * 2
+        vad = FrameVAD(frame_ms=10, onset_frames=1, hangover_frames=2, vad=mock_vad)
+
+        recognizer = MagicMock()
+        recognizer.AcceptWaveform.return_value = False
+        recognizer.PartialResult.side_effect = [
+            json.dumps({"partial": "hola asistente"}),
+            json.dumps({"partial": "hola asistente"}),
+            json.dumps({"partial": "hola asistente"}),
+        ]
+        recognizer.FinalResult.return_value = json.dumps({"text": "hola asistente"})
+        gate = SpeechGate(recognizer, padding_ms=0, vad=vad,
+                          partials=PartialResultTracker(_puntuar, stable_partials=2))
+
+        resultados = []
+        for chunk in np.array_split(np.zeros(160 * 6, dtype=np.int16), 3):
+            resultados.extend(gate.feed(chunk))
+
+        assert resultados[0] == {"text": "hola asistente", "score": 1.0, "early": True}
+        assert resultados[-1] == {"text": "hola asistente", "early_confirmed": True}
+        assert gate.stats()['early_commits'] == 1
@@ -0,0 +1,76 @@
+"""
+Pruebas unitarias para el módulo core/phonetic.py
+"""
+import pytest
+
+from core.phonetic import PhoneticIndex, phonetic_key
+from core.wake_word import WakeWordMatcher
+
+
+@pytest.mark.parametrize("canonica, variante", [
+    ("google", "guguel"),
+    ("abre youtube", "abre yu tiub"),
+    ("autogestión", "auto gestión"),
+    ("qué hora es", "que ora es"),
+    ("bloc de notas", "blok de notas"),
+    ("acción", "aksion"),
+])
+def test_variantes_comparten_clave(canonica, variante):
+    """Las variantes de pronunciación producen la misma clave."""
+    assert phonetic_key(canonica) == phonetic_key(variante)
+
+
+def test_palabras_distintas_no_comparten_clave():
+    """Palabras con consonantes distintas tienen claves distintas."""
+    assert phonetic_key("abre google") != phonetic_key("abre gmail")
+    assert phonetic_key("illo") != phonetic_key("hijo")
+
+
+class TestPhoneticIndex:
+    """Pruebas para la clase PhoneticIndex."""
+
+    def test_siglas_deletreadas(self):
+        """Las siglas se indexan también tal como se deletrean."""
+        indice = PhoneticIndex(["agp", "abre crm"])
+
+        assert indice.lookup("a jipi") == "agp"
+        assert indice.lookup("a g p") == "agp"
+        assert indice.lookup("abre ce erre eme") == "abre crm"
+
+    def test_find_devuelve_posiciones(self):
+        """La búsqueda localiza la ventana de palabras en el texto original."""
+        indice = PhoneticIndex(["autogestión"])
+        texto = "oye auto gestión abre google"
+
+        coincidencia = indice.find(texto)
+
+        assert coincidencia.canonical == "autogestión"
+        assert texto[coincidencia.start:coincidencia.end] == "auto gestión"
+
+    def test_variantes_explicitas_y_colisiones(self):
+        """Se aceptan variantes con su forma canónica y se registran las colisiones."""
+        indice = PhoneticIndex({"compa": "compae"})
+        indice.add("kompa", "compañero")
+
+        assert indice.lookup("compa") == "compae"
+        assert indice.collisions == [("KMP", "compae", "compañero")]
+
+    def test_claves_cortas_no_se_indexan(self):
+        """Las claves demasiado cortas coincidirían con cualquier cosa."""
+        indice = PhoneticIndex(["illo"])
+
+        assert len(indice) == 0
+        assert indice.find("allí") is None
+
+
+def test_detector_wake_usa_el_indice_fonetico():
+    """El detector de activación resuelve variantes que solo se parecen al oído."""
+    detector = WakeWordMatcher(["agp", "asistente"], threshold=0.7)
+
+    coincidencia = detector.find("hazizthenthe abre google")
+
+    assert coincidencia.phrase == "asistente"
+    assert coincidencia.score == detector.phonetic_score
+    assert detector.strip("hazizthenthe abre google", coincidencia) == "abre google"
+    # Las claves de tres consonantes no bastan para activar el asistente
+    assert detector.find("a jipi abre google") is None
@@ -0,0 +1,130 @@
+"""
+Pruebas unitarias para el módulo core/result_cache.py
+"""
+import threading
+import time
+
+import pytest
+
+from core.result_cache import ResultCache
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Contador:
+    """Función de cálculo que cuenta sus llamadas."""
+
+    def __init__(self):
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return self.llamadas
+
+
+@pytest.fixture
+def reloj():
+    return RelojFalso()
+
+
+class TestResultCache:
+    """Pruebas para la clase ResultCache."""
+
+    def test_acierto_dentro_del_ttl(self, reloj):
+        cache = ResultCache(clock=reloj)
+        calculo = Contador()
+
+        assert cache.get("procesos", calculo, ttl=5) == 1
+        reloj.ahora = 4.0
+        assert cache.get("procesos", calculo, ttl=5) == 1
+        assert calculo.llamadas == 1
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_caducado_se_refresca_en_segundo_plano(self, reloj):
+        """Pasado el TTL se devuelve el valor anterior y se recalcula aparte."""
+        cache = ResultCache(clock=reloj)
+        listo = threading.Event()
+        valores = iter(["viejo", "nuevo"])
+
+        def calculo():
+            valor = next(valores)
+            if valor == "nuevo":
+                listo.set()
+            return valor
+
+        cache.get("ip", calculo, ttl=10)
+        reloj.ahora = 11.0
+        assert cache.get("ip", calculo, ttl=10) == "viejo"
+        assert listo.wait(1)
+        # El valor nuevo se guarda justo después de calcularlo
+        for _ in range(100):
+            if cache.stats()['refreshes']:
+                break
+            time.sleep(0.01)
+        assert cache.get("ip", calculo, ttl=10) == "nuevo"
+        assert cache.stats()['stale_hits'] == 1
+
+    def test_demasiado_antiguo_se_recalcula(self, reloj):
+        cache = ResultCache(max_stale=5, clock=reloj)
+        calculo = Contador()
+        cache.get("info", calculo, ttl=1)
+        reloj.ahora = 10.0
+        assert cache.get("info", calculo, ttl=1) == 2
+        assert cache.stats()['misses'] == 2
+
+    def test_errores_no_se_guardan(self, reloj):
+        cache = ResultCache(clock=reloj)
+
+        def falla():
+            raise OSError("sin red")
+
+        with pytest.raises(OSError):
+            cache.get("ip", falla, ttl=10)
+        assert "ip" not in cache
+        assert cache.get("ip", lambda: "127.0.0.1", ttl=10) == "127.0.0.1"
+
+    def test_fallos_simultaneos_calculan_una_vez(self):
+        cache = ResultCache()
+        dentro = threading.Event()
+        seguir = threading.Event()
+        llamadas = []
+
+        def lento():
+            llamadas.append(1)
+            dentro.set()
+            seguir.wait(1)
+            return "valor"
+
+        resultados = []
+        hilos = [threading.Thread(target=lambda: resultados.append(cache.get("k", lento, ttl=60)))
+                 for _ in range(3)]
+        hilos[0].start()
+        assert dentro.wait(1)
+        for hilo in hilos[1:]:
+            hilo.start()
+        seguir.set()
+        for hilo in hilos:
+            hilo.join(1)
+
+        assert resultados == ["valor"] * 3
+        assert len(llamadas) == 1
+
+    def test_invalidar(self, reloj):
+        cache = ResultCache(clock=reloj)
+        calculo = Contador()
+        cache.get("a", calculo, ttl=60)
+        cache.get("b", calculo, ttl=60)
+
+        assert cache.invalidate("a") == 1
+        assert cache.invalidate("a") == 0
+        assert cache.get("a", calculo, ttl=60) == 3
+        assert cache.invalidate() == 2
+        assert len(cache) == 0
@@ -0,0 +1,78 @@
+"""
+Pruebas unitarias para el módulo core/ring_buffer.py
+"""
+import numpy as np
+import pytest
+
+from core.ring_buffer import AudioRingBuffer
+
+
+def _leer_todo(ring):
+    """Lee y libera todas las muestras pendientes."""
+    vistas = ring.peek()
+    datos = np.concatenate([np.frombuffer(v, dtype=np.int16) for v in vistas])
+    ring.consume(datos.size)
+    return datos
+
+
+class TestAudioRingBuffer:
+    """Pruebas para la clase AudioRingBuffer."""
+
+    def test_escritura_y_lectura(self):
+        """Lo escrito se lee en el mismo orden."""
+        ring = AudioRingBuffer(16)
+        ring.write(np.arange(10, dtype=np.int16))
+
+        assert ring.available == 10
+        np.testing.assert_array_equal(_leer_todo(ring), np.arange(10))
+        assert ring.available == 0
+
+    def test_vuelta_al_buffer_en_dos_vistas(self):
+        """Si los datos dan la vuelta se devuelven dos vistas consecutivas."""
+        ring = AudioRingBuffer(8)
+        ring.write(np.arange(6, dtype=np.int16))
+        _leer_todo(ring)
+        ring.write(np.arange(6, 11, dtype=np.int16))
+
+        vistas = ring.peek()
+        assert len(vistas) == 2
+        datos = np.concatenate([np.frombuffer(v, dtype=np.int16) for v in vistas])
+        np.testing.assert_array_equal(datos, np.arange(6, 11))
+
+    def test_lectura_sin_copias(self):
+        """Las vistas apuntan a la memoria del propio buffer."""
+        ring = AudioRingBuffer(8)
+        ring.write(np.array([1, 2, 3], dtype=np.int16))
+
+        vista = np.frombuffer(ring.peek()[0], dtype=np.int16)
+        assert np.shares_memory(vista, ring._buffer)
+
+    def test_acepta_objetos_buffer(self):
+        """El indata de RawInputStream llega como buffer de bytes."""
+        ring = AudioRingBuffer(8)
+        ring.write(np.array([5, -5], dtype=np.int16).tobytes())
+
+        np.testing.assert_array_equal(_leer_todo(ring), [5, -5])
+
+    def test_overrun_descarta_el_bloque(self):
+        """Un bloque que no cabe se descarta sin pisar los datos pendientes."""
+        ring = AudioRingBuffer(8)
+        assert ring.write(np.ones(6, dtype=np.int16))
+        assert not ring.write(np.full(4, 2, dtype=np.int16))
+
+        assert ring.overruns == 1
+        assert ring.dropped_samples == 4
+        np.testing.assert_array_equal(_leer_todo(ring), np.ones(6))
+
+    def test_underrun_al_leer_vacio(self):
+        """Leer sin datos devuelve una lista vacía y cuenta un underrun."""
+        ring = AudioRingBuffer(8)
+
+        assert ring.peek() == []
+        assert ring.underruns == 1
+        assert not ring.wait(timeout=0.01)
+
+    def test_capacidad_invalida(self):
+        """La capacidad debe ser positiva."""
+        with pytest.raises(ValueError):
+            AudioRingBuffer(0)
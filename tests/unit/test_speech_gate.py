@@ -0,0 +1,72 @@
+"""
+Pruebas unitarias para el módulo core/speech_gate.py
+"""
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from core.speech_gate import SpeechGate
+from core.vad import FrameVAD
+
+
+def _gate(votos, padding_ms=20):
+    """Crea una compuerta con un VAD de 10 ms que devuelve los votos dados."""
+    mock_vad = MagicMock()
+    mock_vad.is_speech.side_effect = list(votos)
+    vad = FrameVAD(frame_ms=10, onset_frames=2, hangover_frames=2, vad=mock_vad)
+
+    recognizer = MagicMock()
+    recognizer.AcceptWaveform.return_value = False
+    recognizer.FinalResult.return_value = json.dumps({"text": "hola asistente"})
+    return SpeechGate(recognizer, padding_ms=padding_ms, vad=vad)
+
+
+class TestSpeechGate:
+    """Pruebas para la clase SpeechGate."""
+
+    def test_silencio_no_llega_al_reconocedor(self):
+        """Sin voz no se decodifica nada."""
+        gate = _gate([False] * 20)
+
+        assert gate.feed(np.zeros(160 * 20, dtype=np.int16)) == []
+        gate.recognizer.AcceptWaveform.assert_not_called()
+        assert gate.stats()['skipped_ratio'] == 1.0
+
+    def test_segmento_con_margen_y_final(self):
+        """Un segmento se envía con su margen previo y se finaliza al terminar."""
+        votos = [False] * 5 + [True] * 4 + [False] * 5
+        gate = _gate(votos, padding_ms=20)
+        audio = np.arange(160 * len(votos), dtype=np.int16)
+
+        resultados = gate.feed(audio)
+
+        assert resultados == [{"text": "hola asistente"}]
+        gate.recognizer.FinalResult.assert_called_once()
+        enviado = np.frombuffer(gate.recognizer.AcceptWaveform.call_args[0][0], dtype=np.int16)
+        # Desde 20 ms antes del inicio (frame 5) hasta el final de la voz (frame 9)
+        np.testing.assert_array_equal(enviado, audio[160 * 3:160 * 9])
+        assert gate.segments == 1
+        assert not gate.active
+
+    def test_segmento_repartido_entre_chunks(self):
+        """Mientras dura la voz cada chunk se envía una sola vez."""
+        votos = [False] * 4 + [True] * 8 + [False] * 4
+        gate = _gate(votos, padding_ms=0)
+        audio = np.arange(160 * len(votos), dtype=np.int16)
+
+        for chunk in np.array_split(audio, 4):
+            gate.feed(chunk)
+
+        enviados = [np.frombuffer(c[0][0], dtype=np.int16)
+                    for c in gate.recognizer.AcceptWaveform.call_args_list]
+        np.testing.assert_array_equal(np.concatenate(enviados), audio[160 * 4:160 * 12])
+
+    def test_rafagas_cortas_se_descartan(self):
+        """Una ráfaga más corta que el onset cuenta como segmento descartado."""
+        gate = _gate([False, True, False, False, True, False])
+
+        gate.feed(np.zeros(160 * 6, dtype=np.int16))
+
+        assert gate.stats()['segments_dropped'] == 2
+        gate.recognizer.AcceptWaveform.assert_not_called()
@@ -0,0 +1,47 @@
+"""
+Pruebas unitarias para el módulo core/text_normalizer.py
+"""
+import json
+import re
+
+from core.text_normalizer import TextNormalizer, trie_pattern
+
+CORRECCIONES = {"compa": "compae", "qué horas": "qué hora es", "qué días": "qué día es"}
+
+
+def test_trie_equivale_a_la_alternancia():
+    """El patrón en trie acepta exactamente las mismas palabras."""
+    palabras = ["ab", "abc", "abd", "b", "qué horas", "que"]
+    patron = re.compile(trie_pattern(palabras))
+
+    for palabra in palabras:
+        assert patron.fullmatch(palabra)
+    for otra in ["a", "abcd", "qué", "c"]:
+        assert not patron.fullmatch(otra)
+
+
+class TestTextNormalizer:
+    """Pruebas para la clase TextNormalizer."""
+
+    def test_correcciones_en_una_pasada(self):
+        """Se corrige sin volver a aplicar correcciones sobre el resultado."""
+        normalizador = TextNormalizer(CORRECCIONES)
+
+        assert normalizador("Compa, ¿Qué  horas son?") == "compae, ¿qué hora es son?"
+        # "compae" ya es la forma correcta y no se convierte en "compaee"
+        assert normalizador("compae qué tal") == "compae qué tal"
+
+    def test_ignora_acentos_al_comparar(self):
+        """Las correcciones coinciden con o sin acentos y el resultado conserva los suyos."""
+        normalizador = TextNormalizer(CORRECCIONES)
+
+        assert normalizador("que dias") == "qué día es"
+        assert TextNormalizer(CORRECCIONES, fold_accents=True)("qué días") == "que dia es"
+
+    def test_carga_desde_archivo(self, tmp_path):
+        """Las correcciones se leen de un JSON; si falta se usa vacío."""
+        ruta = tmp_path / "correcciones.json"
+        ruta.write_text(json.dumps({"guguel": "google"}), encoding="utf-8")
+
+        assert TextNormalizer.from_file(ruta)("abre guguel") == "abre google"
+        assert len(TextNormalizer.from_file(tmp_path / "no_existe.json")) == 0
@@ -0,0 +1,102 @@
+"""
+Pruebas unitarias para el módulo transcribir.py
+"""
+import json
+import wave
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+import transcribir
+from core.vad import FrameVAD
+
+
+def _escribir_wav(ruta, audio, frecuencia=16000, canales=1):
+    """Guarda un array int16 como WAV."""
+    with wave.open(str(ruta), "wb") as wav:
+        wav.setnchannels(canales)
+        wav.setsampwidth(2)
+        wav.setframerate(frecuencia)
+        wav.writeframes(audio.astype(np.int16).tobytes())
+
+
+def _vad_con_votos(votos):
+    """FrameVAD de 10 ms cuyo webrtcvad devuelve los votos dados."""
+    mock_vad = MagicMock()
+    mock_vad.is_speech.side_effect = list(votos)
+    return FrameVAD(frame_ms=10, onset_frames=2, hangover_frames=2, vad=mock_vad)
+
+
+class TestTranscribir:
+    """Pruebas para la transcripción por lotes."""
+
+    def test_listar_wavs(self, tmp_path):
+        """Los directorios se recorren recursivamente y se ignoran otros formatos."""
+        (tmp_path / "sub").mkdir()
+        for nombre in ("a.wav", "sub/b.WAV", "notas.txt"):
+            (tmp_path / nombre).write_bytes(b"")
+
+        archivos = transcribir.listar_wavs([str(tmp_path), str(tmp_path / "a.wav")])
+
+        assert [p.name for p in archivos] == ["a.wav", "b.WAV"]
+
+    def test_leer_wav_estereo_remuestrea(self, tmp_path):
+        """Un WAV estéreo a 8 kHz se convierte a mono a 16 kHz."""
+        ruta = tmp_path / "estereo.wav"
+        _escribir_wav(ruta, np.zeros(8000 * 2, dtype=np.int16), frecuencia=8000, canales=2)
+
+        audio = transcribir.leer_wav(ruta)
+
+        assert audio.dtype == np.int16
+        assert audio.size == 16000
+
+    def test_segmentar_con_margen(self):
+        """Los segmentos incluyen el margen y se fusionan si se solapan."""
+        votos = [False] * 10 + [True] * 4 + [False] * 3 + [True] * 3 + [False] * 10
+        audio = np.zeros(160 * len(votos), dtype=np.int16)
+
+        segmentos = transcribir.segmentar(audio, padding_ms=30, vad=_vad_con_votos(votos))
+
+        assert segmentos == [(160 * 7, 160 * 23)]
+
+    def test_transcribir_archivo_tiempos_absolutos(self, tmp_path):
+        """Los tiempos de palabra se desplazan al inicio del segmento."""
+        ruta = tmp_path / "llamada.wav"
+        _escribir_wav(ruta, np.zeros(32000, dtype=np.int16))
+
+        rec = MagicMock()
+        rec.FinalResult.return_value = json.dumps({
+            "text": "hola",
+            "result": [{"word": "hola", "start": 0.1, "end": 0.4, "conf": 1.0}],
+        })
+        with patch.object(transcribir, "segmentar", return_value=[(8000, 24000)]), \
+             patch.object(transcribir.vosk, "KaldiRecognizer", return_value=rec):
+            resultados = transcribir.transcribir_archivo(ruta)
+
+        assert resultados[0]["inicio"] == 0.5
+        assert resultados[0]["fin"] == 1.5
+        assert resultados[0]["palabras"][0]["start"] == 0.6
+        assert rec.AcceptWaveform.call_count == 2
+
+    def test_un_archivo_fallido_no_descarta_los_demas(self, tmp_path):
+        """Cada archivo falla por separado y su error queda en la salida."""
+        import io
+        from concurrent.futures import ThreadPoolExecutor
+        from pathlib import Path
+
+        def transcribir_falso(ruta, padding_ms):
+            if ruta.name == "roto.wav":
+                raise EOFError("cabecera truncada")
+            return [{"archivo": str(ruta), "texto": "hola"}]
+
+        salida = io.StringIO()
+        archivos = [Path("a.wav"), Path("roto.wav"), Path("b.wav")]
+        with patch.object(transcribir, "ProcessPoolExecutor", ThreadPoolExecutor), \
+             patch.object(transcribir, "_init_worker"), \
+             patch.object(transcribir, "transcribir_archivo", transcribir_falso):
+            escritos, fallidos = transcribir.transcribir_lote(archivos, "modelo", salida)
+
+        lineas = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        assert (escritos, fallidos) == (2, 1)
+        assert [linea["archivo"] for linea in lineas] == ["a.wav", "roto.wav", "b.wav"]
+        assert "cabecera truncada" in lineas[1]["error"]
@@ -0,0 +1,64 @@
+"""
+Pruebas unitarias para el módulo core/vad.py
+"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from core.vad import FrameVAD
+
+
+def _vad_con_votos(votos, **kwargs):
+    """Crea un FrameVAD cuyo webrtcvad devuelve la secuencia de votos dada."""
+    mock_vad = MagicMock()
+    mock_vad.is_speech.side_effect = list(votos)
+    return FrameVAD(vad=mock_vad, **kwargs)
+
+
+class TestFrameVAD:
+    """Pruebas para la clase FrameVAD."""
+
+    def test_reencuadra_entre_chunks(self):
+        """Las muestras sobrantes se guardan para completar el siguiente frame."""
+        vad = _vad_con_votos([False] * 10, frame_ms=30)
+
+        vad.process(np.zeros(1024, dtype=np.int16))
+        assert vad.vad.is_speech.call_count == 2
+
+        vad.process(np.zeros(1024, dtype=np.int16))
+        assert vad.vad.is_speech.call_count == 4
+        for llamada in vad.vad.is_speech.call_args_list:
+            assert len(llamada[0][0]) == 480 * 2
+
+    def test_onset_y_hangover(self):
+        """Se emite "start" tras onset_frames de voz y "end" tras hangover_frames de silencio."""
+        votos = [False, True, True, True, True, False, False, True, False, False, False]
+        vad = _vad_con_votos(votos, frame_ms=10, onset_frames=3, hangover_frames=3)
+
+        eventos = vad.process(np.zeros(160 * len(votos), dtype=np.int16))
+
+        assert [(e.kind, e.sample) for e in eventos] == [("start", 160), ("end", 160 * 8)]
+        assert not vad.in_speech
+
+    def test_pico_aislado_no_activa(self):
+        """Un único frame de voz no supera el onset."""
+        vad = _vad_con_votos([True, False, True, False], frame_ms=10, onset_frames=2)
+
+        assert vad.process(np.zeros(160 * 4, dtype=np.int16)) == []
+        assert not vad.in_speech
+
+    def test_chunk_silencioso_no_consulta_webrtcvad(self):
+        """Con silent=True los frames cuentan como silencio sin llamar a webrtcvad."""
+        vad = _vad_con_votos([], frame_ms=10)
+
+        vad.process(np.zeros(1600, dtype=np.int16), silent=True)
+
+        vad.vad.is_speech.assert_not_called()
+
+    def test_parametros_invalidos(self):
+        """webrtcvad solo admite frames de 10, 20 o 30 ms."""
+        with pytest.raises(ValueError):
+            FrameVAD(frame_ms=25)
+        with pytest.raises(ValueError):
+            FrameVAD(sample_rate=44100)
@@ -0,0 +1,75 @@
+"""
+Pruebas unitarias para el módulo core/wake_word.py
+"""
+import random
+
+import pytest
+
+from core.wake_word import WakeWordMatcher, bounded_levenshtein
+
+
+def _levenshtein(a, b):
+    """Distancia de referencia con la matriz completa."""
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            actual.append(min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        anterior = actual
+    return anterior[-1]
+
+
+@pytest.fixture
+def matcher():
+    return WakeWordMatcher(["autogestión", "agp", "asistente", "hola asistente"], threshold=0.7)
+
+
+def test_bounded_levenshtein_coincide_con_referencia():
+    """La distancia acotada coincide con la completa o indica que se supera el máximo."""
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 9)))
+        maximo = rng.randint(0, 4)
+        distancia = _levenshtein(a, b)
+        assert bounded_levenshtein(a, b, maximo) == (distancia if distancia <= maximo else None)
+
+
+class TestWakeWordMatcher:
+    """Pruebas para la clase WakeWordMatcher."""
+
+    def test_coincidencia_exacta_con_posiciones(self, matcher):
+        """Devuelve la frase más larga y su posición en el texto original."""
+        coincidencia = matcher.find("Hola, Asistente abre google")
+
+        assert coincidencia.phrase == "hola asistente"
+        assert coincidencia.score == 1.0
+        assert "Hola, Asistente abre google"[coincidencia.start:coincidencia.end] == "Hola, Asistente"
+
+    @pytest.mark.parametrize("texto, frase", [
+        ("auto gestión qué hora es", "autogestión"),
+        ("a g p abre", "agp"),
+        ("autogestion", "autogestión"),
+        ("asistenta pon música", "asistente"),
+    ])
+    def test_variantes(self, matcher, texto, frase):
+        """Acepta palabras partidas, sin acentos o con errores pequeños."""
+        assert matcher.find(texto).phrase == frase
+
+    def test_sin_palabra_de_activacion(self, matcher):
+        """Textos sin frase parecida no coinciden."""
+        assert matcher.find("qué hora es") is None
+        assert not matcher.contains("")
+
+    @pytest.mark.parametrize("texto", ["vamos al campo", "el compás", "el hijo pa casa",
+                                       "pásame el hilo"])
+    def test_sin_activaciones_fonéticas_en_falso(self, texto):
+        """Las frases cortas no se activan por parecido con palabras corrientes."""
+        detector = WakeWordMatcher(["autogestión", "agp", "asistente", "illo", "compae"],
+                                   threshold=0.7)
+        assert detector.find(texto) is None
+
+    def test_strip_extrae_el_comando(self, matcher):
+        """Se recorta exactamente la frase encontrada."""
+        assert matcher.strip("Oye, auto gestión abre Google") == "oye, abre google"
+        assert matcher.strip("qué hora es") == "qué hora es"
@@ -0,0 +1,77 @@
+"""
+Pruebas unitarias para el módulo core/wake_word_spotter.py
+"""
+import json
+from unittest.mock import MagicMock
+
+from core.wake_word_spotter import WakeWordSpotter
+
+
+class _Reloj:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _spotter(timeout=5.0):
+    creados = []
+
+    def factory(model, rate, grammar=None):
+        rec = MagicMock()
+        rec.grammar = grammar
+        rec.AcceptWaveform.return_value = True
+        creados.append(rec)
+        return rec
+
+    reloj = _Reloj()
+    spotter = WakeWordSpotter("modelo", 16000, ["hola asistente", "escucha"], timeout=timeout,
+                              clock=reloj, recognizer_factory=factory)
+    return spotter, creados[0], creados[1], reloj
+
+
+class TestWakeWordSpotter:
+    """Pruebas para la clase WakeWordSpotter."""
+
+    def test_gramatica_restringida(self):
+        """La primera etapa se crea con las frases de activación y [unk]."""
+        _, gramatica, completo, _ = _spotter()
+
+        assert json.loads(gramatica.grammar) == ["hola asistente", "escucha", "[unk]"]
+        assert completo.grammar is None
+
+    def test_en_reposo_solo_decodifica_la_gramatica(self):
+        """Sin detección el audio no llega al reconocedor completo y se limpia [unk]."""
+        spotter, gramatica, completo, _ = _spotter()
+        gramatica.Result.return_value = json.dumps({"text": "[unk] [unk]"})
+
+        spotter.AcceptWaveform(b"\x00" * 3200)
+        assert json.loads(spotter.Result()) == {"text": ""}
+
+        completo.AcceptWaveform.assert_not_called()
+        assert spotter.spotting
+        assert spotter.stats()['spotting_seconds'] == 0.1
+
+    def test_deteccion_cambia_y_vuelve_tras_espera(self):
+        """Una detección activa la etapa completa hasta agotar el tiempo de espera."""
+        spotter, gramatica, completo, reloj = _spotter(timeout=5.0)
+        gramatica.Result.return_value = json.dumps({"text": "[unk] hola asistente"})
+        completo.Result.return_value = json.dumps({"text": "abrir google"})
+
+        spotter.AcceptWaveform(b"\x00" * 320)
+        assert json.loads(spotter.Result())["text"] == "hola asistente"
+        assert not spotter.spotting
+
+        reloj.t = 3.0
+        spotter.AcceptWaveform(b"\x00" * 320)
+        spotter.Result()  # La actividad del reconocedor completo retrasa la vuelta
+        reloj.t = 7.0
+        spotter.AcceptWaveform(b"\x00" * 320)
+        assert completo.AcceptWaveform.call_count == 2
+
+        reloj.t = 8.5
+        spotter.AcceptWaveform(b"\x00" * 320)
+        assert spotter.spotting
+        assert spotter.activations == 1
+        assert completo.AcceptWaveform.call_count == 2
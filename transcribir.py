@@ -0,0 +1,267 @@
+"""Transcripción por lotes de grabaciones WAV con Vosk.
+
+Segmenta cada archivo con el VAD y transcribe en paralelo en varios
+procesos; cada proceso carga el modelo una sola vez. Los resultados se
+escriben en formato JSONL (una línea por segmento) con tiempos por palabra.
+
+Uso:
+    python transcribir.py grabaciones/ llamada.wav -o resultados.jsonl -p 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import vosk
+from scipy import signal
+
+from config import MODEL_PATH
+from core.model_registry import get_model
+from core.vad import FrameVAD
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Tamaño de los bloques enviados a Vosk dentro de cada segmento
+BLOQUE_MUESTRAS = 8000
+
+# Modelo cargado en cada proceso del pool (ver _init_worker)
+_modelo = None
+
+
+def listar_wavs(rutas: Iterable[str]) -> List[Path]:
+    """Expande archivos y directorios a la lista ordenada de WAV a procesar.
+
+    Args:
+        rutas: Archivos .wav o directorios (se recorren recursivamente)
+
+    Returns:
+        Lista de rutas sin duplicados
+    """
+    archivos = []
+    for ruta in map(Path, rutas):
+        if ruta.is_dir():
+            archivos.extend(sorted(p for p in ruta.rglob("*") if p.suffix.lower() == ".wav"))
+        elif ruta.is_file():
+            archivos.append(ruta)
+        else:
+            logger.warning(f"Ruta no encontrada: {ruta}")
+    return list(dict.fromkeys(archivos))
+
+
+def leer_wav(ruta: Path) -> np.ndarray:
+    """Lee un WAV PCM de 16 bits como audio mono int16 a 16 kHz.
+
+    Args:
+        ruta: Archivo WAV
+
+    Returns:
+        Array int16 mono remuestreado a SAMPLE_RATE si hace falta
+    """
+    with wave.open(str(ruta), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{ruta}: solo se admite PCM de 16 bits")
+        canales = wav.getnchannels()
+        frecuencia = wav.getframerate()
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+
+    if canales > 1:
+        audio = audio.reshape(-1, canales).mean(axis=1).astype(np.int16)
+
+    if frecuencia != SAMPLE_RATE:
+        divisor = gcd(frecuencia, SAMPLE_RATE)
+        audio = signal.resample_poly(audio.astype(np.float32), SAMPLE_RATE // divisor,
+                                     frecuencia // divisor)
+        audio = np.clip(audio, -32768, 32767).astype(np.int16)
+    return audio
+
+
+def segmentar(audio: np.ndarray, padding_ms: int = 300,
+              vad: Optional[FrameVAD] = None) -> List[Tuple[int, int]]:
+    """Divide el audio en segmentos de voz con un margen a cada lado.
+
+    Args:
+        audio: Audio int16 mono a SAMPLE_RATE
+        padding_ms: Margen añadido antes y después de cada segmento
+        vad: Detector a usar; por defecto un FrameVAD nuevo
+
+    Returns:
+        Lista de tuplas (inicio, fin) en muestras, sin solapamientos
+    """
+    vad = vad or FrameVAD(sample_rate=SAMPLE_RATE)
+    margen = SAMPLE_RATE * padding_ms // 1000
+
+    segmentos = []
+    inicio = None
+    for evento in vad.process(audio):
+        if evento.kind == "start":
+            inicio = evento.sample
+        elif evento.kind == "end" and inicio is not None:
+            segmentos.append((inicio, evento.sample))
+            inicio = None
+    if inicio is not None:
+        segmentos.append((inicio, audio.size))
+
+    # Añadir márgenes y fusionar los segmentos que se solapan
+    fusionados = []
+    for inicio, fin in segmentos:
+        inicio, fin = max(0, inicio - margen), min(audio.size, fin + margen)
+        if fusionados and inicio <= fusionados[-1][1]:
+            fusionados[-1] = (fusionados[-1][0], fin)
+        else:
+            fusionados.append((inicio, fin))
+    return fusionados
+
+
+def _init_worker(model_path: str):
+    """Carga el modelo una vez por proceso del pool."""
+    global _modelo
+    vosk.SetLogLevel(-1)
+    _modelo = get_model(model_path)
+
+
+def transcribir_archivo(ruta: Path, padding_ms: int = 300) -> List[Dict]:
+    """Transcribe los segmentos de voz de un archivo con el modelo del proceso.
+
+    Args:
+        ruta: Archivo WAV
+        padding_ms: Margen de cada segmento
+
+    Returns:
+        Lista de resultados por segmento con texto y palabras en tiempo absoluto
+    """
+    try:
+        audio = leer_wav(ruta)
+    except (OSError, ValueError, wave.Error) as e:
+        logger.error(f"No se pudo leer {ruta}: {e}")
+        return [{"archivo": str(ruta), "error": str(e)}]
+
+    resultados = []
+    for inicio, fin in segmentar(audio, padding_ms):
+        rec = vosk.KaldiRecognizer(_modelo, SAMPLE_RATE)
+        rec.SetWords(True)
+        for pos in range(inicio, fin, BLOQUE_MUESTRAS):
+            rec.AcceptWaveform(audio[pos:min(pos + BLOQUE_MUESTRAS, fin)].tobytes())
+        resultado = json.loads(rec.FinalResult())
+
+        texto = resultado.get("text", "").strip()
+        if not texto:
+            continue
+
+        # Vosk da los tiempos relativos al segmento
+        desplazamiento = inicio / SAMPLE_RATE
+        palabras = [
+            dict(palabra,
+                 start=round(palabra["start"] + desplazamiento, 3),
+                 end=round(palabra["end"] + desplazamiento, 3))
+            for palabra in resultado.get("result", [])
+        ]
+        resultados.append({
+            "archivo": str(ruta),
+            "inicio": round(desplazamiento, 3),
+            "fin": round(fin / SAMPLE_RATE, 3),
+            "texto": texto,
+            "palabras": palabras,
+        })
+    return resultados
+
+
+def transcribir_lote(archivos: List[Path], model_path: str, salida,
+                     procesos: Optional[int] = None, padding_ms: int = 300) -> Tuple[int, int]:
+    """Transcribe los archivos en paralelo y escribe los resultados en JSONL.
+
+    Cada archivo es un trabajo independiente: si uno falla (WAV corrupto,
+    error de Vosk o proceso caído) se escribe una línea ``{"archivo", "error"}``
+    para él y el resto de resultados se conserva.
+
+    Args:
+        archivos: Lista de WAV
+        model_path: Ruta al modelo Vosk
+        salida: Archivo de texto abierto donde escribir
+        procesos: Número de procesos (por defecto, uno por núcleo)
+        padding_ms: Margen de cada segmento
+
+    Returns:
+        Tupla (segmentos escritos, archivos con error)
+    """
+    escritos = 0
+    fallidos = 0
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_init_worker,
+                             initargs=(model_path,)) as pool:
+        trabajos = [(ruta, pool.submit(transcribir_archivo, ruta, padding_ms)) for ruta in archivos]
+        # Se recorren en el orden de entrada para que la salida sea reproducible
+        for ruta, trabajo in trabajos:
+            try:
+                resultados = trabajo.result()
+            except Exception as e:
+                logger.error(f"Error al transcribir {ruta}: {type(e).__name__}: {e}")
+                resultados = [{"archivo": str(ruta), "error": f"{type(e).__name__}: {e}"}]
+
+            segmentos = 0
+            for resultado in resultados:
+                salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                if "error" not in resultado:
+                    segmentos += 1
+            if segmentos < len(resultados):
+                fallidos += 1
+            escritos += segmentos
+            logger.info(f"{ruta}: {segmentos} segmentos")
+    return escritos, fallidos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de la línea de comandos.
+
+    Returns:
+        Código de salida (0 si éxito, 1 si error)
+    """
+    parser = argparse.ArgumentParser(description="Transcripción por lotes de archivos WAV con Vosk")
+    parser.add_argument("rutas", nargs="+", help="Archivos WAV o directorios")
+    parser.add_argument("-m", "--modelo", default=MODEL_PATH, help="Ruta al modelo Vosk")
+    parser.add_argument("-o", "--salida", help="Archivo JSONL de salida (por defecto, stdout)")
+    parser.add_argument("-p", "--procesos", type=int, default=os.cpu_count(),
+                        help="Procesos en paralelo")
+    parser.add_argument("--margen-ms", type=int, default=300,
+                        help="Margen alrededor de cada segmento de voz")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    if not os.path.exists(args.modelo):
+        logger.error(f"Modelo no encontrado en: {args.modelo}")
+        return 1
+
+    archivos = listar_wavs(args.rutas)
+    if not archivos:
+        logger.error("No se encontraron archivos WAV")
+        return 1
+
+    logger.info(f"Transcribiendo {len(archivos)} archivos con {args.procesos} procesos")
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        escritos, fallidos = transcribir_lote(archivos, args.modelo, salida,
+                                              args.procesos, args.margen_ms)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    logger.info(f"{escritos} segmentos transcritos")
+    if fallidos:
+        logger.error(f"{fallidos} de {len(archivos)} archivos no se pudieron transcribir")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import threading
 import logging
+import queue
 
 try:
     import pyttsx3
@@ -34,6 +35,26 @@ def hablar(texto):
     tts_queue.put(texto)
     # Actualiza historial visual si quieres aquí
 
+def interrumpir(*_):
+    """Corta la frase en curso y descarta las pendientes (p. ej. al decir "para")."""
+    descartadas = 0
+    if tts_queue is not None:
+        try:
+            while True:
+                if tts_queue.get_nowait() is None:
+                    # El centinela de parada no se descarta
+                    tts_queue.put(None)
+                    break
+                descartadas += 1
+        except queue.Empty:
+            pass
+    if TTS_DISPONIBLE:
+        try:
+            tts_engine.stop()
+        except Exception as e:
+            logging.error(f"Error al interrumpir TTS: {e}")
+    return descartadas
+
 def start_tts_worker(input_queue):
     global tts_queue
     tts_queue = input_queue
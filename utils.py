@@ -1,4 +1,11 @@
 from datetime import datetime
+from pathlib import Path
+
+from core.text_normalizer import TextNormalizer
+
+# Correcciones de términos mal reconocidos, compiladas una sola vez
+CORRECCIONES = Path(__file__).parent / "correcciones.json"
+_normalizador = TextNormalizer.from_file(CORRECCIONES)
 
 def registrar_historial(entrada, accion, filename="historial_comandos.txt"):
     try:
@@ -8,5 +15,5 @@ def registrar_historial(entrada, accion, filename="historial_comandos.txt"):
         print(f"Error guardando historial: {e}")
 
 def normalizar_texto(texto):
-    # Corrige términos, acentos, etc.
-    return texto.lower().replace("compa", "compae")
+    # Corrige términos, acentos, etc. en una sola pasada
+    return _normalizador.normalize(texto)